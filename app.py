@@ -20,7 +20,8 @@ import numpy as np
 from pathlib import Path
 import logging
 import sys
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import time
 from sentence_transformers import SentenceTransformer
 
 # ======================================================
@@ -41,6 +42,9 @@ if str(BASE_DIR) not in sys.path:
 
 try:
     from src.recommender import Recommender
+    from src.ranking import top_k_indices
+    from src.scoring import cosine_scores
+    from src.trending import TrendingCounter
 except ImportError as e:
     st.error(f"❌ Gagal mengimpor Recommender: {e}")
     st.stop()
@@ -56,6 +60,10 @@ STATE_CLICKED_HISTORY = "clicked_history"
 STATE_SELECTED_WISATA = "selected_wisata"
 STATE_SHOW_ALL = "show_all_mode"
 
+# Trending untuk pengguna baru: waktu paruh klik (jam) & interval refresh ranking (detik)
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_REFRESH_S = 5
+
 # ======================================================
 # 4️⃣ CLASS APLIKASI
 # ======================================================
@@ -63,6 +71,7 @@ class TourismApp:
     def __init__(self):
         self.recommender = self._load_recommender()
         self.bert_model = self._load_bert_model()
+        self.trending, self.trending_lock = self._load_trending()
         self._init_session_state()
 
     # ------------------------------------------------------
@@ -89,6 +98,12 @@ class TourismApp:
             st.error(f"❌ Gagal memuat model BERT: {e}")
             return None
 
+    @staticmethod
+    @st.cache_resource
+    def _load_trending():
+        # Satu counter untuk semua sesi: klik pengunjung lain membentuk feed pengguna baru
+        return TrendingCounter(half_life_s=TRENDING_HALF_LIFE_HOURS * 3600), threading.Lock()
+
     # ------------------------------------------------------
     # 🔹 STATE MANAGEMENT
     # ------------------------------------------------------
@@ -118,6 +133,7 @@ class TourismApp:
             history.remove(nama_wisata)
         history.insert(0, nama_wisata)
         st.session_state[STATE_CLICKED_HISTORY] = history[:5]
+        self._record_trending_click(nama_wisata)
         # st.rerun() tidak diperlukan di dalam callback
 
     def _toggle_show_all(self):
@@ -127,47 +143,69 @@ class TourismApp:
     # ------------------------------------------------------
     # 🔹 LOGIKA REKOMENDASI
     # ------------------------------------------------------
+    def _record_trending_click(self, nama_wisata: str):
+        row = self.recommender.name_to_row.get(nama_wisata)
+        if row is None:
+            return
+        item = self.recommender.df.iloc[row]
+        with self.trending_lock:
+            self.trending.add([int(item["id"])], [item["kategori"]], [time.time()])
+
+    @st.cache_data(ttl=TRENDING_REFRESH_S, show_spinner=False)
+    def _get_trending_ranking(_self):
+        # Ranking disusun ulang paling sering sekali per TRENDING_REFRESH_S (dibagi semua sesi)
+        with _self.trending_lock:
+            return _self.trending.ranking(_self.recommender.id_to_row, _self.recommender.popularity_prior)
+
+    def _cold_start(self, top_n: int, mask=None) -> pd.DataFrame:
+        rows, _ = self._get_trending_ranking().top(top_n, mask)
+        return self.recommender.df.iloc[rows]
+
     @st.cache_data(show_spinner=False)
-    def _get_semantic_search_results(_self, query: str, top_k: int = None):
+    def _get_semantic_search_results(_self, query: str, top_k: int = None, categories: tuple = ()):
         if not query:
             return pd.DataFrame()
 
         query_vec = _self.bert_model.encode([query], show_progress_bar=False)
-        sim_scores = cosine_similarity(query_vec, _self.recommender.embeddings)[0]
+        # Filter kategori diterapkan sebelum scoring: hanya baris eligible yang dihitung
+        mask = _self.recommender.facet_mask({"kategori": categories})
+        if mask is None:
+            rows = np.arange(len(_self.recommender.df))
+            sim_scores = _self.recommender.score(query_vec[0])
+        else:
+            rows = np.flatnonzero(mask)
+            sim_scores = cosine_scores(_self.recommender.embeddings_normed[rows], query_vec[0])
 
         if top_k is None:
-            top_k = len(_self.recommender.df)
+            top_k = len(rows)
 
-        idx = np.argsort(sim_scores)[::-1][:top_k]
-        df = _self.recommender.df.iloc[idx].copy()
-        df["skor_kemiripan"] = np.round(sim_scores[idx], 3)
+        local = top_k_indices(sim_scores, top_k)
+        df = _self.recommender.df.iloc[rows[local]].copy()
+        df["skor_kemiripan"] = np.round(sim_scores[local], 3)
         return df
 
-    def _get_personalized_feed(self, history: list, top_n: int = 9):
+    def _get_personalized_feed(self, history: list, top_n: int = 9, categories: tuple = ()):
         df = self.recommender.df
+        mask = self.recommender.facet_mask({"kategori": categories})
+        if mask is not None:
+            df = df[mask]
+            top_n = min(top_n, len(df))
         if not history:
-            return df.sample(top_n, random_state=42), "✨ Jelajahi Destinasi Populer di Jember"
+            return self._cold_start(top_n, mask), "✨ Jelajahi Destinasi Populer di Jember"
 
         try:
-            idx_hist = [df.index[df["nama_wisata"] == nama].item() for nama in history]
-            hist_vec = self.recommender.embeddings[idx_hist]
-            user_vec = np.mean(hist_vec, axis=0).reshape(1, -1)
-
-            sim_scores = cosine_similarity(user_vec, self.recommender.embeddings)[0]
-            clicked_cats = df.loc[idx_hist, "kategori"]
-            top_cat = clicked_cats.value_counts().idxmax()
+            # Index baris katalog penuh (bukan posisi di df yang sudah difilter)
+            idx_hist = np.array([self.recommender.name_to_row[n] for n in history if n in self.recommender.name_to_row],
+                                dtype=np.int64)
 
             BOOST = 0.5
-            mask = (df["kategori"] == top_cat)
-            sim_scores[mask] += BOOST
-
-            idx = sim_scores.argsort()[::-1]
-            df_sorted = df.iloc[idx]
-            final_df = df_sorted[~df_sorted["nama_wisata"].isin(history)]
-            return final_df.head(top_n), f"🔥 Karena Anda Suka Kategori '{top_cat}'"
+            idx, _, top_cat = self.recommender.rank_for_history(idx_hist, top_n, category_boost=BOOST, mask=mask)
+            if len(idx) == 0:
+                return self._cold_start(top_n, mask), "✨ Jelajahi Destinasi Populer di Jember"
+            return self.recommender.df.iloc[idx], f"🔥 Karena Anda Suka Kategori '{top_cat}'"
         except Exception as e:
             logger.error(f"Feed personalization failed: {e}")
-            return df.sample(top_n, random_state=42), "✨ Jelajahi Destinasi Populer di Jember"
+            return self._cold_start(top_n, mask), "✨ Jelajahi Destinasi Populer di Jember"
 
     # ------------------------------------------------------
     # 🔹 UI KOMPONEN
@@ -236,14 +274,14 @@ class TourismApp:
         # Mode pencarian
         if query:
             title = "🔍 Hasil Pencarian Semantik"
-            df_candidates = self._get_semantic_search_results(query)
             if selected_cats:
                 title = f"🔍 Hasil Pencarian untuk Kategori '{', '.join(selected_cats)}'"
-                filtered_df = df_candidates[df_candidates["kategori"].isin(selected_cats)]
-                if filtered_df.empty:
+                df_candidates = self._get_semantic_search_results(query, 12, tuple(selected_cats))
+                if df_candidates.empty:
                     st.info("🤔 Tidak ada hasil untuk kategori yang dipilih. Menampilkan semua hasil pencarian.")
-                else:
-                    df_candidates = filtered_df
+                    df_candidates = self._get_semantic_search_results(query, 12)
+            else:
+                df_candidates = self._get_semantic_search_results(query, 12)
             self._display_cards(df_candidates, "search", title=title, max_items=12)
             return
 
@@ -264,16 +302,14 @@ class TourismApp:
 
         # Mode Beranda (Personalisasi / Cold Start)
         if history:
-            p_df_candidates, p_title = self._get_personalized_feed(history, top_n=len(self.recommender.df))
-            final_title = p_title 
-
             if selected_cats:
                 final_title = f"Rekomendasi Kategori '{', '.join(selected_cats)}' Untuk Anda"
-                filtered_df = p_df_candidates[p_df_candidates["kategori"].isin(selected_cats)]
-                if filtered_df.empty:
+                p_df_candidates, _ = self._get_personalized_feed(history, top_n=6, categories=tuple(selected_cats))
+                if p_df_candidates.empty:
                     st.info("🤔 Tidak ada destinasi dengan kategori tersebut, menampilkan feed umum.")
-                else:
-                    p_df_candidates = filtered_df
+                    p_df_candidates, _ = self._get_personalized_feed(history, top_n=6)
+            else:
+                p_df_candidates, final_title = self._get_personalized_feed(history, top_n=6)
             self._display_cards(p_df_candidates, "personalized", title=final_title, max_items=6)
 
             st.markdown("---")
@@ -292,18 +328,17 @@ class TourismApp:
         else:
             # Pengguna baru
             title = "✨ Jelajahi Destinasi Populer di Jember"
-            df_candidates = self.recommender.df
+            mask = None
             if selected_cats:
                 title = f"✨ Destinasi Populer Kategori '{', '.join(selected_cats)}'"
-                filtered_df = df_candidates[df_candidates["kategori"].isin(selected_cats)]
-                if filtered_df.empty:
+                mask = self.recommender.facet_mask({"kategori": tuple(selected_cats)})
+                if not mask.any():
                     st.info("🤔 Tidak ada destinasi dengan kategori tersebut, menampilkan semua wisata.")
-                else:
-                    df_candidates = filtered_df
+                    mask = None
             
-            sample_size = min(6, len(df_candidates))
-            if sample_size > 0:
-                self._display_cards(df_candidates.sample(n=sample_size, random_state=42), "feed", title=title, max_items=6)
+            df_candidates = self._cold_start(6, mask)
+            if not df_candidates.empty:
+                self._display_cards(df_candidates, "feed", title=title, max_items=6)
 
         st.markdown("---")
         st.button("Tampilkan Semua Wisata 🗺️", on_click=self._toggle_show_all, use_container_width=True, type="secondary")
@@ -312,8 +347,8 @@ class TourismApp:
         nama = st.session_state[STATE_SELECTED_WISATA]
         df = self.recommender.df
         try:
-            wisata = df[df["nama_wisata"] == nama].iloc[0]
-        except IndexError:
+            wisata = df.iloc[self.recommender.name_to_row[nama]]
+        except KeyError:
             st.error("Wisata tidak ditemukan.")
             self._go_home()
             return
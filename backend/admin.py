@@ -0,0 +1,69 @@
+# backend/admin.py
+
+import os
+import logging
+import secrets
+from pathlib import Path
+from typing import Annotated, Optional
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+# --- Konfigurasi (dari .env) ---
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Endpoint admin hanya aktif jika ADMIN_API_KEY di-set.
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+# ======================================================
+# 🔐 DEPENDENSI: CEK ADMIN KEY
+# ======================================================
+async def require_admin_key(x_admin_key: Annotated[Optional[str], Header()] = None):
+    """Memvalidasi header 'X-Admin-Key' terhadap ADMIN_API_KEY."""
+    if not ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoint admin tidak aktif (ADMIN_API_KEY belum di-set).",
+        )
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        logger.warning("Akses admin ditolak: X-Admin-Key tidak valid.")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Admin key tidak valid.")
+
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+def _get_reloader(request: Request):
+    reloader = request.app.state.model_cache.get("reloader")
+    if not reloader:
+        raise HTTPException(status_code=503, detail="Server sedang inisialisasi, reloader belum siap.")
+    return reloader
+
+# ======================================================
+# ♻️ ENDPOINT: HOT RELOAD ARTEFAK
+# ======================================================
+@router.post(
+    "/reload",
+    summary="Reload Artefak Recommender (Zero-Downtime)",
+    description="Membangun Recommender baru dari artefak di disk, memvalidasinya, lalu menukarnya secara atomik. "
+                "Request yang sedang berjalan tetap memakai versi lama."
+)
+async def reload_artifacts(request: Request):
+    reloader = _get_reloader(request)
+    result = await reloader.reload(reason="admin endpoint")
+    if result["last_status"] != "ok":
+        raise HTTPException(status_code=500, detail=result)
+    return result
+
+@router.get(
+    "/reload/status",
+    summary="Status Reload Artefak",
+    description="Versi artefak aktif, durasi & hasil reload terakhir."
+)
+async def reload_status(request: Request):
+    return _get_reloader(request).status()
@@ -4,7 +4,7 @@ import logging
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import semua 'perkakas' kita
 import crud
@@ -12,6 +12,7 @@ import schemas
 import security
 import models
 from database import get_db
+from password_hasher import PasswordHasherBusy
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ router = APIRouter(
 )
 
 # --- 2. Siapkan Dependensi ---
-DbDependency = Annotated[Session, Depends(get_db)]
+DbDependency = Annotated[AsyncSession, Depends(get_db)]
 FormDependency = Annotated[OAuth2PasswordRequestForm, Depends()]
 # 🔥 1. TAMBAHKAN DEPENDENSI UNTUK 'GET_CURRENT_USER'
 # (Sesuai Poin 4 review kamu, import 'get_current_user' dari security)
@@ -52,9 +53,16 @@ async def register_user(
     try:
         # Panggil 'kurir' (crud) untuk membuat user
         # (crud.create_user sudah kita program untuk raise ValueError jika duplikat)
-        db_user = crud.create_user(db, user=user_create)
+        db_user = await crud.create_user(db, user=user_create)
         return db_user
     
+    except PasswordHasherBusy as e:
+        logger.warning(f"Registrasi ditolak, pool bcrypt penuh: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         # (Ini adalah Poin 2 review kamu, sudah ter-handle!)
         # Tangkap 'ValueError' dari crud.py
@@ -88,10 +96,19 @@ async def login_for_access_token(
     """
     # 1. Cek User
     # (crud.get_user_by_username sudah case-insensitive)
-    user = crud.get_user_by_username(db, username=form_data.username)
+    user = await crud.get_user_by_username(db, username=form_data.username)
     
-    # 2. Cek Password
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    # 2. Cek Password (bcrypt di pool terpisah, bukan di event loop)
+    try:
+        password_ok = user is not None and await security.verify_password_async(form_data.password, user.hashed_password)
+    except PasswordHasherBusy as e:
+        logger.warning(f"Login ditolak, pool bcrypt penuh: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    if not password_ok:
         logger.warning(f"Login gagal untuk user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,7 +118,7 @@ async def login_for_access_token(
     
     # 3. Buat Token
     access_token = security.create_access_token(
-        data={"sub": user.username}
+        data={"sub": user.username, "uid": user.id}
     )
     
     # 4. Kembalikan Token (sudah pakai helper 'format_access_token')
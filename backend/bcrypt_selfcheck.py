@@ -7,11 +7,18 @@ Script ini:
  - Mencoba hash menggunakan passlib (CryptContext bcrypt)
  - Mencoba hash langsung menggunakan modul bcrypt
  - Mencoba edge-cases: password >72 bytes, non-utf8 bytes
+ - Benchmark latensi & throughput hash per cost factor (BCRYPT_ROUNDS)
  - Memberi rekomendasi jika terjadi error
+
+Cost yang di-benchmark bisa diatur lewat argumen:
+    (venv) $ python backend/bcrypt_selfcheck.py 4 10 12 14
 """
+import os
 import sys
+import time
 import platform
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 print("=== BCRYPT / PASSLIB SELF-CHECK ===\n")
 
@@ -96,6 +103,38 @@ except Exception as e:
     print(traceback.format_exc())
 print()
 
+print("### Benchmark hash per cost factor (rounds) ###")
+# Sama dengan pool di security.py: thread (bcrypt melepas GIL saat hashing)
+bench_rounds = [int(a) for a in sys.argv[1:] if a.isdigit()] or [4, 8, 10, 12]
+bench_threads = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+bench_seconds = 1.0
+
+def bench_hash(rounds):
+    salt = bcrypt.gensalt(rounds)
+    return bcrypt.hashpw(b"predator123", salt)
+
+print(f"Server memakai BCRYPT_ROUNDS={os.getenv('BCRYPT_ROUNDS', 12)}; pool {bench_threads} thread.")
+print(f"{'rounds':>6} {'ms/hash (1 thread)':>19} {'hash/dtk (1 thread)':>20} {f'hash/dtk ({bench_threads} thread)':>20}")
+for rounds in bench_rounds:
+    try:
+        bench_hash(rounds)  # warm-up
+        n, start = 0, time.perf_counter()
+        while time.perf_counter() - start < bench_seconds:
+            bench_hash(rounds)
+            n += 1
+        single = (time.perf_counter() - start) / n
+
+        batch = max(bench_threads, int(bench_threads * bench_seconds / single))
+        with ThreadPoolExecutor(max_workers=bench_threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(bench_hash, [rounds] * batch))
+            pooled = batch / (time.perf_counter() - start)
+        print(f"{rounds:>6} {single * 1000:>19.1f} {1 / single:>20.1f} {pooled:>20.1f}")
+    except Exception as e:
+        print(f"{rounds:>6} ERROR: {e!r}")
+print("Note: setiap +1 rounds menggandakan biaya. Load test boleh pakai BCRYPT_ROUNDS=4; production >= 12.")
+print()
+
 print("### Extra checks: pip show versions (if available) ###")
 import subprocess, shlex
 def pip_show(pkg):
@@ -0,0 +1,209 @@
+# backend/click_writer.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from password_hasher import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# 'buffered': handler langsung kembali (202), klik ditulis oleh worker (write-behind).
+# 'sync'    : handler menunggu batch berisi kliknya di-commit (201, group commit).
+DURABILITY_MODES = ("buffered", "sync")
+
+
+@dataclass
+class ClickEvent:
+    """Satu klik yang menunggu ditulis ke `click_history`."""
+    user_id: int
+    item_id: int
+    timestamp: datetime
+    id: Optional[int] = None
+
+
+# Item antrean: (event, future). event None = barrier (lihat `flush()`).
+QueueItem = Tuple[Optional[ClickEvent], Optional[asyncio.Future]]
+FlushHook = Callable[[AsyncSession, List[ClickEvent]], Awaitable[None]]
+
+
+# ======================================================
+# 🖱️ CLICK WRITER (Write-Behind, Batch Insert)
+# ======================================================
+class ClickWriter:
+    """
+    Pipeline penulisan klik: handler hanya memasukkan event ke antrean,
+    worker menulisnya per batch (satu INSERT multi-baris + satu commit)
+    saat batch penuh (`batch_size`) atau jendela `flush_interval_ms` habis.
+
+    - `durability='buffered'`: klik yang belum di-flush hilang jika proses
+      mati mendadak (maks. ~`flush_interval_ms` / `batch_size` klik).
+    - `durability='sync'`: handler menunggu commit; klik yang tiba selama
+      flush berjalan digabung ke batch berikutnya (group commit).
+    - `on_flush(db, events)` dipanggil setelah commit (mis. update profil user).
+    - Siklus hidupnya (start/stop + drain antrean) dimiliki `lifespan` di main.py.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], durability: str = "buffered",
+                 batch_size: int = 256, flush_interval_ms: float = 200.0, max_queue: int = 10000,
+                 on_flush: Optional[FlushHook] = None):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability harus salah satu dari {DURABILITY_MODES}, bukan '{durability}'.")
+        self.session_factory = session_factory
+        self.durability = durability
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000.0
+        self.max_queue = max(0, max_queue)
+        self.on_flush = on_flush
+        self._queue: asyncio.Queue[QueueItem] | None = None
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+
+        # --- Metrik ---
+        self.enqueued = 0
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.flush_latency = LatencyHistogram()
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Menyalakan worker flush (dipanggil saat startup)."""
+        if self.is_running:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run(), name="click-writer")
+        logger.info(
+            f"✅ Click writer aktif (mode {self.durability}, batch maks {self.batch_size}, "
+            f"jendela {self.flush_interval * 1000:.0f} ms)."
+        )
+
+    async def stop(self) -> None:
+        """Menolak klik baru, menulis semua klik yang masih antre, lalu mematikan worker."""
+        if not self.is_running:
+            return
+        self._closing = True
+        await self.flush()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info(f"🛑 Click writer dihentikan ({self.flushed} klik ditulis, {self.failed} gagal).")
+
+    async def submit(self, user_id: int, item_id: int) -> ClickEvent:
+        """
+        Memasukkan satu klik ke antrean. Mode 'sync' menunggu sampai klik
+        di-commit (event.id terisi); mode 'buffered' langsung kembali.
+        Antrean penuh = handler ikut menunggu (backpressure).
+        """
+        if not self.is_running or self._closing:
+            raise RuntimeError("Click writer tidak berjalan.")
+        event = ClickEvent(user_id=user_id, item_id=item_id, timestamp=datetime.now(timezone.utc))
+        fut = asyncio.get_running_loop().create_future() if self.durability == "sync" else None
+        self.enqueued += 1
+        await self._queue.put((event, fut))
+        if fut is not None:
+            await fut
+        return event
+
+    async def flush(self) -> None:
+        """Menunggu sampai semua klik yang sudah masuk antrean selesai ditulis."""
+        if not self.is_running:
+            return
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((None, fut))
+        await fut
+
+    async def _collect_batch(self) -> List[QueueItem]:
+        """
+        Mengambil 1 item (blocking), lalu item lain sampai batch penuh,
+        jendela waktu habis, atau bertemu barrier. Mode 'sync' tidak
+        menunggu jendela: cukup ambil yang sudah antre.
+        """
+        batch = [await self._queue.get()]
+        window = self.flush_interval if self.durability == "buffered" else 0.0
+        deadline = time.perf_counter() + window
+        while len(batch) < self.batch_size and batch[-1][0] is not None:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _write(self, events: List[ClickEvent]) -> None:
+        start = time.perf_counter()
+        async with self.session_factory() as db:
+            ids = await crud.create_click_histories(db, [
+                {"user_id": e.user_id, "item_id": e.item_id, "timestamp": e.timestamp} for e in events
+            ])
+            for event, new_id in zip(events, ids):
+                event.id = new_id
+            self.flush_latency.observe((time.perf_counter() - start) * 1000)
+            if self.on_flush is not None:
+                try:
+                    await self.on_flush(db, events)
+                except Exception as e:
+                    # Klik sudah tersimpan; profil akan dibangun ulang saat feed diminta
+                    logger.error(f"Hook setelah flush klik gagal: {e}", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            events = [event for event, _ in batch if event is not None]
+            error: Optional[Exception] = None
+            if events:
+                try:
+                    await self._write(events)
+                    self.flushed += len(events)
+                    self.batches += 1
+                    self.max_batch_seen = max(self.max_batch_seen, len(events))
+                except Exception as e:
+                    error = e
+                    self.failed += len(events)
+                    logger.error(f"❌ Gagal menulis batch klik ({len(events)} klik): {e}", exc_info=True)
+
+            for event, fut in batch:
+                if fut is None or fut.done():
+                    continue
+                # Barrier selalu selesai; klik mode 'sync' ikut gagal bila batch-nya gagal
+                if error is not None and event is not None:
+                    fut.set_exception(error)
+                else:
+                    fut.set_result(None)
+
+    def stats(self) -> dict:
+        """Metrik antrean & flush untuk endpoint monitoring."""
+        return {
+            "running": self.is_running,
+            "durability": self.durability,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round(self.flushed / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size_seen": self.max_batch_seen,
+            "flush_latency": self.flush_latency.snapshot(),
+            "config": {
+                "batch_size": self.batch_size,
+                "flush_interval_ms": self.flush_interval * 1000,
+                "max_queue": self.max_queue,
+            },
+        }
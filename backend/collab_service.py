@@ -0,0 +1,119 @@
+# backend/collab_service.py
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from src.collaborative import CooccurrenceModel
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 🤝 COLLABORATIVE FILTERING (Item-Item, Inkremental)
+# ======================================================
+class CollabService:
+    """
+    Memiliki `CooccurrenceModel` dan memasang tabelnya sebagai mode
+    'collab' di Recommender aktif.
+
+    - Startup: memuat hasil job offline (scripts/build_collab_model.py)
+      bila ada, lalu catch-up klik setelah watermark-nya dari DB;
+      tanpa file, model dibangun dari seluruh `click_history`.
+    - Setiap batch klik yang di-commit ClickWriter -> `add_clicks`
+      (hanya baris item terdampak yang dihitung ulang).
+    - Recommender baru hasil reload artefak dipasangi tabel yang sama;
+      jika katalognya berubah, model dibangun ulang dari DB.
+
+    Pekerjaan CPU (build / update) dijalankan di thread agar event loop bebas.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], path: Optional[Path] = None,
+                 k: int = 50, shrink: float = 5.0):
+        self.session_factory = session_factory
+        self.path = path
+        self.k = k
+        self.shrink = shrink
+        self.model: Optional[CooccurrenceModel] = None
+        self._id_to_row = None
+        self._lock = asyncio.Lock()
+        self.updates = 0
+        self.rebuilds = 0
+
+    async def start(self, recommender) -> None:
+        """Membangun / memuat model untuk katalog `recommender` lalu memasang tabelnya."""
+        async with self._lock:
+            await self._build(recommender)
+        self.publish(recommender)
+
+    async def _build(self, recommender) -> None:
+        id_to_row = recommender.id_to_row
+        model = None
+        if self.path is not None and self.path.exists():
+            try:
+                model = await asyncio.to_thread(CooccurrenceModel.load, self.path, id_to_row, self.k, self.shrink)
+            except Exception as e:
+                logger.warning(f"⚠️ Gagal memuat model co-occurrence dari {self.path} ({e}). Membangun dari DB...")
+        if model is None:
+            model = CooccurrenceModel(id_to_row, k=self.k, shrink=self.shrink)
+
+        async with self.session_factory() as db:
+            clicks = await crud.get_clicks_after(db, model.watermark)
+        if clicks:
+            ids, users, items = zip(*clicks)
+            if model.watermark == 0:
+                await asyncio.to_thread(model.fit, users, items, ids[-1])
+            else:
+                await asyncio.to_thread(model.add_clicks, users, items, ids[-1])
+            logger.info(f"🤝 Model co-occurrence: {len(clicks)} klik dari DB (watermark {model.watermark}).")
+        self.model = model
+        self._id_to_row = id_to_row
+        self.rebuilds += 1
+
+    def publish(self, recommender) -> bool:
+        """
+        Memasang tabel terbaru ke `recommender` (no-op jika sudah terpasang).
+        False jika katalog recommender berbeda dengan katalog model.
+        """
+        if self.model is None or recommender is None:
+            return False
+        if recommender.id_to_row is not self._id_to_row \
+                and not _same_catalog(recommender.id_to_row, self._id_to_row):
+            return False
+        if recommender.similarity_matrices.get("collab") is not self.model.table:
+            recommender.set_neighbor_table("collab", self.model.table)
+        return True
+
+    async def add_clicks(self, events: List, recommender) -> None:
+        """Hook setelah batch klik di-commit: update inkremental + pasang tabel baru."""
+        if self.model is None or recommender is None:
+            return
+        async with self._lock:
+            if not self.publish(recommender):
+                # Katalog berubah (reload artefak): bangun ulang, klik batch ini sudah di DB
+                logger.info("♻️ Katalog berubah, model co-occurrence dibangun ulang.")
+                await self._build(recommender)
+            else:
+                affected = await asyncio.to_thread(
+                    self.model.add_clicks,
+                    [e.user_id for e in events], [e.item_id for e in events],
+                    max((e.id or 0) for e in events),
+                )
+                self.updates += 1
+                if len(affected):
+                    logger.debug(f"🤝 {len(affected)} item collab dihitung ulang.")
+        self.publish(recommender)
+
+    def stats(self) -> dict:
+        return {
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+            "model": self.model.stats() if self.model is not None else None,
+        }
+
+
+def _same_catalog(a, b) -> bool:
+    return a is not None and b is not None and a.shape == b.shape and bool((a == b).all())
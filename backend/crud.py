@@ -1,9 +1,10 @@
 # backend/crud.py
 
 import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import func # <-- 🔥 1. TAMBAHKAN IMPORT 'func'
-from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, select # <-- 🔥 1. TAMBAHKAN IMPORT 'func'
+from typing import Any, Dict, List, Optional
 
 # 1. Import 'models' (struktur DB) dan 'schemas' (validasi Pydantic)
 import models
@@ -14,36 +15,40 @@ import security
 # Inisialisasi logger untuk modul ini
 logger = logging.getLogger(__name__)
 
+# Semua fungsi di sini async (AsyncSession), jadi query DB tidak
+# memblokir event loop yang juga melayani rekomendasi.
+
 # ======================================================
 # 👤 USER CRUD
 # ======================================================
 
-def get_user(db: Session, user_id: int) -> Optional[models.User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[models.User]:
     """Mengambil satu user berdasarkan ID."""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return await db.get(models.User, user_id)
 
-def get_user_by_username(db: Session, username: str) -> Optional[models.User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[models.User]:
     """
     Mengambil satu user berdasarkan username (Case-Insensitive).
     (Profesional tweak: .ilike() digunakan untuk tidak mempedulikan besar/kecil)
     """
-    return db.query(models.User).filter(models.User.username.ilike(username)).first()
+    result = await db.execute(select(models.User).where(models.User.username.ilike(username)))
+    return result.scalars().first()
 
-def create_user(db: Session, user: schemas.UserCreate) -> models.User:
+async def create_user(db: AsyncSession, user: schemas.UserCreate) -> models.User:
     """
     Membuat user baru di database.
     Termasuk hashing password dan validasi keunikan username.
     (Di-upgrade dengan Review Poin a)
     """
     # 🔥 PERBAIKAN (Review Poin a): Cek jika user sudah ada
-    existing_user = get_user_by_username(db, user.username)
+    existing_user = await get_user_by_username(db, user.username)
     if existing_user:
         # Kita raise ValueError di sini.
         # 'auth.py' nanti yang akan menangkap ini dan mengubahnya jadi HTTP 400
         raise ValueError(f"Username '{user.username}' sudah terdaftar.")
     
-    # Panggil helper hashing dari 'security.py'
-    hashed_password = security.get_password_hash(user.password)
+    # Panggil helper hashing dari 'security.py' (di pool bcrypt, off event loop)
+    hashed_password = await security.get_password_hash_async(user.password)
     
     db_user = models.User(
         username=user.username, 
@@ -51,23 +56,24 @@ def create_user(db: Session, user: schemas.UserCreate) -> models.User:
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # 🔥 PERBAIKAN (Review Poin b): Tambahkan logging
     logger.info(f"✅ User baru berhasil dibuat: {db_user.username} (ID: {db_user.id})")
     
     return db_user
 
-def update_password(db: Session, user: models.User, new_password: str) -> models.User:
+async def update_password(db: AsyncSession, user: models.User, new_password: str) -> models.User:
     """
     Meng-update password untuk user yang sudah ada.
     (Diambil dari Review Poin d)
     """
-    user.hashed_password = security.get_password_hash(new_password)
+    user.hashed_password = await security.get_password_hash_async(new_password)
     db.add(user) # (SQLAlchemy cukup pintar untuk tahu ini 'UPDATE')
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    security.invalidate_user(user.id)
     logger.info(f"🔑 Password untuk user {user.username} berhasil di-update.")
     return user
 
@@ -75,39 +81,37 @@ def update_password(db: Session, user: models.User, new_password: str) -> models
 # 🧾 CLICK HISTORY CRUD
 # ======================================================
 
-def create_click_history(db: Session, click: schemas.ClickData, user_id: int) -> models.ClickHistory:
+async def create_click_histories(db: AsyncSession, clicks: List[Dict[str, Any]]) -> List[int]:
     """
-    Menyimpan data 'klik' baru ke database,
-    terhubung dengan 'user_id' yang spesifik.
-    (Di-upgrade dengan Review Poin b)
+    Bulk insert banyak klik dalam SATU statement + SATU commit
+    (dipakai `ClickWriter`). Tiap dict berisi `user_id`, `item_id`,
+    `timestamp`. Mengembalikan id baru sesuai urutan input.
     """
-    # 🔥 PERBAIKAN (Review Poin b): Tambahkan logging
-    logger.info(f"🖱️ Merekam klik: User ID {user_id} -> Item ID {click.item_id}")
-
-    db_click = models.ClickHistory(
-        item_id=click.item_id, 
-        user_id=user_id
+    if not clicks:
+        return []
+    result = await db.execute(
+        insert(models.ClickHistory).returning(models.ClickHistory.id, sort_by_parameter_order=True),
+        clicks,
     )
-    db.add(db_click)
-    db.commit()
-    db.refresh(db_click)
-    return db_click
+    ids = list(result.scalars().all())
+    await db.commit()
+    return ids
 
-def get_user_history(db: Session, user_id: int, limit: int = 20) -> List[models.ClickHistory]:
+async def get_user_history(db: AsyncSession, user_id: int, limit: int = 20) -> List[models.ClickHistory]:
     """
     Mengambil 'limit' item terakhir yang diklik oleh user.
     (Sangat penting untuk Fase 4: RAG)
     """
-    return (
-        db.query(models.ClickHistory)
-        .filter(models.ClickHistory.user_id == user_id)
+    result = await db.execute(
+        select(models.ClickHistory)
+        .where(models.ClickHistory.user_id == user_id)
         .order_by(models.ClickHistory.timestamp.desc()) # Ambil yang terbaru
         .limit(limit)
-        .all()
     )
+    return list(result.scalars().all())
 
 # 🔥 2. TAMBAHKAN FUNGSI BARU (Resep Efisien)
-def get_user_history_ids(db: Session, user_id: int) -> List[int]:
+async def get_user_history_ids(db: AsyncSession, user_id: int) -> List[int]:
     """
     Mengambil list UNIK (DISTINCT) 'item_id' yang pernah diklik user.
     Query ini dioptimalkan untuk feed rekomendasi.
@@ -121,13 +125,13 @@ def get_user_history_ids(db: Session, user_id: int) -> List[int]:
     #        ORDER BY MAX(timestamp) DESC;
     # (Ini query canggih: Ambil ID unik, urutkan berdasarkan kapan ID itu 
     #  TERAKHIR diklik. Jadi riwayat lo paling relevan/baru).
-    query_result = (
-        db.query(models.ClickHistory.item_id)
-        .filter(models.ClickHistory.user_id == user_id)
+    query = (
+        select(models.ClickHistory.item_id)
+        .where(models.ClickHistory.user_id == user_id)
         .group_by(models.ClickHistory.item_id)
         .order_by(func.max(models.ClickHistory.timestamp).desc())
-        .all()
     )
+    query_result = (await db.execute(query)).all()
     
     # Hasil 'query_result' itu kayak gini: [(11,), (4,), (22,)]
     # Kita harus "ratain" (flatten) jadi: [11, 4, 22]
@@ -135,19 +139,115 @@ def get_user_history_ids(db: Session, user_id: int) -> List[int]:
     
     return id_list
 
-def delete_user_history(db: Session, user_id: int) -> int:
+async def delete_user_history(db: AsyncSession, user_id: int) -> int:
     """
     Menghapus SEMUA riwayat klik untuk satu user.
     (Diambil dari Review Poin c)
     """
-    num_deleted = (
-        db.query(models.ClickHistory)
-        .filter(models.ClickHistory.user_id == user_id)
-        .delete(synchronize_session=False) # 'synchronize_session=False' lebih efisien
+    result = await db.execute(
+        delete(models.ClickHistory)
+        .where(models.ClickHistory.user_id == user_id)
+        .execution_options(synchronize_session=False) # 'synchronize_session=False' lebih efisien
     )
-    db.commit()
+    await db.commit()
+    num_deleted = result.rowcount
     
     if num_deleted > 0:
         logger.info(f"🧹 {num_deleted} riwayat klik dihapus untuk User ID {user_id}")
     
-    return num_deleted
\ No newline at end of file
+    return num_deleted
+
+# ======================================================
+# 🧭 USER PROFILE CRUD (Personalisasi Inkremental)
+# ======================================================
+
+async def get_user_clicks(db: AsyncSession, user_id: int) -> List[tuple]:
+    """
+    Mengambil SEMUA klik user sebagai (item_id, timestamp), terlama dulu.
+    Dipakai untuk membangun ulang profil user dari nol.
+    """
+    result = await db.execute(
+        select(models.ClickHistory.item_id, models.ClickHistory.timestamp)
+        .where(models.ClickHistory.user_id == user_id)
+        .order_by(models.ClickHistory.timestamp.asc(), models.ClickHistory.id.asc())
+    )
+    return result.all()
+
+async def get_clicks_after(db: AsyncSession, after_id: int = 0) -> List[tuple]:
+    """
+    Mengambil klik (id, user_id, item_id) dengan id > `after_id`, urut id.
+    Dipakai model collaborative filtering untuk build / catch-up.
+    """
+    result = await db.execute(
+        select(models.ClickHistory.id, models.ClickHistory.user_id, models.ClickHistory.item_id)
+        .where(models.ClickHistory.id > after_id)
+        .order_by(models.ClickHistory.id.asc())
+    )
+    return result.all()
+
+async def get_click_counts_by_hour(db: AsyncSession, since: Optional[datetime] = None) -> List[tuple]:
+    """
+    Agregat klik per (item_id, jam): (item_id, awal_jam, jumlah).
+    Dipakai untuk seed counter trending saat startup tanpa membaca
+    setiap baris klik. `since` membatasi ke klik sesudah waktu itu.
+    """
+    ts = models.ClickHistory.timestamp
+    if db.bind.dialect.name == "sqlite":
+        bucket = func.strftime("%Y-%m-%d %H:00:00", ts)
+    else:
+        bucket = func.date_trunc("hour", ts)
+    stmt = select(models.ClickHistory.item_id, bucket.label("bucket"), func.count())
+    if since is not None:
+        stmt = stmt.where(ts >= since)
+    result = await db.execute(stmt.group_by(models.ClickHistory.item_id, bucket))
+    return result.all()
+
+async def get_user_profile(db: AsyncSession, user_id: int, for_update: bool = False) -> Optional[models.UserProfile]:
+    """
+    Mengambil profil personalisasi user (None jika belum ada), selalu dari DB.
+    `for_update=True` mengunci baris sampai commit (SELECT ... FOR UPDATE;
+    diabaikan SQLite, yang memang hanya mengizinkan satu penulis).
+    """
+    query = (
+        select(models.UserProfile)
+        .where(models.UserProfile.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    if for_update:
+        query = query.with_for_update()
+    return (await db.execute(query)).scalar_one_or_none()
+
+async def get_user_profile_stamp(db: AsyncSession, user_id: int) -> Optional[tuple]:
+    """(click_count, updated_at) profil user tanpa memuat vektornya (None jika belum ada)."""
+    result = await db.execute(
+        select(models.UserProfile.click_count, models.UserProfile.updated_at)
+        .where(models.UserProfile.user_id == user_id)
+    )
+    row = result.first()
+    return tuple(row) if row is not None else None
+
+async def save_user_profile(db: AsyncSession, user_id: int, commit: bool = True, **fields) -> models.UserProfile:
+    """
+    Insert / update profil personalisasi user. `commit=False` hanya
+    men-stage perubahan (pemanggil commit sekali untuk banyak profil).
+    """
+    db_profile = await db.get(models.UserProfile, user_id)
+    if db_profile is None:
+        db_profile = models.UserProfile(user_id=user_id)
+        db.add(db_profile)
+    for key, value in fields.items():
+        setattr(db_profile, key, value)
+    if commit:
+        await db.commit()
+    return db_profile
+
+async def delete_user_profile(db: AsyncSession, user_id: int, commit: bool = True) -> bool:
+    """Menghapus profil personalisasi user. True jika ada yang dihapus."""
+    result = await db.execute(
+        delete(models.UserProfile)
+        .where(models.UserProfile.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if commit:
+        await db.commit()
+    return result.rowcount > 0
@@ -3,12 +3,13 @@
 import os
 import logging
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator
 from dotenv import load_dotenv
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 
 # --- Poin 2: Profesionalisasi dengan .env ---
 # Memuat variabel dari file .env di root proyek
@@ -26,46 +27,124 @@ DEFAULT_SQLITE_URL = f"sqlite:///{BASE_DIR}/jembertrip.db"
 DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_SQLITE_URL)
 IS_SQLITE = DATABASE_URL.startswith("sqlite")
 
+# --- Poin 4: Pooling (hanya berlaku untuk server DB, mis. Postgres) ---
+# SQLite tidak punya koneksi jaringan untuk di-pool, jadi setting ini
+# diabaikan di sana (dulu pool_size/max_overflow di-set tapi tidak berarti).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+# --- Tuning SQLite (PRAGMA per koneksi) ---
+# WAL: pembaca tidak memblokir penulis (dan sebaliknya); synchronous=NORMAL
+# aman di mode WAL (commit terakhir bisa hilang saat listrik mati, DB tidak korup).
+# mmap & cache_size dalam byte / KiB; 0 = biarkan default SQLite.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024))
+
 logger = logging.getLogger(__name__)
 
-# --- Poin 4: Tambahkan Pooling (Scalability) ---
-connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+def to_async_url(url: str) -> str:
+    """
+    URL sync -> URL driver async:
+    sqlite:// -> sqlite+aiosqlite://, postgres(ql):// -> postgresql+asyncpg://.
+    URL yang sudah menyebut driver async dibiarkan.
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    parsed = make_url(url)
+    driver = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername in ("sqlite+aiosqlite", "postgresql+asyncpg"):
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(is_sqlite: bool) -> dict:
+    """Opsi engine: pool untuk server DB, timeout lock untuk SQLite."""
+    if is_sqlite:
+        # Tunggu lock tulis (default 5 dtk) alih-alih langsung 'database is locked'
+        return {"connect_args": {"timeout": DB_POOL_TIMEOUT}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def sqlite_pragmas() -> list:
+    """Daftar PRAGMA yang dijalankan di setiap koneksi SQLite baru."""
+    pragmas = [
+        f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if SQLITE_MMAP_SIZE:
+        pragmas.append(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    if SQLITE_CACHE_SIZE_KB:
+        # Nilai negatif = ukuran dalam KiB (bukan jumlah halaman)
+        pragmas.append(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None) -> None:
+    """Hook 'connect' SQLAlchemy: set PRAGMA di koneksi SQLite (sqlite3 / aiosqlite)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def install_sqlite_pragmas(sync_engine) -> None:
+    """Memasang `apply_sqlite_pragmas` ke engine (untuk async engine: `.sync_engine`)."""
+    event.listen(sync_engine, "connect", apply_sqlite_pragmas)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
 
 try:
-    engine = create_engine(
-        DATABASE_URL, 
-        connect_args=connect_args,
-        pool_size=10,
-        max_overflow=20
-    )
-    
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Engine async: dipakai semua route FastAPI (tidak memblokir event loop)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(IS_SQLITE))
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+    # Engine sync: hanya untuk script offline di luar server
+    # (scripts/build_collab_model.py membaca click_history lewat engine ini)
+    sync_options = engine_options(IS_SQLITE)
+    if IS_SQLITE:
+        sync_options["connect_args"] = {**sync_options["connect_args"], "check_same_thread": False}
+    engine = create_engine(DATABASE_URL, **sync_options)
+    if IS_SQLITE:
+        install_sqlite_pragmas(async_engine.sync_engine)
+        install_sqlite_pragmas(engine)
 
     Base = declarative_base()
 
-    logger.info(f"✅ Koneksi database (Engine, SessionLocal, Base) berhasil dikonfigurasi ke {DATABASE_URL}.")
+    logger.info(f"✅ Koneksi database (async: {make_url(ASYNC_DATABASE_URL).drivername}) berhasil dikonfigurasi ke {make_url(DATABASE_URL).render_as_string()}.")
 
 except Exception as e:
     logger.critical(f"❌ Gagal mengkonfigurasi database di {DATABASE_URL}: {e}", exc_info=True)
     raise
 
 # --- Poin 5: Type Hint dan Docstring ---
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency FastAPI untuk mendapatkan sesi database.
+    Dependency FastAPI untuk mendapatkan sesi database async.
     Ini memastikan sesi database (db) selalu ditutup setelah request selesai.
 
     Contoh penggunaan di endpoint:
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # --- Poin 3: Fungsi Utility init_db() ---
-def init_db():
+async def init_db():
     """
     Membuat semua tabel di database berdasarkan 'Base' dari models.py.
     Fungsi ini aman untuk dijalankan berulang kali.
@@ -75,8 +154,18 @@ def init_db():
         # BUKAN import relatif (from . import models)
         import models 
         
-        Base.metadata.create_all(bind=engine)
+        from migrations import run_migrations
+        
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # Skema DB lama (tabel sudah ada) disusulkan: index baru, dsb.
+            await conn.run_sync(run_migrations)
         logger.info("📦 Semua tabel berhasil dibuat (jika belum ada).")
     except Exception as e:
         logger.error(f"❌ Gagal membuat tabel: {e}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
+
+async def dispose_engines():
+    """Menutup semua koneksi di pool (dipanggil saat server shutdown)."""
+    await async_engine.dispose()
+    engine.dispose()
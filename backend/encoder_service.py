@@ -0,0 +1,170 @@
+# backend/encoder_service.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# ⚡ ENCODER SERVICE (Micro-Batching, Off Event Loop)
+# ======================================================
+class EncoderService:
+    """
+    Service untuk meng-encode query S-BERT tanpa memblokir event loop.
+
+    - Setiap `encode()` / `encode_many()` memasukkan satu job (1..n query)
+      ke antrean dan mengembalikan future yang di-await oleh handler.
+    - Worker mengumpulkan job yang datang dalam jendela `max_wait_ms`
+      (maks. `max_batch_size` query; job `encode_many` tidak pernah
+      dipecah) lalu menjalankan SATU panggilan `SentenceTransformer.encode`
+      di thread terpisah.
+    - Siklus hidupnya (start/stop) dimiliki oleh `lifespan` di main.py.
+    """
+
+    def __init__(self, model, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: asyncio.Queue[Tuple[List[str], asyncio.Future]] | None = None
+        self._worker: asyncio.Task | None = None
+        # Job yang sudah diambil worker dari antrean (sedang dikumpulkan / di-encode)
+        self._inflight: List[Tuple[List[str], asyncio.Future]] = []
+        # 1 thread cukup: batching sudah dilakukan di sini, dan torch
+        # sendiri memakai banyak thread untuk satu forward pass.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encoder")
+
+        # --- Metrik ---
+        self.total_requests = 0
+        self.total_batches = 0
+        self.max_batch_seen = 0
+        self.last_batch_ms = 0.0
+        self.total_encode_ms = 0.0
+        self.batch_size_histogram: Dict[int, int] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Menyalakan worker batching (dipanggil saat startup)."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run(), name="encoder-service")
+        logger.info(f"✅ Encoder service aktif (batch maks {self.max_batch_size}, jendela {self.max_wait * 1000:.1f} ms).")
+
+    async def stop(self) -> None:
+        """Menghentikan worker dan menggagalkan query yang sedang diproses atau masih antre."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        pending = self._inflight
+        self._inflight = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        for _, fut in pending:
+            if not fut.done():
+                fut.set_exception(RuntimeError("Encoder service dihentikan."))
+        self._executor.shutdown(wait=False)
+        logger.info("🛑 Encoder service dihentikan.")
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Meng-encode satu query. Mengembalikan vektor 1-D (float32)."""
+        return (await self.encode_many([text]))[0]
+
+    async def encode_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Meng-encode beberapa query sebagai SATU job (satu panggilan encode,
+        boleh digabung dengan job lain). Mengembalikan matriks (n x d) float32.
+        """
+        if not self.is_running:
+            raise RuntimeError("Encoder service belum berjalan.")
+        fut = asyncio.get_running_loop().create_future()
+        self.total_requests += len(texts)
+        await self._queue.put((list(texts), fut))
+        return await fut
+
+    async def _collect_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """
+        Mengambil 1 job (blocking), lalu job lain yang tiba dalam jendela waktu.
+        Job dicatat di `_inflight` begitu diambil, agar `stop()` bisa menggagalkannya.
+        """
+        batch = self._inflight = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                job = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            batch.append(job)
+            size += len(job[0])
+        return batch
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._inflight = []
+            batch = await self._collect_batch()
+            # Abaikan request yang sudah dibatalkan (mis. client disconnect)
+            batch = [(job, f) for job, f in batch if not f.done()]
+            if not batch:
+                continue
+
+            texts = [t for job, _ in batch for t in job]
+            start = time.perf_counter()
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode_batch, texts)
+            except Exception as e:
+                logger.error(f"❌ Gagal meng-encode batch ({len(texts)} query): {e}", exc_info=True)
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self._record_batch(len(texts), (time.perf_counter() - start) * 1000)
+            vectors = np.asarray(vectors, dtype=np.float32)
+            offset = 0
+            for job, fut in batch:
+                if not fut.done():
+                    fut.set_result(vectors[offset:offset + len(job)].copy())
+                offset += len(job)
+
+    def _record_batch(self, size: int, elapsed_ms: float) -> None:
+        self.total_batches += 1
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.last_batch_ms = elapsed_ms
+        self.total_encode_ms += elapsed_ms
+        self.batch_size_histogram[size] = self.batch_size_histogram.get(size, 0) + 1
+
+    def stats(self) -> dict:
+        """Metrik antrean & batching untuk endpoint monitoring."""
+        batches = self.total_batches or 1
+        return {
+            "running": self.is_running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "avg_batch_size": round(sum(k * v for k, v in self.batch_size_histogram.items()) / batches, 2),
+            "max_batch_size_seen": self.max_batch_seen,
+            "avg_batch_ms": round(self.total_encode_ms / batches, 2),
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+            "config": {"max_batch_size": self.max_batch_size, "max_wait_ms": self.max_wait * 1000},
+        }
@@ -3,8 +3,8 @@
 import logging
 from typing import Annotated, List
 # 1. Import 'Query' untuk parameter dinamis
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import semua 'perkakas' kita
 import crud
@@ -23,7 +23,7 @@ router = APIRouter(
 )
 
 # --- Siapkan Dependensi ---
-DbDependency = Annotated[Session, Depends(get_db)]
+DbDependency = Annotated[AsyncSession, Depends(get_db)]
 UserDependency = Annotated[models.User, Depends(security.get_current_user)]
 
 # ======================================================
@@ -33,19 +33,48 @@ UserDependency = Annotated[models.User, Depends(security.get_current_user)]
     "/click", 
     response_model=schemas.ClickResponse, 
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.ClickResponse, "description": "Klik diterima, ditulis di background (mode 'buffered')."}},
     summary="Merekam klik destinasi oleh user (Perlu Login)"
 )
 async def record_click(
+    request: Request,
+    response: Response,
     click_data: schemas.ClickData, 
-    current_user: UserDependency,
-    db: DbDependency
+    current_user: UserDependency
 ):
     """
     Merekam setiap kali user yang terotentikasi mengklik sebuah destinasi.
     Data ini akan dipakai untuk personalisasi RAG (Fase 4).
+
+    Id item yang tidak ada di katalog -> 404.
+
+    Klik ditulis per batch oleh `ClickWriter` (profil personalisasi
+    ikut di-update setelah batch di-commit):
+    - mode 'sync': 201 setelah klik tersimpan (`id` terisi).
+    - mode 'buffered': 202 segera (`id` null), klik menyusul ditulis.
     """
+    click_writer = request.app.state.model_cache.get("click_writer")
+    if click_writer is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Click writer belum siap.")
+    recommender = request.app.state.model_cache.get("recommender")
+    if recommender is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server sedang inisialisasi, data belum siap.")
+    # Id di luar katalog ditolak sebelum masuk DB / profil / counter trending
+    try:
+        recommender.row_for_id(click_data.item_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
     logger.info(f"🖱️ Merekam klik: User '{current_user.username}' -> Item ID {click_data.item_id}")
-    return crud.create_click_history(db, click=click_data, user_id=current_user.id)
+    try:
+        event = await click_writer.submit(current_user.id, click_data.item_id)
+    except Exception as e:
+        logger.error(f"Gagal merekam klik user {current_user.id}: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Gagal merekam klik, coba lagi.")
+
+    if event.id is None:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return schemas.ClickResponse(id=event.id, item_id=event.item_id, user_id=event.user_id)
 
 # ======================================================
 # 👀 ENDPOINT: LIHAT HISTORY SENDIRI
@@ -66,7 +95,7 @@ async def read_own_history(
     Mengambil riwayat klik terakhir untuk user yang sedang login.
     - **limit**: Jumlah riwayat yang ingin diambil (default 20, max 100).
     """
-    return crud.get_user_history(db, user_id=current_user.id, limit=limit)
+    return await crud.get_user_history(db, user_id=current_user.id, limit=limit)
 
 # 🔥 TAMBAHAN BARU (UNTUK PERSONALISASI FEED)
 @router.get(
@@ -86,7 +115,7 @@ async def read_own_history_ids(
     di frontend, karena hanya mengirim list ID, bukan objek penuh.
     """
     # Panggil "Resep" baru kita dari crud.py
-    id_list = crud.get_user_history_ids(db, user_id=current_user.id)
+    id_list = await crud.get_user_history_ids(db, user_id=current_user.id)
     
     # Kembalikan sesuai "Menu" baru kita dari schemas.py
     return schemas.HistoryIDResponse(item_ids=id_list)
@@ -100,14 +129,23 @@ async def read_own_history_ids(
     summary="Menghapus semua riwayat klik user (Perlu Login)"
 )
 async def delete_own_history(
+    request: Request,
     current_user: UserDependency,
     db: DbDependency
 ):
     """
-    Menghapus seluruh riwayat klik milik user yang sedang login.
+    Menghapus seluruh riwayat klik milik user yang sedang login
+    (profil personalisasinya ikut di-reset).
     """
     logger.warning(f"🧹 User '{current_user.username}' menghapus seluruh riwayat kliknya.")
     
-    crud.delete_user_history(db, user_id=current_user.id)
+    # Klik yang masih antre ditulis dulu agar tidak "muncul lagi" setelah dihapus
+    click_writer = request.app.state.model_cache.get("click_writer")
+    if click_writer:
+        await click_writer.flush()
+    await crud.delete_user_history(db, user_id=current_user.id)
+    profile_store = request.app.state.model_cache.get("profile_store")
+    if profile_store:
+        await profile_store.reset(db, current_user.id)
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,24 +1,28 @@
 # backend/main.py
 
 import logging
+import os
 import sys
 import time
 import auth
 import history
+import admin
+import security
 from contextlib import asynccontextmanager
 from pathlib import Path
 # 🔥 1. PERBAIKAN: Tambahkan 'Request' di import ini
 from fastapi import FastAPI, Request 
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from sentence_transformers import SentenceTransformer
 
 # --- Import file router & database ---
 import recommender_api 
+from encoder_service import EncoderService
 # (Nanti kita tambah: import auth, import history)
 
 # 🔥 1. IMPORT FUNGSI DATABASE
-from database import init_db # <-- TAMBAHKAN IMPORT INI
+from database import init_db, dispose_engines, AsyncSessionLocal # <-- TAMBAHKAN IMPORT INI
+from click_writer import ClickWriter
 
 # ======================================================
 # 2. KONFIGURASI PATH & IMPORT (KRITICAL FIX)
@@ -34,11 +38,19 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 try:
-    from src.recommender import Recommender 
+    from src.recommender import Recommender, ModelPaths
 except ImportError as e:
     logging.critical(f"FATAL: Gagal mengimpor 'src.recommender.Recommender'. Error: {e}")
     sys.exit("Gagal memuat modul 'Recommender'.")
 
+# (Diimpor setelah PROJECT_ROOT masuk sys.path karena memakai 'src.utils')
+from query_cache import QueryCache
+from reloader import ArtifactReloader
+from profile_store import ProfileStore
+from response_cache import ResponseCache
+from collab_service import CollabService
+from trending_service import TrendingService
+
 # --- Konfigurasi Lainnya ---
 logging.basicConfig(
     level=logging.INFO,
@@ -49,16 +61,70 @@ logger = logging.getLogger(__name__)
 
 ASSETS_DIR_PATH = PROJECT_ROOT / "assets" / "images"
 
+# Indeks vektor untuk semantic search: 'exact' (brute-force) atau 'ivf' (approximate).
+# VECTOR_INDEX_NPROBE = knob recall/latency untuk IVF (kosong = default otomatis).
+# IVF baru dipakai mulai src.vector_index.IVF_MIN_ROWS baris (di bawahnya 'exact');
+# ranking pencarian IVF dibatasi sebesar isi list yang dipindai (Recommender.search_window).
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "ivf")
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", 0)) or None
+
+# Micro-batching encoder: query yang tiba dalam jendela ENCODER_MAX_WAIT_MS
+# digabung menjadi satu panggilan encode (maks. ENCODER_MAX_BATCH query).
+ENCODER_MAX_BATCH = int(os.getenv("ENCODER_MAX_BATCH", 32))
+ENCODER_MAX_WAIT_MS = float(os.getenv("ENCODER_MAX_WAIT_MS", 5))
+
+# Cache query (vektor & hasil ranking): jumlah entri maks. dan TTL (detik).
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 1024))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", 600))
+
+# Response katalog & /similar yang sudah diserialisasi + dikompresi (per versi artefak).
+# RESPONSE_CACHE_MAX_AGE = nilai max-age di header Cache-Control (detik).
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 2048))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", 300))
+
+# Hot reload: ARTIFACT_WATCH=1 memantau dataset & artifact store dan
+# me-reload Recommender otomatis saat berubah (selain via /api/v1/admin/reload).
+ARTIFACT_WATCH = os.getenv("ARTIFACT_WATCH", "0").lower() in ("1", "true", "yes")
+
+# Backend encoder query: 'torch' (SentenceTransformer) atau 'onnx' (int8, onnxruntime).
+# Model ONNX dibuat sekali via: python scripts/export_onnx_encoder.py
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch").lower()
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", 0)) or None
+
+# Profil user inkremental: waktu paruh bobot klik dalam hari (0 = tanpa time-decay).
+PROFILE_HALF_LIFE_DAYS = float(os.getenv("PROFILE_HALF_LIFE_DAYS", 0))
+
+# Penulisan klik (write-behind): CLICK_DURABILITY 'buffered' (202, ditulis di background)
+# atau 'sync' (201 setelah commit). Batch di-flush saat penuh atau jendela waktunya habis.
+CLICK_DURABILITY = os.getenv("CLICK_DURABILITY", "buffered").lower()
+CLICK_BATCH_SIZE = int(os.getenv("CLICK_BATCH_SIZE", 256))
+CLICK_FLUSH_INTERVAL_MS = float(os.getenv("CLICK_FLUSH_INTERVAL_MS", 200))
+CLICK_MAX_QUEUE = int(os.getenv("CLICK_MAX_QUEUE", 10000))
+
+# Collaborative filtering item-item (mode 'collab'): jumlah tetangga per item &
+# shrinkage normalisasi. Hasil job offline (scripts/build_collab_model.py) dimuat bila ada.
+COLLAB_TOP_K = int(os.getenv("COLLAB_TOP_K", 50))
+COLLAB_SHRINK = float(os.getenv("COLLAB_SHRINK", 5.0))
+
+# Trending (cold start & /api/v1/trending): waktu paruh counter klik (jam, 0 = tanpa decay)
+# dan interval penyusunan ulang ranking (detik).
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24))
+TRENDING_REFRESH_S = float(os.getenv("TRENDING_REFRESH_S", 5))
+
 model_cache = {} 
 
 # ======================================================
 # 3. LOGIKA LOADING MODEL (Dengan Pemonitoran Waktu)
 # ======================================================
+def build_recommender() -> Recommender:
+    """Factory Recommender dengan konfigurasi server (dipakai saat startup & reload)."""
+    return Recommender(index_backend=VECTOR_INDEX_BACKEND, n_probe=VECTOR_INDEX_NPROBE)
+
 def load_recommender():
     logger.info("⏳ Memuat Recommender (dari src.recommender)...")
     start_time = time.time()
     try:
-        rec = Recommender() 
+        rec = build_recommender()
         assert not rec.df.empty, "Dataset (df) di dalam Recommender kosong"
         logger.info(f"✅ Berhasil memuat Recommender (data & embeddings) dalam {time.time() - start_time:.2f} detik.")
         return rec
@@ -66,17 +132,62 @@ def load_recommender():
         logger.critical(f"❌ Gagal memuat Recommender: {e}", exc_info=True)
         return None
 
+def load_onnx_model():
+    from src.onnx_encoder import OnnxEncoder
+    return OnnxEncoder(ModelPaths().onnx_dir, quantized=True, intra_op_threads=ENCODER_THREADS)
+
+def load_torch_model():
+    # Import lazy: PyTorch hanya dimuat jika backend 'torch' dipakai
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+
 def load_bert_model():
-    logger.info("⏳ Memuat model S-BERT (paraphrase-multilingual-MiniLM-L12-v2)...")
+    logger.info(f"⏳ Memuat model S-BERT (paraphrase-multilingual-MiniLM-L12-v2, backend: {ENCODER_BACKEND})...")
     start_time = time.time()
+    if ENCODER_BACKEND == "onnx":
+        try:
+            model = load_onnx_model()
+            logger.info(f"✅ Berhasil memuat encoder ONNX int8 dalam {time.time() - start_time:.2f} detik.")
+            return model
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal memuat encoder ONNX ({e}). Fallback ke SentenceTransformer (PyTorch).")
     try:
-        model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+        model = load_torch_model()
         logger.info(f"✅ Berhasil memuat model SentenceTransformer dalam {time.time() - start_time:.2f} detik.")
         return model
     except Exception as e:
         logger.critical(f"❌ Gagal memuat model BERT: {e}", exc_info=True)
         return None
 
+async def after_clicks_flushed(db, events) -> None:
+    """
+    Hook ClickWriter setelah batch klik di-commit: update profil user
+    (satu commit untuk semua user di batch), counter trending, dan model
+    co-occurrence 'collab'.
+    Tiap konsumen berdiri sendiri: yang gagal di-log, yang lain tetap jalan.
+    """
+    profile_store = model_cache.get("profile_store")
+    collab = model_cache.get("collab")
+    trending = model_cache.get("trending")
+    recommender = model_cache.get("recommender")
+    if not recommender:
+        return
+    if trending:
+        try:
+            trending.record(events)
+        except Exception as e:
+            logger.error(f"❌ Update counter trending gagal ({len(events)} klik): {e}", exc_info=True)
+    if profile_store:
+        try:
+            await profile_store.record_events(db, events, recommender)
+        except Exception as e:
+            logger.error(f"❌ Update profil user gagal ({len(events)} klik): {e}", exc_info=True)
+    if collab:
+        try:
+            await collab.add_clicks(events, recommender)
+        except Exception as e:
+            logger.error(f"❌ Update model collab gagal ({len(events)} klik): {e}", exc_info=True)
+
 # ======================================================
 # 4. LIFESPAN (Menambahkan Config & init_db)
 # ======================================================
@@ -87,7 +198,7 @@ async def lifespan(app: FastAPI):
     # 🔥 2. BUAT TABEL DATABASE SAAT STARTUP
     # (Memanggil fungsi init_db() dari database.py)
     try:
-        init_db()
+        await init_db()
     except Exception as e:
         logger.critical(f"❌ GAGAL MENGINISIALISASI DATABASE: {e}", exc_info=True)
         # (Opsional: sys.exit("Gagal init DB") jika DB wajib ada)
@@ -95,6 +206,64 @@ async def lifespan(app: FastAPI):
     # --- Load model AI ---
     model_cache["bert_model"] = load_bert_model()
     model_cache["recommender"] = load_recommender()
+
+    # --- Encoder service (encode query di luar event loop) ---
+    encoder = None
+    if model_cache["bert_model"]:
+        encoder = EncoderService(
+            model_cache["bert_model"],
+            max_batch_size=ENCODER_MAX_BATCH,
+            max_wait_ms=ENCODER_MAX_WAIT_MS,
+        )
+        await encoder.start()
+    model_cache["encoder"] = encoder
+    model_cache["query_cache"] = QueryCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+    model_cache["profile_store"] = ProfileStore(half_life_days=PROFILE_HALF_LIFE_DAYS)
+    model_cache["response_cache"] = ResponseCache(maxsize=RESPONSE_CACHE_SIZE, max_age=RESPONSE_CACHE_MAX_AGE)
+
+    # --- Collaborative filtering dari click_history (sebelum klik baru mengalir) ---
+    collab = None
+    if model_cache["recommender"]:
+        collab = CollabService(AsyncSessionLocal, path=ModelPaths().collab, k=COLLAB_TOP_K, shrink=COLLAB_SHRINK)
+        try:
+            await collab.start(model_cache["recommender"])
+        except Exception as e:
+            logger.error(f"❌ Gagal membangun model collaborative filtering: {e}", exc_info=True)
+            collab = None
+    model_cache["collab"] = collab
+
+    # --- Trending: counter popularitas ter-decay, di-seed dari click_history ---
+    trending = TrendingService(
+        AsyncSessionLocal,
+        get_recommender=lambda: model_cache.get("recommender"),
+        half_life_hours=TRENDING_HALF_LIFE_HOURS,
+        refresh_s=TRENDING_REFRESH_S,
+    )
+    try:
+        await trending.start()
+    except Exception as e:
+        logger.error(f"❌ Gagal menyiapkan counter trending: {e}", exc_info=True)
+        trending = None
+    model_cache["trending"] = trending
+
+    # --- Penulisan klik per batch (write-behind) ---
+    click_writer = ClickWriter(
+        AsyncSessionLocal,
+        durability=CLICK_DURABILITY,
+        batch_size=CLICK_BATCH_SIZE,
+        flush_interval_ms=CLICK_FLUSH_INTERVAL_MS,
+        max_queue=CLICK_MAX_QUEUE,
+        on_flush=after_clicks_flushed,
+    )
+    await click_writer.start()
+    model_cache["click_writer"] = click_writer
+
+    # --- Hot reload artefak (admin endpoint & file-watch) ---
+    reloader = ArtifactReloader(model_cache, factory=build_recommender)
+    if ARTIFACT_WATCH:
+        paths = ModelPaths()
+        reloader.start_watching([paths.data.parent, paths.store])
+    model_cache["reloader"] = reloader
     
     model_cache["CATEGORY_BOOST"] = 0.5 
     
@@ -108,6 +277,17 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("🛑 Server shutdown...")
+    # Drain antrean klik dulu (butuh DB, profile_store & recommender yang masih hidup)
+    if model_cache.get("click_writer"):
+        await model_cache["click_writer"].stop()
+    if model_cache.get("trending"):
+        await model_cache["trending"].stop()
+    if model_cache.get("reloader"):
+        await model_cache["reloader"].stop()
+    if model_cache.get("encoder"):
+        await model_cache["encoder"].stop()
+    security.password_hasher.shutdown()
+    await dispose_engines()
     model_cache.clear()
     logger.info("🧹 Cache model dibersihkan.")
 
@@ -154,6 +334,7 @@ else:
 app.include_router(recommender_api.router)
 app.include_router(auth.router)     # <-- Kode kamu sudah ada
 app.include_router(history.router)  # <-- Kode kamu sudah ada
+app.include_router(admin.router)
 # (Komentar placeholder di bawah ini sekarang bisa dihapus)
 # (Nanti kita tambah: import auth, import history)
 # (Nanti kita tambah: app.include_router(auth.router))
@@ -0,0 +1,70 @@
+# backend/migrations.py
+
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection
+
+import models
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 🧱 MIGRASI SKEMA RINGAN (Tanpa Alembic)
+# ======================================================
+# `create_all` hanya membuat tabel yang belum ada; perubahan pada tabel
+# yang SUDAH ada (mis. index baru) disusulkan di sini. Setiap migrasi
+# punya nomor versi, dijalankan sekali, dan dicatat di `schema_migrations`.
+# Langkah migrasi harus idempoten (DB baru sudah punya skema terbaru).
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def _click_history_composite_indexes(conn: Connection) -> None:
+    """
+    Index komposit click_history. Index lama yang redundan dibuang agar
+    INSERT tidak memelihara index ekstra: user_id (prefix index komposit)
+    dan id (sudah primary key).
+    """
+    for index in models.ClickHistory.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    existing = {ix["name"] for ix in inspect(conn).get_indexes("click_history")}
+    for redundant in ("ix_click_history_user_id", "ix_click_history_id"):
+        if redundant in existing:
+            conn.execute(text(f"DROP INDEX {redundant}"))
+    if conn.dialect.name == "sqlite":
+        # Statistik planner untuk index baru
+        conn.execute(text("PRAGMA optimize"))
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "click_history: index (user_id, timestamp) & (user_id, item_id, timestamp)", _click_history_composite_indexes),
+]
+
+
+def run_migrations(conn: Connection) -> List[int]:
+    """
+    Menjalankan migrasi yang belum tercatat (dalam transaksi `conn`).
+    Dipanggil dari `database.init_db` via `run_sync`. Mengembalikan versi yang dijalankan.
+    """
+    _meta.create_all(conn)
+    applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    done = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info(f"🧱 Migrasi {version}: {name}")
+        step(conn)
+        conn.execute(schema_migrations.insert().values(
+            version=version, name=name, applied_at=datetime.now(timezone.utc)
+        ))
+        done.append(version)
+    return done
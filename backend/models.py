@@ -1,7 +1,7 @@
 # backend/models.py
 
 import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, LargeBinary, JSON, Index
 from sqlalchemy.orm import relationship
 # 1. Import 'func' untuk timestamp di level DB (Review Poin 4)
 from sqlalchemy.sql import func 
@@ -31,6 +31,12 @@ class User(Base):
         # Jika User dihapus, semua history-nya ikut terhapus.
         cascade="all, delete-orphan"
     )
+    profile = relationship(
+        "UserProfile",
+        back_populates="owner",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
 
     # 4. __repr__ untuk debugging (Review Poin 2)
     def __repr__(self):
@@ -44,8 +50,17 @@ class ClickHistory(Base):
     """Model log riwayat klik pengguna."""
 
     __tablename__ = "click_history"
+    # Index komposit untuk query per user (lihat crud.py):
+    # - (user_id, timestamp): riwayat terbaru & rebuild profil (ORDER BY timestamp)
+    # - (user_id, item_id, timestamp): item unik + MAX(timestamp) langsung dari index (covering)
+    # Keduanya juga melayani filter 'user_id' saja, jadi index tunggal user_id tidak perlu.
+    __table_args__ = (
+        Index("ix_click_history_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_click_history_user_id_item_id_timestamp", "user_id", "item_id", "timestamp"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # (Tanpa index=True: primary key sudah ter-index, index ekstra hanya memperlambat INSERT)
+    id = Column(Integer, primary_key=True)
     
     item_id = Column(Integer, nullable=False, index=True) 
     
@@ -58,12 +73,44 @@ class ClickHistory(Base):
 
     # --- Foreign Key (Kunci Tamu) ---
     # 6. Indexing di Foreign Key (Review Poin 6)
-    # Mempercepat query pencarian history berdasarkan user_id
-    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    # Pencarian history berdasarkan user_id dilayani index komposit di atas
+    user_id = Column(Integer, ForeignKey("users.id"))
 
     # --- Relasi (Profesional Practice) ---
     owner = relationship("User", back_populates="history")
 
     # 4. __repr__ untuk debugging (Review Poin 2)
     def __repr__(self):
-        return f"<ClickHistory(user_id={self.user_id}, item_id={self.item_id})>"
\ No newline at end of file
+        return f"<ClickHistory(user_id={self.user_id}, item_id={self.item_id})>"
+
+# ======================================================
+# Definisi Tabel 'UserProfile'
+# ======================================================
+class UserProfile(Base):
+    """
+    Profil personalisasi per user yang di-update secara inkremental
+    setiap ada klik (lihat backend/profile_store.py).
+    """
+
+    __tablename__ = "user_profiles"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Jumlah (ter-decay) embeddings item yang diklik, float64 mentah (bytes)
+    vector_sum = Column(LargeBinary, nullable=False)
+    # Total bobot klik (ter-decay) & jumlah klik mentah
+    weight = Column(Float, nullable=False, default=0.0)
+    click_count = Column(Integer, nullable=False, default=0)
+    # {kategori: bobot} dan daftar item_id unik (terbaru di akhir)
+    category_counts = Column(JSON, nullable=False, default=dict)
+    item_ids = Column(JSON, nullable=False, default=list)
+
+    # Fingerprint embeddings yang dipakai (profil dibangun ulang jika berbeda)
+    embeddings_version = Column(String(64))
+    # Epoch detik saat profil terakhir di-update (referensi time-decay)
+    updated_at = Column(Float, nullable=False)
+
+    owner = relationship("User", back_populates="profile")
+
+    def __repr__(self):
+        return f"<UserProfile(user_id={self.user_id}, click_count={self.click_count})>"
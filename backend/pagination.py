@@ -0,0 +1,69 @@
+# backend/pagination.py
+
+import base64
+import binascii
+import json
+from typing import List, Optional, Sequence
+
+import pandas as pd
+from fastapi import HTTPException, status
+
+# ======================================================
+# 📄 PAGINATION & PROYEKSI KOLOM
+# ======================================================
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Kedalaman maksimum hasil pencarian yang bisa dipaginasi
+MAX_SEARCH_RESULTS = 1000
+
+
+def encode_cursor(offset: int, version: Optional[str]) -> str:
+    """Cursor opaque: offset + versi artefak (base64 url-safe)."""
+    payload = json.dumps({"o": offset, "v": version}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], version: Optional[str]) -> int:
+    """
+    Mengembalikan offset dari cursor (0 jika cursor kosong).
+    Cursor dari versi artefak lain ditolak karena urutan hasil bisa berubah.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor tidak valid.")
+    if offset < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor tidak valid.")
+    if payload.get("v") != version:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor kedaluwarsa (data sudah diperbarui). Ulangi dari halaman pertama.",
+        )
+    return offset
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Parsing parameter `fields=id,nama_wisata,...`.
+    Kosong = semua kolom `allowed`. Kolom tak dikenal -> HTTP 400.
+    """
+    if not fields:
+        return list(allowed)
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Field tidak dikenal: {unknown}. Pilihan: {list(allowed)}",
+        )
+    return requested or list(allowed)
+
+
+def to_records(df: pd.DataFrame, columns: Sequence[str]) -> List[dict]:
+    """Serialisasi hanya kolom yang diminta (NaN -> None)."""
+    projected = df[list(columns)]
+    return projected.astype(object).where(projected.notna(), None).to_dict("records")
@@ -0,0 +1,116 @@
+# backend/password_hasher.py
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Batas atas bucket histogram latensi (ms); bucket terakhir = +inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PasswordHasherBusy(Exception):
+    """Antrean hashing penuh; request sebaiknya ditolak (HTTP 503) daripada menumpuk."""
+
+
+class LatencyHistogram:
+    """Histogram latensi kumulatif dengan bucket tetap (ms)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_ms = 0.0
+        self.count = 0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.total_ms += ms
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b:g}" for b in self.buckets] + [f">{self.buckets[-1]:g}"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+# ======================================================
+# 🔐 POOL HASHING PASSWORD (Off Event Loop, Bounded)
+# ======================================================
+class PasswordHasher:
+    """
+    Menjalankan bcrypt (hash & verify, ~100-300 ms CPU per panggilan
+    pada cost 12) di thread pool khusus agar tidak memblokir event loop.
+    Modul `bcrypt` melepas GIL selama hashing, jadi thread sudah cukup
+    untuk paralelisme nyata tanpa overhead process pool.
+
+    - Maks. `max_workers` hash berjalan bersamaan.
+    - Maks. `max_queue` hash lain boleh menunggu; lebih dari itu
+      `PasswordHasherBusy` di-raise (backpressure, bukan antrean tak hingga).
+    - Histogram latensi antre (`wait`) dan total (`latency`) per operasi.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.wait = LatencyHistogram()
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    async def run(self, op: str, fn: Callable[..., T], *args) -> T:
+        """
+        Menjalankan `fn(*args)` di pool. `op` hanya label metrik
+        (mis. 'hash' / 'verify').
+
+        Raises:
+            PasswordHasherBusy: Jika worker + antrean sudah penuh.
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy("Server sedang sibuk (antrean hashing password penuh). Coba lagi sebentar.")
+
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        started = submitted
+
+        def job():
+            nonlocal started
+            started = time.perf_counter()
+            return fn(*args)
+
+        if self._executor is None:
+            # Dibuat lazy (dan dibuat ulang setelah shutdown, mis. restart lifespan)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self.in_flight -= 1
+            done = time.perf_counter()
+            self.wait.observe((started - submitted) * 1000)
+            self.latency.setdefault(op, LatencyHistogram()).observe((done - submitted) * 1000)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("🛑 Pool hashing password dihentikan.")
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "wait": self.wait.snapshot(),
+            "latency": {op: hist.snapshot() for op, hist in self.latency.items()},
+        }
@@ -0,0 +1,304 @@
+# backend/profile_store.py
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 🧭 PROFIL USER INKREMENTAL (Personalisasi)
+# ======================================================
+@dataclass
+class Profile:
+    """
+    Ringkasan riwayat klik satu user:
+    - `vector_sum`: Σ w_i · embedding(item_i), w_i = bobot decay klik ke-i.
+    - `weight`: Σ w_i (untuk rata-rata bila diperlukan).
+    - `category_counts`: bobot klik per kategori.
+    - `item_ids`: item unik yang pernah diklik (terbaru di akhir).
+
+    Semua bobot di-decay bersama dengan faktor yang sama, jadi arah
+    `vector_sum` (yang dipakai untuk cosine) tetap benar tanpa
+    perlu menyentuh klik lama.
+    """
+    user_id: int
+    vector_sum: np.ndarray
+    weight: float = 0.0
+    click_count: int = 0
+    category_counts: Dict[str, float] = field(default_factory=dict)
+    item_ids: Dict[int, None] = field(default_factory=dict)
+    embeddings_version: Optional[str] = None
+    updated_at: float = 0.0
+
+    @property
+    def top_category(self) -> Optional[str]:
+        """Kategori dengan bobot terbesar (seri -> yang paling baru diklik)."""
+        if not self.category_counts:
+            return None
+        return max(reversed(self.category_counts), key=self.category_counts.get)
+
+    def decay_to(self, now: float, decay_rate: float) -> None:
+        """Men-decay semua bobot dari `updated_at` ke `now` (O(d))."""
+        if decay_rate > 0 and now > self.updated_at:
+            factor = math.exp(-decay_rate * (now - self.updated_at))
+            self.vector_sum *= factor
+            self.weight *= factor
+            for cat in self.category_counts:
+                self.category_counts[cat] *= factor
+        self.updated_at = max(self.updated_at, now)
+
+    def add_click(self, item_id: int, vector: np.ndarray, category: Optional[str], now: float, decay_rate: float) -> None:
+        """Menambahkan satu klik ke profil (O(d))."""
+        self.decay_to(now, decay_rate)
+        self.vector_sum += vector
+        self.weight += 1.0
+        self.click_count += 1
+        if category is not None:
+            # Re-insert agar urutan dict = urutan klik terakhir (untuk tie-break)
+            self.category_counts[category] = self.category_counts.pop(category, 0.0) + 1.0
+        self.item_ids.pop(item_id, None)
+        self.item_ids[item_id] = None
+
+
+def _to_epoch(ts: Optional[datetime]) -> float:
+    """Timestamp DB -> epoch detik. Timestamp naive (SQLite) dianggap UTC."""
+    if ts is None:
+        return time.time()
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _embeddings_version(recommender) -> Optional[str]:
+    index = getattr(recommender, "vector_index", None)
+    return getattr(index, "fingerprint", None) or getattr(recommender, "artifact_version", None)
+
+
+class ProfileStore:
+    """
+    Menyimpan profil user di tabel `user_profiles` dan meng-cache-nya
+    di memori (LRU). Profil di-update O(d) per klik, di-reset saat
+    riwayat dihapus, dan dibangun ulang dari `click_history` bila
+    belum ada atau dibuat dengan embeddings versi lain.
+
+    Tabel adalah sumber kebenaran (beberapa worker uvicorn berbagi DB):
+    - update klik selalu membaca ulang baris DB (dikunci FOR UPDATE),
+      tidak pernah menambah klik ke profil dari cache;
+    - cache hanya untuk baca, dan dipakai jika (click_count, updated_at)-nya
+      masih sama dengan baris DB (profil yang diubah / dihapus worker lain
+      otomatis dimuat ulang).
+
+    Args:
+        half_life_days: Waktu paruh bobot klik (0 = tanpa decay).
+        maxsize: Jumlah profil maksimum di cache memori.
+    """
+
+    def __init__(self, half_life_days: float = 0.0, maxsize: int = 10000):
+        self.half_life_days = half_life_days
+        self.decay_rate = math.log(2) / (half_life_days * 86400) if half_life_days > 0 else 0.0
+        self._cache = TTLCache(maxsize, ttl=0)
+        self.updates = 0
+        self.rebuilds = 0
+        self.resets = 0
+
+    # --------------------------------------------------
+    # Serialisasi DB <-> Profile
+    # --------------------------------------------------
+    @staticmethod
+    def _from_row(row) -> Profile:
+        return Profile(
+            user_id=row.user_id,
+            vector_sum=np.frombuffer(row.vector_sum, dtype=np.float64).copy(),
+            weight=row.weight,
+            click_count=row.click_count,
+            category_counts=dict(row.category_counts or {}),
+            item_ids=dict.fromkeys(row.item_ids or []),
+            embeddings_version=row.embeddings_version,
+            updated_at=row.updated_at,
+        )
+
+    async def _save(self, db: AsyncSession, profile: Profile, commit: bool = True) -> None:
+        # Cache boleh diisi sebelum commit: stempel yang tidak cocok dengan DB
+        # (commit gagal) membuat profil dimuat ulang saat dibaca
+        await crud.save_user_profile(
+            db, profile.user_id, commit=commit,
+            vector_sum=profile.vector_sum.astype(np.float64).tobytes(),
+            weight=profile.weight,
+            click_count=profile.click_count,
+            category_counts=profile.category_counts,
+            item_ids=list(profile.item_ids),
+            embeddings_version=profile.embeddings_version,
+            updated_at=profile.updated_at,
+        )
+        self._cache.set(profile.user_id, profile)
+
+    async def _load(self, db: AsyncSession, user_id: int, recommender, for_update: bool = False) -> Optional[Profile]:
+        """
+        Profil user, atau None jika belum ada / versi embeddings beda.
+        Baca biasa: cache dipakai selama stempelnya sama dengan baris DB.
+        `for_update=True` (sebelum update): selalu dari baris DB yang dikunci.
+        """
+        if for_update:
+            row = await crud.get_user_profile(db, user_id, for_update=True)
+            profile = self._from_row(row) if row is not None else None
+        else:
+            stamp = await crud.get_user_profile_stamp(db, user_id)
+            profile = self._cache.get(user_id)
+            if stamp is None:
+                self._cache.pop(user_id)
+                profile = None
+            elif profile is None or (profile.click_count, profile.updated_at) != stamp:
+                row = await crud.get_user_profile(db, user_id)
+                profile = self._from_row(row) if row is not None else None
+                if profile is not None:
+                    self._cache.set(user_id, profile)
+        if profile is None:
+            return None
+        if profile.embeddings_version != _embeddings_version(recommender) \
+                or profile.vector_sum.shape[0] != recommender.embeddings.shape[1]:
+            return None
+        return profile
+
+    # --------------------------------------------------
+    # API publik
+    # --------------------------------------------------
+    async def rebuild(self, db: AsyncSession, user_id: int, recommender, commit: bool = True) -> Optional[Profile]:
+        """Membangun ulang profil dari seluruh `click_history` user (vektorisasi)."""
+        clicks = await crud.get_user_clicks(db, user_id)
+        if not clicks:
+            await self.reset(db, user_id, commit=commit)
+            return None
+
+        item_ids = np.array([item_id for item_id, _ in clicks], dtype=np.int64)
+        times = np.array([_to_epoch(ts) for _, ts in clicks])
+        now = max(times.max(), time.time())
+        weights = np.exp(-self.decay_rate * (now - times))
+
+        # Klik ke item yang sudah tidak ada di dataset diabaikan
+        rows = recommender.lookup_rows(item_ids)
+        known = rows >= 0
+        rows, w = rows[known], weights[known]
+
+        vector_sum = w @ np.asarray(recommender.embeddings[rows], dtype=np.float64) if rows.size \
+            else np.zeros(recommender.embeddings.shape[1])
+        category_counts: Dict[str, float] = {}
+        for code, weight in zip(recommender.category_codes[rows], w):
+            if code >= 0:
+                cat = str(recommender.categories[code])
+                category_counts[cat] = category_counts.pop(cat, 0.0) + float(weight)
+
+        recent_items: Dict[int, None] = {}
+        for item_id in item_ids.tolist():
+            recent_items.pop(item_id, None)
+            recent_items[item_id] = None
+
+        profile = Profile(
+            user_id=user_id,
+            vector_sum=vector_sum,
+            weight=float(w.sum()),
+            click_count=len(clicks),
+            category_counts=category_counts,
+            item_ids=recent_items,
+            embeddings_version=_embeddings_version(recommender),
+            updated_at=float(now),
+        )
+        await self._save(db, profile, commit=commit)
+        self.rebuilds += 1
+        logger.info(f"🧭 Profil user {user_id} dibangun ulang dari {len(clicks)} klik.")
+        return profile
+
+    async def get(self, db: AsyncSession, user_id: int, recommender) -> Optional[Profile]:
+        """
+        Profil user siap pakai (dibangun ulang otomatis bila perlu).
+        None = belum ada klik, atau Recommender dimuat tanpa embeddings
+        (pemanggil fallback ke cold start).
+        """
+        if recommender.embeddings is None:
+            return None
+        profile = await self._load(db, user_id, recommender)
+        if profile is None:
+            profile = await self.rebuild(db, user_id, recommender)
+        return profile
+
+    async def record_clicks(self, db: AsyncSession, user_id: int,
+                            clicks: List[Tuple[int, Optional[datetime]]], recommender,
+                            commit: bool = True) -> Optional[Profile]:
+        """
+        Update inkremental setelah batch klik (urut waktu) di-commit ke
+        `click_history`, dengan satu kali simpan profil (dipakai saat flush
+        batch klik). Jika profil belum ada / basi, dibangun ulang (sudah
+        termasuk klik-klik ini). Tanpa embeddings profil tidak disentuh
+        (dibangun ulang dari `click_history` begitu embeddings tersedia).
+        `commit=False`: perubahan hanya di-stage (lihat `record_events`).
+        """
+        if recommender.embeddings is None:
+            return None
+        profile = await self._load(db, user_id, recommender, for_update=True)
+        if profile is None:
+            return await self.rebuild(db, user_id, recommender, commit=commit)
+
+        changed = False
+        for item_id, clicked_at in clicks:
+            row = recommender.lookup_rows([item_id])[0]
+            if row < 0:
+                logger.warning(f"Item ID {item_id} tidak ada di dataset, profil user {user_id} tidak diubah.")
+                continue
+
+            code = recommender.category_codes[row]
+            category = str(recommender.categories[code]) if code >= 0 else None
+            vector = np.asarray(recommender.embeddings[row], dtype=np.float64)
+            profile.add_click(item_id, vector, category, _to_epoch(clicked_at), self.decay_rate)
+            self.updates += 1
+            changed = True
+        if changed:
+            await self._save(db, profile, commit=commit)
+        return profile
+
+    async def record_events(self, db: AsyncSession, events: List, recommender) -> None:
+        """
+        Hook flush ClickWriter: update profil semua user di batch lalu SATU
+        commit (bukan satu commit per user). Jika gagal, perubahan di-rollback
+        dan profil user-user tersebut dihapus agar dibangun ulang dari
+        `click_history` (yang sudah berisi klik batch ini) saat dibaca.
+        """
+        clicks_per_user: Dict[int, List[Tuple[int, Optional[datetime]]]] = {}
+        for event in events:
+            clicks_per_user.setdefault(event.user_id, []).append((event.item_id, event.timestamp))
+        try:
+            for user_id, clicks in clicks_per_user.items():
+                await self.record_clicks(db, user_id, clicks, recommender, commit=False)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for user_id in clicks_per_user:
+                self._cache.pop(user_id)
+                try:
+                    await self.reset(db, user_id)
+                except Exception as e:
+                    logger.error(f"Gagal menghapus profil basi user {user_id}: {e}")
+            raise
+
+    async def reset(self, db: AsyncSession, user_id: int, commit: bool = True) -> None:
+        """Menghapus profil user (dipanggil saat riwayat klik dihapus)."""
+        await crud.delete_user_profile(db, user_id, commit=commit)
+        self._cache.pop(user_id)
+        self.resets += 1
+
+    def stats(self) -> dict:
+        return {
+            "half_life_days": self.half_life_days,
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+            "resets": self.resets,
+            "cache": self._cache.stats(),
+        }
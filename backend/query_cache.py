@@ -0,0 +1,54 @@
+# backend/query_cache.py
+
+import logging
+
+from src.utils import clean_text
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 🔎 CACHE QUERY (Vektor & Hasil Ranking)
+# ======================================================
+class QueryCache:
+    """
+    Dua cache untuk jalur pencarian:
+    - `vectors`: query ternormalisasi -> vektor embedding query.
+    - `results`: (query ternormalisasi, parameter) -> (row index, skor) terurut.
+
+    Kunci memakai `src.utils.clean_text`, jadi "Pantai!!" dan "pantai"
+    dianggap query yang sama. Kedua cache otomatis dikosongkan saat
+    `artifact_version` Recommender berubah (artefak di-reload).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.vectors = TTLCache(maxsize, ttl)
+        self.results = TTLCache(maxsize, ttl)
+        self.artifact_version: str | None = None
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return clean_text(query)
+
+    def sync(self, recommender: object) -> None:
+        """Invalidasi cache jika Recommender yang aktif memuat artefak berbeda."""
+        version = getattr(recommender, "artifact_version", None)
+        if version != self.artifact_version:
+            if self.artifact_version is not None:
+                logger.info(f"♻️ Artefak berubah ({self.artifact_version} -> {version}), cache query dikosongkan.")
+                self.invalidations += 1
+            self.clear()
+            self.artifact_version = version
+
+    def clear(self) -> None:
+        self.vectors.clear()
+        self.results.clear()
+
+    def stats(self) -> dict:
+        return {
+            "artifact_version": self.artifact_version,
+            "invalidations": self.invalidations,
+            "vectors": self.vectors.stats(),
+            "results": self.results.stats(),
+        }
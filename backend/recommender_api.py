@@ -1,16 +1,23 @@
 # backend/recommender_api.py
 
 import logging
-from fastapi import APIRouter, Request, HTTPException
-from typing import List
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Annotated, List, Literal, Optional
+from urllib.parse import quote
+from sqlalchemy.ext.asyncio import AsyncSession
 import pandas as pd
 import numpy as np
 
 # 1. Import 'cetakan' Pydantic dari file schemas.py
 # (Kita juga butuh 'List' dari typing untuk response_model)
-from schemas import RecommendationRequest 
+from schemas import RecommendationRequest, RecommendationResponse, DestinationOut, TrendingResponse, BatchRequest, BatchResponse, AutocompleteResponse
+from encoder_service import EncoderService
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_SEARCH_RESULTS, decode_cursor, encode_cursor, parse_fields, to_records
+import models
+import security
+from database import get_db
 
 # 2. Buat 'Router'. Ini seperti 'mini-FastAPI'
 router = APIRouter(
@@ -23,34 +30,87 @@ logger = logging.getLogger(__name__)
 # LOGIKA INTI (Dipindah dari main.py)
 # ======================================================
 
-def get_semantic_search_logic(query: str, recommender: object, bert_model: SentenceTransformer, top_k: int = None):
+async def get_semantic_search_logic(query: str, recommender: object, encoder: EncoderService, top_k: int = None, n_probe: int = None, cache: object = None, offset: int = 0, limit: int = None, mode: str = "semantic", fusion: str = "rrf", facets: dict = None):
     """
-    Logika murni untuk semantic search.
-    (Review Poin 2: Normalisasi opsional bisa ditambah di sini jika perlu)
-    """
-    if not query: return pd.DataFrame() # Defensive check awal
-    
-    query_vec = bert_model.encode([query], show_progress_bar=False)
-    sim_scores = cosine_similarity(query_vec, recommender.embeddings)[0]
+    Logika murni untuk pencarian (semantic / lexical / hybrid).
+    Encoding query di-await dari EncoderService (batching di thread
+    terpisah) agar event loop tidak terblokir.
+    - semantic: indeks vektor milik Recommender (exact / IVF), bukan
+      scan cosine_similarity ke semua baris. `n_probe` opsional untuk
+      mengatur trade-off recall/latency (IVF).
+    - lexical : BM25 atas 'fitur_bersih' (tanpa encoding sama sekali).
+    - hybrid  : kandidat BM25 + indeks vektor, di-rerank semantik lalu
+      difusikan (`fusion`: 'rrf' / 'blend').
+    Jika `cache` (QueryCache) diberikan, vektor query & hasil ranking
+    dipakai ulang berdasarkan query yang sudah dinormalisasi.
+    `offset`/`limit` memotong satu halaman dari ranking `top_k` teratas
+    (ranking-nya sendiri tetap sama untuk semua halaman).
+    `facets` (mis. {'kategori': [...]}) di-resolve jadi mask baris dan
+    diterapkan SEBELUM scoring & top-k, jadi halaman selalu penuh.
+    Nilai facet yang tidak dikenal -> ValueError.
 
-    # (Opsional: Normalisasi skor 0-1)
-    # sim_scores = (sim_scores - sim_scores.min()) / (sim_scores.max() - sim_scores.min() + 1e-9)
+    Returns:
+        Tuple (DataFrame halaman, jumlah total hasil yang bisa dipaginasi).
+    """
+    if not query: return pd.DataFrame(), 0 # Defensive check awal
 
     if top_k is None: top_k = len(recommender.df)
-    
-    idx = np.argsort(sim_scores)[::-1][:top_k]
+    mask = recommender.facet_mask(facets)
+    facet_key = tuple(sorted((col, tuple(sorted(vals))) for col, vals in (facets or {}).items() if vals))
+
+    async def get_vector(text: str):
+        if mode == "lexical":
+            return None
+        if cache and key:
+            # Kunci cache = teks ternormalisasi, tetapi encoder selalu menerima teks
+            # asli (angka & huruf non-ASCII tetap ada, sama seperti tanpa cache)
+            query_vec = cache.vectors.get(key)
+            if query_vec is None:
+                query_vec = await encoder.encode(text)
+                cache.vectors.set(key, query_vec)
+            return query_vec
+        return await encoder.encode(text)
+
+    def rank(query_vec):
+        if mode == "lexical":
+            return recommender.lexical_search(query, top_k, mask=mask)
+        if mode == "hybrid":
+            return recommender.hybrid_search(query, query_vec, top_k, fusion=fusion, mask=mask, n_probe=n_probe)
+        return recommender.search(query_vec, top_k, mask=mask, n_probe=n_probe)
+
+    # Query yang isinya hilang setelah normalisasi (mis. angka saja) tidak di-cache
+    key = cache.normalize(query) if cache else ""
+    if cache and key:
+        cache.sync(recommender)
+        result_key = (key, top_k, n_probe, mode, fusion if mode == "hybrid" else None, facet_key)
+        cached = cache.results.get(result_key)
+        if cached is not None:
+            idx, scores = cached
+        else:
+            idx, scores = rank(await get_vector(query))
+            cache.results.set(result_key, (idx, scores))
+    else:
+        idx, scores = rank(await get_vector(query))
+
+    end = None if limit is None else offset + limit
+    total = len(idx)
+    idx, scores = idx[offset:end], scores[offset:end]
     df_results = recommender.df.iloc[idx].copy()
-    df_results["skor_kemiripan"] = np.round(sim_scores[idx], 3)
-    return df_results
+    df_results["skor_kemiripan"] = np.round(np.asarray(scores, dtype=np.float64), 3)
+    return df_results, total
 
 def get_personalized_feed_logic(
-    history: List[str], 
+    history_rows: np.ndarray, 
     recommender: object, 
     request: Request, # 🔥 1. Terima 'request'
-    top_n: int = 9
+    top_n: int = 9,
+    mask: np.ndarray = None
 ):
     """
     Logika murni untuk feed personalisasi dengan category boost.
+    `history_rows` adalah index baris (hasil `recommender.rows_for_ids`),
+    sehingga tidak ada lagi scan nama -> index per item riwayat.
+    `mask` (facet) membatasi kandidat sebelum ranking / sampling.
     """
     df = recommender.df
     
@@ -61,117 +121,539 @@ def get_personalized_feed_logic(
     except Exception:
         BOOST = 0.5
     
-    if not history:
-        results = df.sample(top_n, random_state=42)
-        title = "✨ Jelajahi Destinasi Populer di Jember"
-        return results, title
+    if len(history_rows) == 0:
+        return _cold_start(recommender, request, top_n, mask), "✨ Jelajahi Destinasi Populer di Jember"
     try:
-        idx_hist = [df.index[df["nama_wisata"] == nama].item() for nama in history if nama in df['nama_wisata'].values]
-        if not idx_hist:
+        idx, _, top_cat = recommender.rank_for_history(history_rows, top_n, category_boost=BOOST, mask=mask)
+        if len(idx) == 0:
             logger.warning("Riwayat klik tidak valid, kembali ke cold start.")
-            return get_personalized_feed_logic([], recommender, request, top_n) # Pass 'request'
-        
-        hist_vec = recommender.embeddings[idx_hist]
-        user_vec = np.mean(hist_vec, axis=0).reshape(1, -1)
-        sim_scores = cosine_similarity(user_vec, recommender.embeddings)[0]
-        
-        clicked_cats = df.loc[idx_hist, "kategori"]
-        top_cat = clicked_cats.value_counts().idxmax()
-        
-        # Gunakan BOOST yang sudah configurable
-        mask = (df["kategori"] == top_cat)
-        sim_scores[mask] += BOOST 
+            return get_personalized_feed_logic([], recommender, request, top_n, mask) # Pass 'request'
         
-        idx = sim_scores.argsort()[::-1]
-        df_sorted = df.iloc[idx]
-        final_df = df_sorted[~df_sorted["nama_wisata"].isin(history)]
-        results = final_df.head(top_n)
-        title = f"🔥 Karena Anda Suka Kategori '{top_cat}'"
+        results = df.iloc[idx]
+        title = f"🔥 Karena Anda Suka Kategori '{top_cat}'" if top_cat is not None else "🔥 Pilihan Untuk Anda"
         return results, title
     except Exception as e:
         logger.error(f"Gagal memproses feed personalisasi: {e}", exc_info=True)
-        results = df.sample(top_n, random_state=42)
-        title = "✨ Jelajahi Destinasi Populer di Jember"
-        return results, title
+        return _cold_start(recommender, request, top_n, mask), "✨ Jelajahi Destinasi Populer di Jember"
+
+def _cold_start(recommender: object, request: Request, top_n: int, mask: np.ndarray = None) -> pd.DataFrame:
+    """
+    Feed tanpa riwayat: top-n trending (klik ter-decay, lihat trending_service.py)
+    dari baris yang lolos filter; sebelum ada klik urutannya dari prior popularitas.
+    Tanpa service trending -> sampel deterministik.
+    """
+    df = recommender.df
+    trending = request.app.state.model_cache.get("trending")
+    if trending:
+        rows, _ = trending.top(recommender, top_n, mask)
+        return df.iloc[rows]
+    if mask is None:
+        return df.sample(min(top_n, len(df)), random_state=42)
+    eligible = df[mask]
+    return eligible.sample(min(top_n, len(eligible)), random_state=42)
+
+def get_profile_feed_logic(profile: object, recommender: object, request: Request, top_n: int = 9, mask: np.ndarray = None):
+    """
+    Feed personal dari profil user tersimpan (lihat profile_store.py):
+    satu dot product vektor profil ke embeddings, boost kategori dominan,
+    item yang pernah diklik dikecualikan.
+    """
+    try:
+        BOOST = float(request.app.state.model_cache.get("CATEGORY_BOOST", 0.5))
+    except Exception:
+        BOOST = 0.5
+
+    top_cat = profile.top_category
+    idx, _ = recommender.rank_for_profile(
+        profile.vector_sum, top_n, top_cat, BOOST,
+        exclude_rows=recommender.rows_for_ids(profile.item_ids), mask=mask,
+    )
+    if len(idx) == 0:
+        return get_personalized_feed_logic([], recommender, request, top_n, mask)
+    title = f"🔥 Karena Anda Suka Kategori '{top_cat}'" if top_cat is not None else "🔥 Pilihan Untuk Anda"
+    return recommender.df.iloc[idx], title
+
+async def get_batch_logic(body: BatchRequest, recommender: object, encoder: EncoderService, mask: np.ndarray = None,
+                          cache: object = None, collab: object = None, columns: List[str] = None) -> dict:
+    """
+    Logika /batch: semua item referensi dilayani tabel tetangga dalam satu
+    operasi tervektorisasi, dan semua query di-encode dalam SATU panggilan
+    `encode_many` (vektor yang sudah ada di cache dilewati) lalu di-scoring
+    dengan satu perkalian matriks (exact, `Recommender.search_batch`).
+    Hasil dikunci dengan input aslinya; input yang gagal mendapat `error`.
+    """
+    df = recommender.df
+    columns = columns or recommender.RECOMMENDATION_COLS + [SEARCH_SCORE_COL]
+    items, queries = {}, {}
+
+    def records(rows, scores):
+        df_results = df.iloc[rows].copy()
+        df_results[SEARCH_SCORE_COL] = np.round(np.asarray(scores, dtype=np.float64), 3)
+        return to_records(df_results, columns)
+
+    # --- "Mirip dengan": tabel tetangga (tanpa encode) ---
+    item_ids = list(dict.fromkeys(body.item_ids))
+    if item_ids:
+        rows = recommender.lookup_rows(item_ids)
+        known = rows >= 0
+
+        mode = body.mode
+        if mode == "collab":
+            if collab:
+                collab.publish(recommender)
+            if recommender.similarity_matrices.get("collab") is None:
+                mode = "bert"
+        nb_ids, nb_scores, valid = recommender.similar_for_rows(rows[known], body.top_k, mode)
+        if mode == "collab":
+            # Item tanpa data klik -> tetangga konten (sama seperti /similar)
+            empty = ~valid.any(axis=1)
+            if empty.any():
+                nb_ids[empty], nb_scores[empty], valid[empty] = recommender.similar_for_rows(
+                    rows[known][empty], body.top_k, "bert"
+                )
+
+        pos = np.cumsum(known) - 1
+        for i, item_id in enumerate(item_ids):
+            if not known[i]:
+                items[str(item_id)] = {"data": [], "error": f"Destinasi dengan id {item_id} tidak ditemukan."}
+                continue
+            j = pos[i]
+            items[str(item_id)] = {"data": records(nb_ids[j][valid[j]], nb_scores[j][valid[j]])}
+
+    # --- Query: satu encode_many + satu matmat ---
+    texts = list(dict.fromkeys(body.queries))
+    active = []
+    for text in texts:
+        if text.strip():
+            active.append(text)
+        else:
+            queries[text] = {"data": [], "error": "Query kosong."}
+    if active:
+        if mask is not None and not mask.any():
+            for text in active:
+                queries[text] = {"data": []}
+            return {"items": items, "queries": queries}
+
+        keys = {text: cache.normalize(text) if cache else "" for text in active}
+        if cache:
+            cache.sync(recommender)
+        vectors = {text: cache.vectors.get(keys[text]) if keys[text] else None for text in active}
+        # Satu teks asli per kunci cache yang belum ada (encoder menerima teks asli, bukan kuncinya)
+        missing = {}
+        for text in active:
+            if vectors[text] is None:
+                missing.setdefault(keys[text] or text, text)
+        if missing:
+            encoded = dict(zip(missing, await encoder.encode_many(list(missing.values()))))
+            for text in active:
+                if vectors[text] is None:
+                    vectors[text] = encoded[keys[text] or text]
+                    if cache and keys[text]:
+                        cache.vectors.set(keys[text], vectors[text])
+
+        idx, scores = recommender.search_batch(np.stack([vectors[t] for t in active]), body.top_k, mask)
+        for text, row_idx, row_scores in zip(active, idx, scores):
+            queries[text] = {"data": records(row_idx, row_scores)}
+    return {"items": items, "queries": queries}
 
 # ======================================================
 # API ENDPOINTS (Di-upgrade dengan Review Profesional)
 # ======================================================
 
+# --- Parameter bersama: proyeksi kolom & pagination ---
+FieldsParam = Annotated[Optional[str], Query(
+    description="Kolom yang dikembalikan, dipisah koma (mis. `id,nama_wisata,gambar`). Kosong = semua kolom standar."
+)]
+CursorParam = Annotated[Optional[str], Query(description="Cursor halaman berikutnya dari response sebelumnya.")]
+
+def resolve_facet_mask(recommender: object, facets: dict):
+    """Mask baris dari filter facet; nilai facet tak dikenal -> HTTP 400."""
+    try:
+        return recommender.facet_mask(facets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+SEARCH_SCORE_COL = "skor_kemiripan"
+
 # 🔥 3. Tambahkan response_model, summary, dll. (Review Poin 4 & 6)
 @router.get(
     "/destinations/all", 
-    response_model=List[dict], # Tentukan tipe data balikan
+    response_model=List[DestinationOut], # Tentukan tipe data balikan
+    response_model_exclude_unset=True,
     summary="Dapatkan Semua Destinasi",
-    description="Mengambil *seluruh* daftar destinasi wisata yang ada di database."
+    description="Mengambil daftar destinasi wisata (hanya kolom standar, tanpa teks fitur). "
+                "Tanpa `limit` seluruh katalog dikembalikan; dengan `limit` hasil dipaginasi dan "
+                "cursor halaman berikutnya ada di header `X-Next-Cursor` (total di `X-Total-Count`)."
 )
-async def get_all_destinations(request: Request):
+async def get_all_destinations(
+    request: Request,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: CursorParam = None,
+    fields: FieldsParam = None,
+):
+    """
+    Payload diserialisasi & dikompresi sekali per versi artefak, lalu
+    disajikan dengan ETag kuat + Cache-Control (klien bisa dapat 304).
+    """
     recommender = request.app.state.model_cache.get("recommender")
-    if not recommender:
+    response_cache = request.app.state.model_cache.get("response_cache")
+    if not recommender or not response_cache:
         raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
     
-    # .to_dict('records') sudah mengembalikan List[dict]
-    all_data = recommender.df.to_dict('records') 
-    return all_data
+    columns = parse_fields(fields, recommender.RECOMMENDATION_COLS)
+    total = len(recommender.df)
+    offset = decode_cursor(cursor, recommender.artifact_version)
+    end = total if limit is None else min(total, offset + limit)
+
+    headers = {"X-Total-Count": str(total)}
+    if end < total:
+        headers["X-Next-Cursor"] = encode_cursor(end, recommender.artifact_version)
+    return response_cache.respond(
+        request, recommender, ("catalog", tuple(columns), offset, end),
+        build=lambda: to_records(recommender.df.iloc[offset:end], columns),
+        headers=headers,
+    )
 
 # 🔥 4. Tambahkan summary & defensive check (Review Poin 5 & 6)
 @router.post(
     "/recommendations", 
+    response_model=RecommendationResponse,
+    response_model_exclude_unset=True,
     summary="Dapatkan Rekomendasi (Search / Personalized)",
-    description="Endpoint utama. Memberikan rekomendasi personal (jika `history_ids` diisi) atau hasil pencarian (jika `query` diisi)."
+    description="Endpoint utama. Memberikan rekomendasi personal (jika `history_ids` diisi) atau hasil pencarian (jika `query` diisi). "
+                "`search_mode` memilih pencarian semantik (S-BERT), kata kunci (BM25), atau hybrid keduanya. "
+                "Hasil pencarian dipaginasi dengan `limit` & `cursor` (lihat `next_cursor` di response)."
 )
-async def get_recommendations(request: Request, body: RecommendationRequest):
+async def get_recommendations(
+    request: Request,
+    body: RecommendationRequest,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: CursorParam = None,
+    fields: FieldsParam = None,
+):
     recommender = request.app.state.model_cache.get("recommender")
-    bert_model = request.app.state.model_cache.get("bert_model")
+    encoder = request.app.state.model_cache.get("encoder")
 
-    if not recommender or not bert_model:
+    if not recommender or not encoder:
         raise HTTPException(status_code=503, detail="Server sedang inisialisasi, model belum siap.")
 
     # 🔥 5. Defensive Check .strip() (Review Poin 5)
     # Hanya jalankan search jika query ada isinya (bukan spasi doang)
     if body.query and body.query.strip():
         logger.info(f"Mencari query: '{body.query}'")
-        df_results = get_semantic_search_logic(body.query.strip(), recommender, bert_model)
+        columns = parse_fields(fields, recommender.RECOMMENDATION_COLS + [SEARCH_SCORE_COL])
+        # Semua halaman memotong ranking yang sama (window tetap, di-cache),
+        # agar hasil IVF tidak bergeser antar halaman. Untuk IVF window-nya
+        # sebesar isi list yang dipindai, bukan MAX_SEARCH_RESULTS.
+        window = recommender.search_window(MAX_SEARCH_RESULTS, mode=body.search_mode)
+        offset = decode_cursor(cursor, recommender.artifact_version)
+
+        query_cache = request.app.state.model_cache.get("query_cache")
+        try:
+            df_results, total = await get_semantic_search_logic(
+                body.query.strip(), recommender, encoder, top_k=window, cache=query_cache,
+                offset=offset, limit=limit, mode=body.search_mode, fusion=body.fusion,
+                facets=body.facet_filters(),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:
+            # Mis. mode semantic/hybrid saat embeddings BERT tidak dimuat
+            raise HTTPException(status_code=503, detail=str(e))
+        end = min(total, offset + limit)
         return {
             "title": f"Hasil Pencarian untuk '{body.query}'",
-            "data": df_results.to_dict('records')
+            "data": to_records(df_results, columns),
+            "next_cursor": encode_cursor(end, recommender.artifact_version) if end < total else None,
+            "total": total,
         }
     
     logger.info(f"Membuat feed personalisasi untuk riwayat ID: {body.history_ids}")
-    history_names = []
-    if body.history_ids:
-        try:
-            history_names = recommender.df[recommender.df['id'].isin(body.history_ids)]['nama_wisata'].tolist()
-        except Exception as e:
-            logger.warning(f"Gagal konversi history_ids ke nama: {e}")
+    columns = parse_fields(fields, recommender.RECOMMENDATION_COLS)
+    history_rows = recommender.rows_for_ids(body.history_ids)
+    mask = resolve_facet_mask(recommender, body.facet_filters())
             
     # 🔥 6. Kirim 'request' ke helper (Review Poin 3)
-    df_results, title = get_personalized_feed_logic(history_names, recommender, request)
+    df_results, title = get_personalized_feed_logic(history_rows, recommender, request, mask=mask)
     return {
         "title": title,
-        "data": df_results.to_dict('records')
+        "data": to_records(df_results, columns)
     }
 
+# ======================================================
+# 👤 FEED PERSONAL (SERVER-SIDE, PERLU LOGIN)
+# ======================================================
+@router.get(
+    "/feed/me",
+    response_model=RecommendationResponse,
+    response_model_exclude_unset=True,
+    summary="Feed Personal dari Riwayat Klik (Perlu Login)",
+    description="Menyusun feed personal dari profil riwayat klik user yang tersimpan di server "
+                "dalam satu request (tanpa perlu memanggil `/history/my-ids` terlebih dahulu)."
+)
+async def get_my_feed(
+    request: Request,
+    current_user: Annotated[models.User, Depends(security.get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    top_n: Annotated[int, Query(ge=1, le=50)] = 9,
+    fields: FieldsParam = None,
+    kategori: Annotated[List[str], Query(description="Filter kategori (boleh diulang).")] = [],
+):
+    """
+    - **top_n**: Jumlah destinasi di feed (default 9).
+    - **fields**: Kolom yang dikembalikan (opsional).
+    - **kategori**: Filter kategori, diterapkan sebelum ranking (opsional).
+
+    Memakai profil user yang di-update inkremental setiap klik
+    (vektor jumlah embeddings + counter kategori), jadi scoring cukup
+    satu dot product ke embeddings katalog.
+    """
+    recommender = request.app.state.model_cache.get("recommender")
+    profile_store = request.app.state.model_cache.get("profile_store")
+    if not recommender or not profile_store:
+        raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
+
+    columns = parse_fields(fields, recommender.RECOMMENDATION_COLS)
+    mask = resolve_facet_mask(recommender, {"kategori": kategori})
+    profile = await profile_store.get(db, current_user.id, recommender)
+    if profile is None:
+        df_results, title = get_personalized_feed_logic([], recommender, request, top_n, mask)
+    else:
+        logger.info(f"Membuat feed personal untuk user '{current_user.username}' ({profile.click_count} klik).")
+        df_results, title = get_profile_feed_logic(profile, recommender, request, top_n, mask)
+    return {
+        "title": title,
+        "data": to_records(df_results, columns)
+    }
+
+# ======================================================
+# 📈 TRENDING (Cold Start & Eksplorasi)
+# ======================================================
+TRENDING_SCORE_COL = "skor_tren"
+
+@router.get(
+    "/trending",
+    response_model=TrendingResponse,
+    response_model_exclude_unset=True,
+    summary="Destinasi & Kategori Trending",
+    description="Destinasi yang paling banyak diklik akhir-akhir ini (jumlah klik dengan time-decay eksponensial), "
+                "plus kategori trending. Ranking disusun ulang di background beberapa detik sekali. "
+                "Tanpa klik (`fallback`), urutan memakai prior popularitas statis katalog."
+)
+async def get_trending(
+    request: Request,
+    top_k: Annotated[int, Query(ge=1, le=50)] = 10,
+    fields: FieldsParam = None,
+    kategori: Annotated[List[str], Query(description="Filter kategori (boleh diulang).")] = [],
+):
+    recommender = request.app.state.model_cache.get("recommender")
+    trending = request.app.state.model_cache.get("trending")
+    if not recommender or not trending:
+        raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
+
+    columns = parse_fields(fields, recommender.RECOMMENDATION_COLS + [TRENDING_SCORE_COL])
+    mask = resolve_facet_mask(recommender, {"kategori": kategori})
+    rows, scores = trending.top(recommender, top_k, mask)
+    df_results = recommender.df.iloc[rows].copy()
+    df_results[TRENDING_SCORE_COL] = np.round(scores, 3)
+    return {
+        "title": "📈 Sedang Tren di Jember",
+        "data": to_records(df_results, columns),
+        "categories": [
+            {"kategori": cat, TRENDING_SCORE_COL: round(score, 3)}
+            for cat, score in trending.top_categories(5)
+        ],
+        "fallback": not bool((scores > 0).any()),
+    }
+
+SimilarModeParam = Annotated[Literal["bert", "tfidf", "hybrid", "collab"], Query(
+    description="Sumber kemiripan: konten (`bert`, `tfidf`, `hybrid`) atau `collab` (co-occurrence klik)."
+)]
+
+def similar_response(request: Request, top_k: int, mode: str, nama_wisata: str = None, item_id: int = None):
+    """
+    Response /similar untuk satu item referensi (nama ATAU id; lookup O(1)).
+    Nama yang tidak persis sama di-resolve lewat indeks nama (salah ketik,
+    ejaan lama, nama tidak lengkap); nama hasil resolve dikirim di header
+    `X-Resolved-Name`. Item tidak dikenal / ambigu -> 404 (+ saran nama).
+    """
+    recommender = request.app.state.model_cache.get("recommender")
+    response_cache = request.app.state.model_cache.get("response_cache")
+    if not recommender or not response_cache:
+        raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
+
+    try:
+        row, match = (recommender.row_for_id(item_id), "exact") if item_id is not None \
+            else recommender.resolve_name(nama_wisata)
+    except ValueError as e:
+        logger.warning(f"Wisata referensi tidak ditemukan: {nama_wisata if item_id is None else item_id}. Error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    nama_ref = recommender.df['nama_wisata'].iat[row]
+
+    collab = request.app.state.model_cache.get("collab")
+    if mode == "collab" and collab:
+        # Recommender hasil reload artefak belum tentu sudah dipasangi tabel collab
+        collab.publish(recommender)
+
+    def build():
+        ref = {"item_id": int(recommender.row_to_id[row])}
+        df_similar = pd.DataFrame()
+        if mode == "collab" and recommender.similarity_matrices.get("collab") is not None:
+            df_similar = recommender.get_recommendations(top_n=top_k, mode="collab", **ref)
+        if df_similar.empty:
+            df_similar = recommender.get_recommendations(top_n=top_k, mode="bert" if mode == "collab" else mode, **ref)
+        return {
+            "title": f"Mirip dengan {nama_ref}",
+            "data": to_records(df_similar, list(df_similar.columns))
+        }
+
+    try:
+        if mode == "collab":
+            # Tabel collab berubah setiap batch klik -> tidak di-cache per versi artefak
+            response = JSONResponse(jsonable_encoder(build()))
+        else:
+            # Tetangga konten hanya berubah saat artefak di-reload -> cache per versi (kunci = baris)
+            response = response_cache.respond(request, recommender, ("similar", row, top_k, mode), build)
+    except Exception as e:
+        logger.error(f"Gagal mencari similar: {e}")
+        raise HTTPException(status_code=500, detail=f"Gagal memproses: {e}")
+    if match != "exact":
+        # Di-set per request (bukan di entri cache: entri dipakai bersama semua ejaan nama)
+        response.headers["X-Resolved-Name"] = quote(nama_ref)
+    return response
+
 # 🔥 7. Tambahkan summary & deskripsi (Review Poin 6)
+@router.get(
+    "/similar/by-id/{item_id}",
+    response_model=dict,
+    summary="Dapatkan Destinasi Serupa (berdasarkan ID)",
+    description=(
+        "Sama seperti `/similar/{nama_wisata}`, tetapi item referensi dipilih lewat *id* "
+        "(lookup O(1), tidak bergantung pada penulisan nama yang persis sama)."
+    )
+)
+async def get_similar_destinations_by_id(
+    request: Request,
+    item_id: int,
+    top_k: Annotated[int, Query(ge=1, le=50)] = 3,
+    mode: SimilarModeParam = "bert",
+):
+    return similar_response(request, top_k, mode, item_id=item_id)
+
 @router.get(
     "/similar/{nama_wisata}", 
     response_model=dict, # Balikannya {title: ..., data: [...]}
     summary="Dapatkan Destinasi Serupa",
-    description="Mengembalikan 3 (atau `top_k`) destinasi yang paling mirip berdasarkan *nama wisata* yang dipilih."
+    description=(
+        "Mengembalikan 3 (atau `top_k`) destinasi yang paling mirip berdasarkan *nama wisata* yang dipilih. "
+        "Nama toleran huruf besar/kecil, ejaan lama, salah ketik, dan nama tidak lengkap selama hasilnya "
+        "tunggal (nama yang dipakai dikirim di header `X-Resolved-Name`). "
+        "`mode` memilih sumber kemiripan: konten (`bert`, `tfidf`, `hybrid`) atau `collab` "
+        "(user yang mengklik destinasi ini juga mengklik...; fallback ke `bert` jika belum ada data klik)."
+    )
 )
-async def get_similar_destinations(request: Request, nama_wisata: str, top_k: int = 3):
+async def get_similar_destinations(
+    request: Request,
+    nama_wisata: str,
+    top_k: Annotated[int, Query(ge=1, le=50)] = 3,
+    mode: SimilarModeParam = "bert",
+):
+    return similar_response(request, top_k, mode, nama_wisata=nama_wisata)
+
+# ======================================================
+# 🔤 AUTOCOMPLETE (Nama Destinasi)
+# ======================================================
+@router.get(
+    "/autocomplete",
+    response_model=AutocompleteResponse,
+    summary="Autocomplete Nama Destinasi",
+    description="Saran nama destinasi per ketikan dari trie prefix + indeks trigram (tanpa encoder). "
+                "Awal kata mana pun boleh (`ulo` -> Pantai Watu Ulo); jika tidak ada prefix yang cocok, "
+                "dicari prefix dengan salah ketik (`fuzzy: true`)."
+)
+async def get_autocomplete(
+    request: Request,
+    q: Annotated[str, Query(min_length=1, max_length=100, description="Teks yang sedang diketik.")],
+    limit: Annotated[int, Query(ge=1, le=10)] = 8,
+):
     recommender = request.app.state.model_cache.get("recommender")
-    if not recommender:
+    if not recommender or recommender.name_index is None:
         raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
+
+    df = recommender.df
+    return {
+        "query": q,
+        "data": [
+            {
+                "id": int(recommender.row_to_id[row]),
+                "nama_wisata": df['nama_wisata'].iat[row],
+                "kategori": df['kategori'].iat[row],
+                "fuzzy": fuzzy,
+            }
+            for row, fuzzy in recommender.name_index.complete(q, limit)
+        ],
+    }
+
+# ======================================================
+# 📦 BATCH (Banyak Carousel / Pencarian per Halaman)
+# ======================================================
+@router.post(
+    "/batch",
+    response_model=BatchResponse,
+    response_model_exclude_unset=True,
+    summary="Batch Rekomendasi: Banyak Item & Query Sekaligus",
+    description="Satu request untuk beberapa carousel \"mirip dengan X\" (`item_ids`) dan beberapa pencarian "
+                "(`queries`). Semua query di-encode dalam satu panggilan encoder dan di-scoring dengan satu "
+                "perkalian matriks (pencarian exact). Hasil dikunci dengan input aslinya; filter facet hanya "
+                "berlaku untuk `queries`."
+)
+async def get_batch(
+    request: Request,
+    body: BatchRequest,
+    fields: FieldsParam = None,
+):
+    recommender = request.app.state.model_cache.get("recommender")
+    encoder: EncoderService = request.app.state.model_cache.get("encoder")
+    if not recommender or (body.queries and not encoder):
+        raise HTTPException(status_code=503, detail="Server sedang inisialisasi, data belum siap.")
+
+    columns = parse_fields(fields, recommender.RECOMMENDATION_COLS + [SEARCH_SCORE_COL])
+    mask = resolve_facet_mask(recommender, body.facet_filters()) if body.queries else None
     try:
-        df_similar = recommender.get_recommendations(nama_wisata, top_k)
-        return {
-            "title": f"Mirip dengan {nama_wisata}",
-            "data": df_similar.to_dict('records')
-        }
-    except ValueError as e: 
-        logger.warning(f"Nama wisata tidak ditemukan: {nama_wisata}. Error: {e}")
-        raise HTTPException(status_code=404, detail=str(e))
+        return await get_batch_logic(
+            body, recommender, encoder, mask=mask,
+            cache=request.app.state.model_cache.get("query_cache"),
+            collab=request.app.state.model_cache.get("collab"),
+            columns=columns,
+        )
     except Exception as e:
-        logger.error(f"Gagal mencari similar: {e}")
-        raise HTTPException(status_code=500, detail=f"Gagal memproses: {e}")
\ No newline at end of file
+        logger.error(f"Gagal memproses batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Gagal memproses: {e}")
+
+# ======================================================
+# 📊 MONITORING
+# ======================================================
+@router.get(
+    "/metrics",
+    summary="Metrik Runtime Recommender",
+    description="Mengembalikan metrik antrean & batching dari encoder service, histogram latensi pool bcrypt, antrean & latensi flush klik, model collab, counter trending, hit/miss cache query & response, dan status reload artefak."
+)
+async def get_metrics(request: Request):
+    encoder = request.app.state.model_cache.get("encoder")
+    query_cache = request.app.state.model_cache.get("query_cache")
+    reloader = request.app.state.model_cache.get("reloader")
+    response_cache = request.app.state.model_cache.get("response_cache")
+    click_writer = request.app.state.model_cache.get("click_writer")
+    collab = request.app.state.model_cache.get("collab")
+    trending = request.app.state.model_cache.get("trending")
+    return {
+        "encoder": encoder.stats() if encoder else None,
+        "password_hasher": security.password_hasher.stats(),
+        "user_cache": security.user_cache.stats(),
+        "click_writer": click_writer.stats() if click_writer else None,
+        "collab": collab.stats() if collab else None,
+        "trending": trending.stats() if trending else None,
+        "query_cache": query_cache.stats() if query_cache else None,
+        "response_cache": response_cache.stats() if response_cache else None,
+        "artifacts": reloader.status() if reloader else None,
+    }
@@ -0,0 +1,154 @@
+# backend/reloader.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# ♻️ HOT RELOAD ARTEFAK RECOMMENDER (Zero-Downtime)
+# ======================================================
+def validate_recommender(rec) -> None:
+    """
+    Smoke-test Recommender baru sebelum di-swap.
+    Me-raise exception jika ada yang tidak beres.
+    """
+    if rec is None or rec.df is None or rec.df.empty:
+        raise ValueError("Dataset (df) di dalam Recommender kosong.")
+    missing = [c for c in rec.RECOMMENDATION_COLS if c not in rec.df.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada di dataset: {missing}")
+
+    sample = rec.destinations[0]
+    for mode, table in rec.similarity_matrices.items():
+        # 'collab' boleh punya item tanpa tetangga (belum pernah diklik)
+        if table is None or mode not in rec.CONTENT_MODES:
+            continue
+        if len(table) != len(rec.df):
+            raise ValueError(f"Tabel '{mode}' berisi {len(table)} baris, dataset {len(rec.df)} baris.")
+        if rec.get_recommendations(sample, 1, mode=mode).empty:
+            raise ValueError(f"Mode '{mode}' tidak menghasilkan rekomendasi.")
+
+    if rec.vector_index is not None:
+        idx, _ = rec.search(rec.embeddings_normed[0], 1)
+        if len(idx) != 1:
+            raise ValueError("Indeks vektor tidak mengembalikan hasil.")
+
+
+class ArtifactReloader:
+    """
+    Membangun Recommender baru di thread terpisah, memvalidasinya, lalu
+    menukarnya ke `model_cache["recommender"]` dengan satu assignment.
+
+    Handler mengambil referensi recommender sekali di awal request,
+    sehingga request yang sedang berjalan tetap memakai snapshot lama
+    sampai selesai. Jika build/validasi gagal, instance lama dipertahankan.
+    """
+
+    def __init__(self, model_cache: dict, factory: Callable[[], object]):
+        self.model_cache = model_cache
+        self.factory = factory
+        self._lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+        # --- Status reload terakhir ---
+        self.reload_count = 0
+        self.failure_count = 0
+        self.last_status: str | None = None
+        self.last_reason: str | None = None
+        self.last_error: str | None = None
+        self.last_duration_s: float | None = None
+        self.last_reloaded_at: str | None = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self._lock.locked()
+
+    def _build_and_validate(self):
+        rec = self.factory()
+        validate_recommender(rec)
+        return rec
+
+    async def reload(self, reason: str = "manual") -> dict:
+        """Reload artefak. Reload paralel akan menunggu reload yang sedang berjalan."""
+        async with self._lock:
+            old = self.model_cache.get("recommender")
+            old_version = getattr(old, "artifact_version", None)
+            logger.info(f"♻️ Reload artefak dimulai (alasan: {reason}, versi aktif: {old_version})...")
+            start = time.perf_counter()
+            try:
+                new = await asyncio.to_thread(self._build_and_validate)
+            except Exception as e:
+                self.failure_count += 1
+                self.last_status = "failed"
+                self.last_error = str(e)
+                logger.error(f"❌ Reload artefak gagal, tetap memakai versi {old_version}: {e}", exc_info=True)
+            else:
+                # Swap atomik: satu assignment ke dict bersama
+                self.model_cache["recommender"] = new
+                self.reload_count += 1
+                self.last_status = "ok"
+                self.last_error = None
+                logger.info(f"✅ Recommender di-swap: {old_version} -> {new.artifact_version}")
+            finally:
+                self.last_reason = reason
+                self.last_duration_s = round(time.perf_counter() - start, 3)
+                self.last_reloaded_at = datetime.now(timezone.utc).isoformat()
+        return self.status()
+
+    def status(self) -> dict:
+        current = self.model_cache.get("recommender")
+        return {
+            "artifact_version": getattr(current, "artifact_version", None),
+            "in_progress": self.in_progress,
+            "watching": self._watch_task is not None and not self._watch_task.done(),
+            "reload_count": self.reload_count,
+            "failure_count": self.failure_count,
+            "last_status": self.last_status,
+            "last_reason": self.last_reason,
+            "last_error": self.last_error,
+            "last_duration_s": self.last_duration_s,
+            "last_reloaded_at": self.last_reloaded_at,
+        }
+
+    # --------------------------------------------------
+    # 👀 MODE FILE-WATCH
+    # --------------------------------------------------
+    def start_watching(self, paths: Iterable[Path], debounce_ms: int = 2000) -> None:
+        """Memantau perubahan file artefak dan memicu reload otomatis."""
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.warning("⚠️ Library 'watchfiles' belum terinstal. Mode file-watch tidak aktif.")
+            return
+
+        watch_paths = [str(p) for p in paths if p.exists()]
+        if not watch_paths:
+            logger.warning("⚠️ Tidak ada path artefak yang bisa dipantau.")
+            return
+
+        self._stop_event = asyncio.Event()
+
+        async def _watch():
+            async for changes in awatch(*watch_paths, debounce=debounce_ms, stop_event=self._stop_event):
+                changed = sorted({Path(p).name for _, p in changes})
+                await self.reload(reason=f"file berubah: {', '.join(changed)}")
+
+        self._watch_task = asyncio.create_task(_watch(), name="artifact-watch")
+        logger.info(f"👀 Memantau perubahan artefak di: {watch_paths}")
+
+    async def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
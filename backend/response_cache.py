@@ -0,0 +1,157 @@
+# backend/response_cache.py
+
+import gzip
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Body lebih kecil dari ini tidak dikompresi (overhead header > penghematan)
+MIN_COMPRESS_SIZE = 512
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialisasi JSON cepat (orjson, mendukung tipe numpy) dengan fallback ke json."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+# ======================================================
+# 📦 RESPONSE YANG SUDAH DISERIALISASI & DIKOMPRESI
+# ======================================================
+class PrecomputedResponse:
+    """
+    Satu response JSON yang diserialisasi sekali, disimpan dalam bentuk
+    identity/gzip/brotli, lengkap dengan ETag kuat (hash isi).
+    """
+
+    def __init__(self, payload: Any, headers: Optional[Dict[str, str]] = None):
+        self.body = dumps(payload)
+        self.etag_base = hashlib.sha256(self.body).hexdigest()[:32]
+        self.headers = headers or {}
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= MIN_COMPRESS_SIZE:
+            self.encoded["gzip"] = gzip.compress(self.body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(self.body, quality=11)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(b) for b in self.encoded.values())
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        # ETag kuat berbeda per representasi (content-encoding)
+        return f'"{self.etag_base}-{encoding}"' if encoding else f'"{self.etag_base}"'
+
+    def _matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            # If-None-Match memakai perbandingan lemah: abaikan prefix W/ & suffix encoding
+            tag = tag.removeprefix("W/").strip('"')
+            if tag.split("-", 1)[0] == self.etag_base:
+                return True
+        return False
+
+    def _pick_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.partition(";")
+            name = name.strip().lower()
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) == 0:
+                        continue  # q=0 berarti encoding ditolak klien
+                except ValueError:
+                    continue
+            if name:
+                accepted.add(name)
+        for encoding in ("br", "gzip"):
+            if encoding in self.encoded and encoding in accepted:
+                return encoding
+        return None
+
+    def to_response(self, request: Request, cache_control: str) -> Response:
+        encoding = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            **self.headers,
+            "ETag": self.etag(encoding),
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self._matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded[encoding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+# ======================================================
+# 🗃️ CACHE RESPONSE PER VERSI ARTEFAK
+# ======================================================
+class ResponseCache:
+    """
+    Cache response publik yang hanya berubah saat artefak di-reload
+    (katalog destinasi & `/similar`). Dikosongkan otomatis saat
+    `artifact_version` Recommender berubah.
+    """
+
+    def __init__(self, maxsize: int = 2048, max_age: int = 300):
+        self._cache = TTLCache(maxsize, ttl=0)
+        self.cache_control = f"public, max-age={max_age}"
+        self.artifact_version: Optional[str] = None
+        self.builds = 0
+
+    def sync(self, recommender: object) -> None:
+        version = getattr(recommender, "artifact_version", None)
+        if version != self.artifact_version:
+            if self.artifact_version is not None:
+                logger.info(f"♻️ Artefak berubah ({self.artifact_version} -> {version}), cache response dikosongkan.")
+            self._cache.clear()
+            self.artifact_version = version
+
+    def respond(self, request: Request, recommender: object, key: Hashable,
+                build: Callable[[], Any], headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Menyajikan response untuk `key`. `build()` (payload JSON) hanya
+        dipanggil sekali per versi artefak; exception dari `build()`
+        (mis. HTTPException 404) diteruskan dan tidak di-cache.
+        """
+        self.sync(recommender)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = PrecomputedResponse(build(), headers)
+            self._cache.set(key, cached)
+            self.builds += 1
+        return cached.to_response(request, self.cache_control)
+
+    def stats(self) -> dict:
+        return {
+            "artifact_version": self.artifact_version,
+            "builds": self.builds,
+            "bytes": sum(entry.nbytes for entry in self._cache.values()),
+            "brotli": brotli is not None,
+            **self._cache.stats(),
+        }
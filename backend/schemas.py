@@ -1,6 +1,6 @@
 # backend/schemas.py
 from pydantic import BaseModel, Field
-from typing import List, Optional, Union
+from typing import Dict, List, Literal, Optional, Union
 
 # ======================================================
 # 🧠 Base untuk ORM Compatibility
@@ -24,6 +24,94 @@ class RecommendationRequest(BaseModel):
     """
     history_ids: List[Union[int, str]] = Field(default_factory=list, description="List ID item yang pernah diklik user.")
     query: Optional[str] = Field(None, description="Query pencarian teks bebas dari user.")
+    search_mode: Literal["semantic", "lexical", "hybrid"] = Field(
+        "semantic",
+        description="Mode pencarian: 'semantic' (S-BERT), 'lexical' (kata kunci BM25), "
+                    "atau 'hybrid' (BM25 + S-BERT difusikan).",
+    )
+    fusion: Literal["rrf", "blend"] = Field(
+        "rrf", description="Metode fusi untuk mode 'hybrid': Reciprocal Rank Fusion atau weighted blend."
+    )
+    kategori: List[str] = Field(default_factory=list, description="Filter kategori (OR). Kosong = semua kategori.")
+    kota: List[str] = Field(default_factory=list, description="Filter kota (OR). Kosong = semua kota.")
+
+    def facet_filters(self) -> dict:
+        """Filter facet aktif, dalam format `Recommender.facet_mask`."""
+        return {"kategori": self.kategori, "kota": self.kota}
+
+class DestinationOut(BaseModel):
+    """
+    Satu destinasi di response API (kolom `Recommender.RECOMMENDATION_COLS`).
+    Semua field opsional karena klien bisa memilih kolom lewat `fields=`.
+    """
+    id: Optional[int] = None
+    nama_wisata: Optional[str] = None
+    kategori: Optional[str] = None
+    alamat: Optional[str] = None
+    deskripsi: Optional[str] = None
+    gambar: Optional[str] = None
+    skor_kemiripan: Optional[float] = Field(None, description="Hanya ada di hasil pencarian.")
+    skor_tren: Optional[float] = Field(None, description="Hanya ada di /trending (jumlah klik ter-decay).")
+
+class RecommendationResponse(BaseModel):
+    """
+    Response endpoint rekomendasi / feed.
+    `next_cursor` & `total` hanya diisi untuk hasil pencarian (paginated).
+    """
+    title: str
+    data: List[DestinationOut]
+    next_cursor: Optional[str] = Field(None, description="Cursor halaman berikutnya (null = halaman terakhir).")
+    total: Optional[int] = Field(None, description="Total hasil yang bisa dipaginasi.")
+
+class BatchRequest(BaseModel):
+    """
+    Input body untuk endpoint /batch: banyak item referensi ("mirip dengan X")
+    dan banyak query pencarian dalam satu request.
+    """
+    item_ids: List[int] = Field(default_factory=list, max_length=50, description="ID destinasi referensi untuk 'mirip dengan'.")
+    queries: List[str] = Field(default_factory=list, max_length=20, description="Query pencarian semantik (S-BERT).")
+    top_k: int = Field(5, ge=1, le=50, description="Jumlah hasil per item / query.")
+    mode: Literal["bert", "tfidf", "hybrid", "collab"] = Field(
+        "bert", description="Sumber kemiripan untuk `item_ids` (lihat /similar)."
+    )
+    kategori: List[str] = Field(default_factory=list, description="Filter kategori untuk hasil `queries` (OR).")
+    kota: List[str] = Field(default_factory=list, description="Filter kota untuk hasil `queries` (OR).")
+
+    def facet_filters(self) -> dict:
+        """Filter facet aktif, dalam format `Recommender.facet_mask`."""
+        return {"kategori": self.kategori, "kota": self.kota}
+
+class BatchResult(BaseModel):
+    """Hasil untuk satu input batch; `error` diisi jika input itu gagal (mis. id tidak dikenal)."""
+    data: List[DestinationOut] = Field(default_factory=list)
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    """Response /batch: hasil dikunci dengan input aslinya (id item / teks query)."""
+    items: Dict[str, BatchResult] = Field(default_factory=dict)
+    queries: Dict[str, BatchResult] = Field(default_factory=dict)
+
+class TrendingCategory(BaseModel):
+    """Satu kategori trending beserta skornya (jumlah klik ter-decay)."""
+    kategori: str
+    skor_tren: float
+
+class TrendingResponse(RecommendationResponse):
+    """Response `/trending`: destinasi trending + kategori trending."""
+    categories: List[TrendingCategory] = Field(default_factory=list)
+    fallback: bool = Field(False, description="True jika belum ada klik untuk hasil ini: urutan dari prior popularitas statis.")
+
+class AutocompleteItem(BaseModel):
+    """Satu saran autocomplete (`fuzzy` = cocok dengan toleransi salah ketik)."""
+    id: int
+    nama_wisata: str
+    kategori: Optional[str] = None
+    fuzzy: bool = False
+
+class AutocompleteResponse(BaseModel):
+    """Response `/autocomplete`."""
+    query: str
+    data: List[AutocompleteItem]
 
 # ======================================================
 # 👤 Skema untuk Fase 2 (Login & Register)
@@ -62,6 +150,7 @@ class TokenData(BaseModel):
     Skema data yang disimpan di dalam JWT token.
     """
     username: Optional[str] = None
+    user_id: Optional[int] = None
 
 class UserResponse(ORMBase):
     """
@@ -82,8 +171,9 @@ class ClickData(BaseModel):
 class ClickResponse(ORMBase):
     """
     Skema response setelah klik berhasil disimpan.
+    (`id` null jika klik baru diterima dan belum ditulis — mode 'buffered'.)
     """
-    id: int
+    id: Optional[int] = None
     item_id: int
     user_id: int
 
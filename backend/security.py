@@ -10,15 +10,18 @@ from pathlib import Path
 
 from passlib.context import CryptContext
 from jose import JWTError, jwt, ExpiredSignatureError # <-- 2. Import 'ExpiredSignatureError'
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 # Import file-file yang akan kita buat/gunakan
 import crud 
 import models 
 import schemas 
 from database import get_db 
+from password_hasher import PasswordHasher
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +41,15 @@ if not SECRET_KEY or len(SECRET_KEY) < 32:
 
 # --- 2. Konfigurasi Password Hashing (passlib) ---
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost factor bcrypt per environment (production 12; load test bisa 4 agar murah).
+# Hash lama tetap bisa diverifikasi karena cost-nya tersimpan di dalam hash.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Pool hashing: jumlah thread bcrypt & panjang antrean maksimum sebelum ditolak (503).
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+password_hasher = PasswordHasher(max_workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Memverifikasi password polos dengan password yang sudah di-hash."""
@@ -48,6 +59,28 @@ def get_password_hash(password: str) -> str:
     """Meng-hash password polos."""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` di pool bcrypt (tidak memblokir event loop)."""
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash` di pool bcrypt (tidak memblokir event loop)."""
+    return await password_hasher.run("hash", get_password_hash, password)
+
+# --- 2b. Cache User (id -> snapshot kolom User) ---
+
+# Cache singkat kolom User (dict, bukan objek ORM yang terikat session) agar
+# request ber-token tidak selalu query DB.
+# TTL membatasi umur data basi; perubahan password meng-invalidasi eksplisit.
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+def invalidate_user(user_id: int) -> None:
+    """Membuang user dari cache (dipanggil saat data user berubah, mis. ganti password)."""
+    user_cache.pop(user_id)
+
 # --- 3. Logika Pembuatan JWT (Tiket Login) ---
 
 # 🔥 4. PERBAIKAN: Helper UTC (Review Poin 3)
@@ -79,15 +112,26 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # 🔥 6. PERBAIKAN: Gunakan 'Annotated' (Review Poin 7)
 async def get_current_user(
+    request: Request,
     token: Annotated[str, Depends(oauth2_scheme)], 
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[AsyncSession, Depends(get_db)]
 ) -> models.User:
     """
     Dependency FastAPI untuk memproteksi endpoint.
     Membaca token, memvalidasinya, dan mengembalikan data user dari DB.
     
+    - Principal di-memo di `request.state.current_user`: decode JWT &
+      lookup user hanya sekali per request, walau dependency dipakai
+      di beberapa tempat (router + endpoint).
+    - Token membawa `uid` (id user): lookup via `user_cache` / primary key,
+      bukan query ILIKE per username. Token lama tanpa `uid` tetap diterima.
+    
     Jika token tidak valid, akan otomatis me-raise HTTPException 401.
     """
+    memo = getattr(request.state, "current_user", None)
+    if memo is not None:
+        return memo
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -103,7 +147,7 @@ async def get_current_user(
             logger.warning("Token JWT tidak valid: 'sub' (username) tidak ditemukan.")
             raise credentials_exception
             
-        token_data = schemas.TokenData(username=username)
+        token_data = schemas.TokenData(username=username, user_id=payload.get("uid"))
     
     except ExpiredSignatureError:
         # Tangkap error jika token sudah kadaluarsa
@@ -113,16 +157,31 @@ async def get_current_user(
             detail="Token sudah kadaluarsa",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except JWTError as e:
-        # Tangkap semua error JWT lainnya
+    except (JWTError, ValueError) as e:
+        # Tangkap semua error JWT lainnya (termasuk 'uid' yang bukan integer)
         logger.warning(f"Error decoding JWT: {e}")
         raise credentials_exception
     
-    # (Review Poin 6: Logic CRUD ini sudah benar)
-    user = crud.get_user_by_username(db, username=token_data.username)
+    if token_data.user_id is not None:
+        cached = user_cache.get(token_data.user_id)
+        if cached is not None:
+            # Cache hanya menyimpan snapshot kolom; objek ORM dibuat baru per
+            # request lalu dipasang ke session ini (tanpa query)
+            user = models.User(**cached)
+            make_transient_to_detached(user)
+            user = await db.merge(user, load=False)
+        else:
+            user = await crud.get_user(db, token_data.user_id)
+        # Jaga-jaga id dipakai ulang oleh user lain (mis. user dihapus lalu dibuat baru)
+        if user is not None and user.username != token_data.username:
+            user = None
+    else:
+        user = await crud.get_user_by_username(db, username=token_data.username)
     
     if user is None:
         logger.warning(f"Token valid, tapi user '{token_data.username}' tidak ditemukan di DB.")
         raise credentials_exception
-        
-    return user
\ No newline at end of file
+
+    user_cache.set(user.id, {"id": user.id, "username": user.username, "hashed_password": user.hashed_password})
+    request.state.current_user = user
+    return user
@@ -0,0 +1,160 @@
+# backend/trending_service.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+from src.trending import TrendingCounter, TrendingRanking
+
+logger = logging.getLogger(__name__)
+
+# Seed hanya membaca klik sampai N waktu paruh ke belakang (bobot < 1/1024)
+SEED_HALF_LIVES = 10
+
+
+def _bucket_epoch(bucket) -> float:
+    """Awal jam dari DB (string SQLite / datetime Postgres) -> epoch detik tengah jam (maks. sekarang)."""
+    if isinstance(bucket, str):
+        bucket = datetime.fromisoformat(bucket)
+    if bucket.tzinfo is None:
+        bucket = bucket.replace(tzinfo=timezone.utc)
+    return min(bucket.timestamp() + 1800.0, time.time())
+
+
+# ======================================================
+# 📈 TRENDING (Popularitas dengan Time-Decay)
+# ======================================================
+class TrendingService:
+    """
+    Memiliki `TrendingCounter` (src/trending.py) untuk seluruh server.
+
+    - Startup: seed dari agregat `click_history` per (item, jam).
+    - Setiap batch klik yang di-commit ClickWriter -> `record` (O(batch)).
+    - Task background menghitung ulang ranking setiap `refresh_s` detik,
+      hanya jika ada klik baru; request cold start / `/trending` cukup
+      mengambil k baris teratas dari snapshot (O(k)).
+
+    Args:
+        get_recommender: Callable yang mengembalikan Recommender aktif
+            (berubah saat artefak di-reload).
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], get_recommender: Callable[[], object],
+                 half_life_hours: float = 24.0, refresh_s: float = 5.0):
+        self.session_factory = session_factory
+        self.get_recommender = get_recommender
+        self.half_life_hours = half_life_hours
+        self.refresh_s = refresh_s
+        self.counter = TrendingCounter(half_life_s=half_life_hours * 3600.0)
+        self._ranking: Optional[TrendingRanking] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+
+    async def start(self) -> None:
+        """Seed counter dari DB, susun ranking pertama, lalu jalankan task refresh."""
+        await self.seed()
+        self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def seed(self) -> None:
+        since = None
+        if self.half_life_hours > 0:
+            since = datetime.now(timezone.utc) - timedelta(hours=self.half_life_hours * SEED_HALF_LIVES)
+        async with self.session_factory() as db:
+            buckets = await crud.get_click_counts_by_hour(db, since)
+        if not buckets:
+            return
+        buckets = self._known(buckets, [b[0] for b in buckets])
+        if not buckets:
+            return
+        items, hours, counts = zip(*buckets)
+        self.counter.add(items, self._categories(items), [_bucket_epoch(h) for h in hours], counts)
+        logger.info(f"📈 Counter trending di-seed dari {sum(counts)} klik ({len(buckets)} agregat item-jam).")
+
+    def _known(self, entries: List, item_ids: List[int]) -> List:
+        """
+        Hanya entri yang id item-nya ada di katalog aktif. Counter diindeks
+        per id (array padat), jadi id asing tidak boleh sampai ke `counter.add`.
+        """
+        recommender = self.get_recommender()
+        if recommender is None or not entries:
+            return []
+        rows = recommender.lookup_rows(item_ids)
+        return [entry for entry, row in zip(entries, rows.tolist()) if row >= 0]
+
+    def _categories(self, item_ids) -> List[str]:
+        """Kategori per item id (id harus sudah disaring `_known`)."""
+        recommender = self.get_recommender()
+        rows = recommender.lookup_rows(item_ids)
+        return [str(recommender.categories[recommender.category_codes[r]]) for r in rows.tolist()]
+
+    def record(self, events: List) -> None:
+        """Hook setelah batch klik di-commit (ranking disusun ulang oleh task refresh)."""
+        events = self._known(events, [e.item_id for e in events])
+        if not events:
+            return
+        items = [e.item_id for e in events]
+        self.counter.add(items, self._categories(items), [e.timestamp.timestamp() for e in events])
+
+    # --------------------------------------------------
+    # Ranking
+    # --------------------------------------------------
+    def refresh(self) -> Optional[TrendingRanking]:
+        """Menyusun ulang snapshot ranking jika ada klik baru atau katalog berubah."""
+        recommender = self.get_recommender()
+        if recommender is None:
+            return None
+        ranking = self._ranking
+        if ranking is None or ranking.version != self.counter.version \
+                or ranking.id_to_row is not recommender.id_to_row:
+            ranking = self.counter.ranking(recommender.id_to_row, recommender.popularity_prior)
+            self._ranking = ranking
+            self.refreshes += 1
+            self.last_refresh = time.time()
+        return ranking
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_s)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Gagal menyusun ranking trending: {e}", exc_info=True)
+
+    def top(self, recommender, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k baris trending `recommender` (+ skornya). Snapshot katalog lama
+        (artefak baru di-reload) disusun ulang di tempat, sekali.
+        """
+        ranking = self._ranking
+        if ranking is None or ranking.id_to_row is not recommender.id_to_row:
+            ranking = self.counter.ranking(recommender.id_to_row, recommender.popularity_prior)
+            self._ranking = ranking
+        return ranking.top(k, mask)
+
+    def top_categories(self, k: int) -> List[Tuple[str, float]]:
+        return self.counter.top_categories(k)
+
+    def stats(self) -> dict:
+        return {
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh,
+            "refresh_s": self.refresh_s,
+            "counter": self.counter.stats(),
+        }
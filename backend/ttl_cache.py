@@ -0,0 +1,75 @@
+# backend/ttl_cache.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# ======================================================
+# 🗃️ CACHE LRU + TTL (In-Process)
+# ======================================================
+class TTLCache:
+    """
+    Cache LRU berukuran tetap dengan masa berlaku (TTL) per entri.
+    - Entri tertua (least recently used) dibuang saat penuh.
+    - Entri yang lebih tua dari `ttl` detik dianggap miss dan dibuang.
+    Tidak thread-safe: dirancang untuk dipakai dari event loop saja.
+    (Modul terpisah tanpa dependensi 'src', jadi bisa dipakai juga oleh
+    modul yang diimpor sebelum 'src' masuk sys.path, mis. security.py.)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        stored_at, value = item
+        if self.ttl and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def values(self) -> list:
+        """Semua value yang tersimpan (tanpa mengubah urutan LRU / statistik)."""
+        return [value for _, value in self._data.values()]
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,181 @@
+"""
+======================================================
+scripts/benchmark_click_history.py
+======================================================
+BENCHMARK SQLITE click_history: skema lama vs PRAGMA + index komposit
+
+Mengisi DB SQLite sementara dengan N klik (default 1 juta) memakai
+skema LAMA (index tunggal user_id, tanpa PRAGMA), mengukur latensi,
+lalu menjalankan migrasi (backend/migrations.py) pada file yang sama
+dan mengukur ulang dengan PRAGMA dari backend/database.py aktif
+(WAL, synchronous=NORMAL, mmap, cache_size).
+
+Yang diukur (p50 / p95, ms):
+- read  : riwayat terbaru (get_user_history), item unik (get_user_history_ids),
+          semua klik untuk rebuild profil (get_user_clicks)
+- write : 1 klik = 1 commit (jalur lama) dan 1 batch = 1 commit (ClickWriter)
+
+Cara menjalankan dari root folder:
+    python scripts/benchmark_click_history.py --clicks 1000000 --users 10000
+======================================================
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Tambahkan folder backend agar bisa impor modul server (database, models, migrations)
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+import database
+import models
+from migrations import run_migrations
+
+CH = models.ClickHistory
+
+
+# --- Query yang sama dengan crud.py ---
+def q_history(user_id: int, limit: int = 20):
+    return select(CH).where(CH.user_id == user_id).order_by(CH.timestamp.desc()).limit(limit)
+
+def q_history_ids(user_id: int):
+    return (
+        select(CH.item_id).where(CH.user_id == user_id)
+        .group_by(CH.item_id).order_by(func.max(CH.timestamp).desc())
+    )
+
+def q_user_clicks(user_id: int):
+    return (
+        select(CH.item_id, CH.timestamp).where(CH.user_id == user_id)
+        .order_by(CH.timestamp.asc(), CH.id.asc())
+    )
+
+
+def create_old_schema(path: Path) -> None:
+    """Skema sebelum migrasi: index tunggal user_id & id, tanpa index komposit."""
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in CH.__table__.indexes:
+            if len(index.columns) > 1:
+                index.drop(conn)
+        conn.execute(text("CREATE INDEX ix_click_history_user_id ON click_history (user_id)"))
+        conn.execute(text("CREATE INDEX ix_click_history_id ON click_history (id)"))
+    engine.dispose()
+
+
+def populate(path: Path, n_clicks: int, n_users: int, n_items: int, seed: int) -> float:
+    """Mengisi click_history dengan klik acak (1 tahun terakhir). Mengembalikan durasi (dtk)."""
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = time.perf_counter()
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO users (id, username, hashed_password) VALUES (?, ?, 'x')",
+                     ((u, f"bench{u}") for u in range(1, n_users + 1)))
+    chunk = 100_000
+    for offset in range(0, n_clicks, chunk):
+        size = min(chunk, n_clicks - offset)
+        users = rng.integers(1, n_users + 1, size)
+        items = rng.integers(1, n_items + 1, size)
+        ages = rng.integers(0, 365 * 86400, size)
+        conn.executemany(
+            "INSERT INTO click_history (user_id, item_id, timestamp) VALUES (?, ?, ?)",
+            ((int(u), int(i), (now - timedelta(seconds=int(a))).isoformat(sep=" "))
+             for u, i, a in zip(users, items, ages)),
+        )
+    conn.commit()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def percentiles(samples: list) -> str:
+    p50, p95 = np.percentile(np.asarray(samples) * 1000, [50, 95])
+    return f"p50 {p50:8.3f}  p95 {p95:8.3f}"
+
+
+def measure(engine, args, label: str) -> None:
+    rng = np.random.default_rng(args.seed + 1)
+    users = rng.integers(1, args.users + 1, args.queries).tolist()
+
+    print(f"\n[{label}]")
+    with engine.connect() as conn:
+        for name, build in (("get_user_history", q_history),
+                            ("get_user_history_ids", q_history_ids),
+                            ("get_user_clicks", q_user_clicks)):
+            conn.execute(build(users[0])).all()  # warm-up
+            samples = []
+            for user_id in users:
+                t0 = time.perf_counter()
+                conn.execute(build(user_id)).all()
+                samples.append(time.perf_counter() - t0)
+            print(f"  read  {name:<22} {percentiles(samples)} ms")
+
+    stmt = insert(CH)
+
+    def write(conn, n_rows: int) -> float:
+        rows = [{"user_id": u, "item_id": 1, "timestamp": datetime.now(timezone.utc)}
+                for u in rng.integers(1, args.users + 1, n_rows).tolist()]
+        t0 = time.perf_counter()
+        conn.execute(stmt, rows if n_rows > 1 else rows[0])
+        conn.commit()
+        return time.perf_counter() - t0
+
+    n_batches = max(1, args.writes // 10)
+    with engine.connect() as conn:
+        # Warm-up (tidak diukur): page cache & file WAL yang sudah tumbuh = kondisi server berjalan
+        for _ in range(n_batches // 2 + 1):
+            write(conn, args.batch)
+        single = [write(conn, 1) for _ in range(args.writes)]
+        batched = [write(conn, args.batch) for _ in range(n_batches)]
+    print(f"  write 1 klik / commit          {percentiles(single)} ms")
+    print(f"  write {args.batch} klik / commit        {percentiles(batched)} ms"
+          f"  (~{np.median(batched) / args.batch * 1e6:.1f} µs/klik)")
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory(dir=args.db_dir) as tmp:
+        path = Path(tmp) / "bench_clicks.db"
+        create_old_schema(path)
+        elapsed = populate(path, args.clicks, args.users, args.items, args.seed)
+        print(f"📦 {args.clicks:,} klik untuk {args.users:,} user diisi dalam {elapsed:.1f} dtk ({path})")
+
+        # --- Sebelum: tanpa PRAGMA, index tunggal user_id & id ---
+        before = create_engine(f"sqlite:///{path}")
+        measure(before, args, "SEBELUM: tanpa PRAGMA, index (user_id), (id)")
+        before.dispose()
+
+        # --- Sesudah: PRAGMA database.py + migrasi index komposit ---
+        after = create_engine(f"sqlite:///{path}")
+        database.install_sqlite_pragmas(after)
+        t0 = time.perf_counter()
+        with after.begin() as conn:
+            versions = run_migrations(conn)
+        print(f"\n🧱 Migrasi {versions} selesai dalam {time.perf_counter() - t0:.1f} dtk")
+        # Index baru masih di file WAL: checkpoint dulu agar yang diukur kondisi stabil
+        with after.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        measure(after, args, "SESUDAH: " + ", ".join(p.removeprefix("PRAGMA ") for p in database.sqlite_pragmas()))
+        after.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark latensi baca/tulis click_history di SQLite.")
+    parser.add_argument("--clicks", type=int, default=1_000_000, help="Jumlah klik yang diisi.")
+    parser.add_argument("--users", type=int, default=10_000, help="Jumlah user.")
+    parser.add_argument("--items", type=int, default=55, help="Jumlah item (destinasi).")
+    parser.add_argument("--queries", type=int, default=500, help="Jumlah query baca per jenis.")
+    parser.add_argument("--writes", type=int, default=500, help="Jumlah commit 1-klik (batch = writes/10).")
+    parser.add_argument("--batch", type=int, default=256, help="Ukuran batch tulis (seperti CLICK_BATCH_SIZE).")
+    parser.add_argument("--db-dir", default=None, help="Folder file DB sementara (default: temp sistem).")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+"""
+======================================================
+scripts/benchmark_encoder.py
+======================================================
+BENCHMARK BACKEND ENCODER QUERY: PyTorch vs ONNX int8
+
+Setiap backend dijalankan di subprocess terpisah agar pengukuran
+RSS (peak resident memory) dan waktu startup tidak saling mempengaruhi.
+
+Metrik:
+- startup_s   : waktu import library + memuat model
+- peak_rss_mb : ru_maxrss proses setelah benchmark
+- p50/p95_ms  : latensi encode satu query (batch=1)
+
+Cara menjalankan dari root folder:
+    python scripts/benchmark_encoder.py --queries 200
+======================================================
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SAMPLE_QUERIES = [
+    "pantai yang indah untuk melihat sunset",
+    "wisata alam air terjun di jember",
+    "tempat makan keluarga dengan pemandangan",
+    "kebun kopi dan edukasi pertanian",
+    "wisata religi dan sejarah",
+]
+
+_WORKER = r"""
+import json, resource, sys, time
+sys.path.append({root!r})
+import numpy as np
+
+start = time.perf_counter()
+if {backend!r} == "onnx":
+    from src.onnx_encoder import OnnxEncoder
+    from src.recommender import ModelPaths
+    model = OnnxEncoder(ModelPaths().onnx_dir, quantized=True)
+else:
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+startup = time.perf_counter() - start
+
+queries = {queries!r}
+model.encode(queries[:1], show_progress_bar=False)  # warm-up
+latencies = []
+for i in range({n}):
+    t0 = time.perf_counter()
+    model.encode([queries[i % len(queries)]], show_progress_bar=False, convert_to_numpy=True)
+    latencies.append((time.perf_counter() - t0) * 1000)
+
+print(json.dumps({{
+    "startup_s": round(startup, 2),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+    "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+}}))
+"""
+
+
+def run_backend(backend: str, n_queries: int) -> dict:
+    code = _WORKER.format(root=str(BASE_DIR), backend=backend, queries=SAMPLE_QUERIES, n=n_queries)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "unknown"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark encoder PyTorch vs ONNX int8.")
+    parser.add_argument("--queries", type=int, default=200, help="Jumlah query per backend.")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"], choices=["torch", "onnx"])
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'startup_s':>10} {'peak_rss_mb':>12} {'p50_ms':>8} {'p95_ms':>8}")
+    for backend in args.backends:
+        r = run_backend(backend, args.queries)
+        if "error" in r:
+            print(f"{backend:<8} GAGAL: {r['error']}")
+            continue
+        print(f"{backend:<8} {r['startup_s']:>10} {r['peak_rss_mb']:>12} {r['p50_ms']:>8} {r['p95_ms']:>8}")
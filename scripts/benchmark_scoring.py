@@ -0,0 +1,87 @@
+"""
+======================================================
+scripts/benchmark_scoring.py
+======================================================
+BENCHMARK KERNEL SCORING: sklearn cosine_similarity vs dot product
+
+Membandingkan waktu per panggilan:
+- sklearn : cosine_similarity(query, embeddings) — validasi input +
+            normalisasi ulang seluruh matriks katalog setiap panggilan.
+- kernel  : cosine_scores(embeddings_normed, query) — katalog sudah
+            dinormalisasi sekali (float32 contiguous), hanya query yang
+            dinormalisasi; matvec untuk 1 query, matmat untuk batch.
+
+Dijalankan pada embeddings asli (bert_embeddings.pkl) dan katalog
+sintetis yang lebih besar agar selisihnya terlihat.
+
+Cara menjalankan dari root folder:
+    python scripts/benchmark_scoring.py --sizes 10000 100000 --batch 32
+======================================================
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Tambahkan path root proyek agar bisa impor 'src'
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from src.utils import load_pickle
+from src.recommender import ModelPaths
+from src.scoring import cosine_scores, normalize_rows
+
+
+def time_per_call(fn, repeat: int) -> float:
+    """Rata-rata waktu per panggilan dalam mikrodetik (setelah 1x warm-up)."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench(name: str, embeddings: np.ndarray, batch: int, repeat: int) -> None:
+    rng = np.random.default_rng(0)
+    dim = embeddings.shape[1]
+    normed = normalize_rows(embeddings)
+    query = rng.normal(size=dim).astype(np.float32)
+    queries = rng.normal(size=(batch, dim)).astype(np.float32)
+
+    # Sanity check: hasil kedua jalur harus sama
+    np.testing.assert_allclose(
+        cosine_similarity(query[None, :], embeddings)[0], cosine_scores(normed, query), atol=1e-5
+    )
+
+    rows = [
+        ("1 query", lambda: cosine_similarity(query[None, :], embeddings)[0],
+                    lambda: cosine_scores(normed, query)),
+        (f"batch {batch}", lambda: cosine_similarity(queries, embeddings),
+                           lambda: cosine_scores(normed, queries)),
+    ]
+    print(f"\n{name}: N={embeddings.shape[0]}, d={dim}")
+    print(f"{'kasus':<10} {'sklearn_us':>12} {'kernel_us':>12} {'speedup':>8}")
+    for label, slow, fast in rows:
+        t_slow, t_fast = time_per_call(slow, repeat), time_per_call(fast, repeat)
+        print(f"{label:<10} {t_slow:>12.1f} {t_fast:>12.1f} {t_slow / t_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark kernel scoring cosine.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000, 100000], help="Ukuran katalog sintetis.")
+    parser.add_argument("--batch", type=int, default=32, help="Ukuran batch query.")
+    parser.add_argument("--repeat", type=int, default=50, help="Jumlah pengulangan per kasus.")
+    args = parser.parse_args()
+
+    paths = ModelPaths()
+    real = np.asarray(load_pickle(paths.bert_embed), dtype=np.float32)
+    bench("bert_embeddings.pkl", real, args.batch, args.repeat)
+
+    rng = np.random.default_rng(42)
+    for n in args.sizes:
+        bench("sintetis", rng.normal(size=(n, real.shape[1])).astype(np.float32), args.batch, args.repeat)
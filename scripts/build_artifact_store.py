@@ -0,0 +1,110 @@
+"""
+======================================================
+scripts/build_artifact_store.py
+======================================================
+MEMBANGUN ARTIFACT STORE BERVERSI (MMAP, TANPA PICKLE)
+
+Tugas:
+1. Memuat dataset bersih & embeddings BERT ('bert_embeddings.pkl').
+2. Membangun tabel top-K tetangga semua mode (per blok baris).
+3. Melatih indeks vektor IVF untuk semantic search (hanya jika katalog
+   >= IVF_MIN_ROWS baris; di bawahnya Recommender memakai pencarian exact).
+4. Menulis semuanya sebagai file .npy + manifest.json ke
+   'models/store/<versi>/' lalu menjadikannya versi CURRENT.
+
+Recommender akan membuka versi CURRENT dengan np.load(mmap_mode='r').
+
+Cara menjalankan dari root folder:
+    python scripts/build_artifact_store.py --k 50
+======================================================
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Tambahkan path root proyek agar bisa impor 'src' & 'scripts'
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from src.utils import load_pickle
+from src.recommender import ModelPaths
+from src.artifact_store import ArtifactStore, file_sha256
+from src.neighbors import DEFAULT_BLOCK_SIZE, DEFAULT_TOP_K, build_neighbor_table_from_blocks
+from src.scoring import normalize_rows
+from src.vector_index import IVF_MIN_ROWS, IVFIndex, embeddings_fingerprint
+from scripts.build_neighbor_tables import MODES, load_dataset, source_blocks
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] - %(message)s")
+
+# Model yang dipakai scripts/generate_embeddings.py untuk membuat embeddings
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+
+def build(k: int, block_size: int, n_lists: int | None = None, paths: ModelPaths = ModelPaths()) -> str:
+    start_time = time.time()
+    df = load_dataset(paths)
+    n = len(df)
+
+    embeddings = np.ascontiguousarray(load_pickle(paths.bert_embed), dtype=np.float32)
+    if embeddings.shape[0] != n:
+        raise ValueError(f"Jumlah embeddings ({embeddings.shape[0]}) != jumlah baris dataset ({n}).")
+
+    arrays = {"embeddings": embeddings}
+
+    # --- Indeks vektor (IVF) ---
+    # Katalog kecil dicari secara exact, jadi artefak IVF tidak ditulis.
+    index_meta = None
+    if n >= IVF_MIN_ROWS:
+        index = IVFIndex(embeddings, n_lists=n_lists).train()
+        arrays["embeddings_normed"] = index.vectors
+        arrays["ivf_centroids"] = index.centroids
+        arrays["ivf_list_order"] = index.list_order
+        arrays["ivf_list_offsets"] = index.list_offsets
+        index_meta = {
+            "kind": index.kind,
+            "fingerprint": index.fingerprint,
+            "n_lists": index.n_lists,
+            "n_iter": index.n_iter,
+            "seed": index.seed,
+        }
+        logging.info(f"✅ Indeks IVF dilatih ({index.n_lists} list).")
+    else:
+        arrays["embeddings_normed"] = normalize_rows(embeddings)
+        logging.info(f"ℹ️ {n} baris < IVF_MIN_ROWS ({IVF_MIN_ROWS}): indeks IVF tidak dibangun.")
+
+    # --- Tabel top-K tetangga ---
+    for mode in MODES:
+        table = build_neighbor_table_from_blocks(source_blocks(mode, paths, df, block_size), n, k)
+        arrays[f"neighbors_{mode}_ids"] = table.ids
+        arrays[f"neighbors_{mode}_scores"] = table.scores
+        logging.info(f"✅ Tabel tetangga '{mode}' ({n} x {table.k}) dibangun.")
+
+    metadata = {
+        "model_name": MODEL_NAME,
+        "dataset_file": paths.data.name,
+        "dataset_hash": file_sha256(paths.data),
+        "n_items": n,
+        "embedding_dim": int(embeddings.shape[1]),
+        "embeddings_fingerprint": embeddings_fingerprint(embeddings),
+        "neighbors_k": min(k, n - 1),
+        "index": index_meta,
+    }
+    version = ArtifactStore(paths.store).write(arrays, metadata)
+    logging.info(f"🎉 Artifact store versi {version} siap dalam {time.time() - start_time:.2f} detik.")
+    return version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangun artifact store berversi untuk Recommender.")
+    parser.add_argument("--k", type=int, default=DEFAULT_TOP_K, help="Jumlah tetangga per item.")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Jumlah baris per blok.")
+    parser.add_argument("--n-lists", type=int, default=None, help="Jumlah list IVF (default ~sqrt(N)).")
+    args = parser.parse_args()
+
+    build(args.k, args.block_size, args.n_lists)
@@ -0,0 +1,84 @@
+"""
+======================================================
+scripts/build_collab_model.py
+======================================================
+JOB OFFLINE: MODEL COLLABORATIVE FILTERING (ITEM-ITEM)
+
+Tugas:
+1. Membaca seluruh klik (id, user_id, item_id) dari `click_history`
+   (DATABASE_URL yang sama dengan server).
+2. Membangun co-occurrence item-item (scipy CSR) + tabel top-K
+   ternormalisasi (src/collaborative.py).
+3. Menyimpan pasangan (user, item) unik + watermark (id klik terakhir)
+   ke 'models/collab_cooccurrence.npz'.
+
+Saat startup server memuat file ini lalu hanya membaca klik setelah
+watermark dari DB; klik baru berikutnya di-update inkremental.
+(Tabel top-K dihitung ulang saat load dengan COLLAB_TOP_K / COLLAB_SHRINK
+server; --k / --shrink di sini hanya untuk ringkasan log.)
+
+Cara menjalankan dari root folder:
+    python scripts/build_collab_model.py
+======================================================
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Tambahkan path root proyek (untuk 'src') dan folder backend (database, models)
+BASE_DIR = Path(__file__).resolve().parent.parent
+for path in (BASE_DIR, BASE_DIR / "backend"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from sqlalchemy import select
+
+from src.recommender import ModelPaths
+from src.neighbors import DEFAULT_TOP_K
+from src.collaborative import DEFAULT_SHRINK, CooccurrenceModel
+import database
+import models
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] - %(message)s")
+
+
+def load_id_to_row(paths: ModelPaths) -> np.ndarray:
+    """Lookup id -> baris katalog (sama dengan Recommender._build_lookups)."""
+    ids = pd.read_csv(paths.data, usecols=["id"])["id"].to_numpy()
+    id_to_row = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int32)
+    id_to_row[ids] = np.arange(len(ids), dtype=np.int32)
+    return id_to_row
+
+
+def build(k: int, shrink: float, paths: ModelPaths = ModelPaths()) -> None:
+    start_time = time.time()
+    ch = models.ClickHistory
+    with database.engine.connect() as conn:
+        clicks = conn.execute(select(ch.id, ch.user_id, ch.item_id).order_by(ch.id.asc())).all()
+    logging.info(f"📥 {len(clicks)} klik dibaca dari DB dalam {time.time() - start_time:.2f} detik.")
+
+    model = CooccurrenceModel(load_id_to_row(paths), k=k, shrink=shrink)
+    if clicks:
+        ids, users, items = zip(*clicks)
+        model.fit(users, items, watermark=ids[-1])
+    model.save(paths.collab)
+    stats = model.stats()
+    logging.info(
+        f"✅ Model collab selesai dalam {time.time() - start_time:.2f} detik "
+        f"({stats['items_with_neighbors']} item punya tetangga, {stats['cooccurrence_nnz']} entri co-occurrence)."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangun model collaborative filtering item-item dari click_history.")
+    parser.add_argument("--k", type=int, default=DEFAULT_TOP_K, help="Jumlah tetangga per item.")
+    parser.add_argument("--shrink", type=float, default=DEFAULT_SHRINK, help="Shrinkage normalisasi.")
+    args = parser.parse_args()
+
+    build(args.k, args.shrink)
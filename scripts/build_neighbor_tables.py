@@ -0,0 +1,90 @@
+"""
+======================================================
+scripts/build_neighbor_tables.py
+======================================================
+MEMBANGUN TABEL TOP-K TETANGGA (PENGGANTI MATRIKS N x N)
+
+Tugas:
+1. Memuat dataset bersih & sumber fitur tiap mode:
+   - tfidf  : 'tfidf_vectorizer.pkl' -> transform 'fitur_bersih' (sparse).
+   - bert   : 'bert_embeddings.pkl'.
+   - hybrid : 'hybrid_similarity.pkl' (vektor FastText tidak disimpan,
+              jadi matriks lama dibaca per blok baris).
+2. Menghitung cosine similarity per blok baris (matriks penuh tidak
+   pernah dibentuk untuk tfidf & bert).
+3. Menyimpan top-K tetangga (int32 ids + float16 scores) ke
+   'models/neighbors_<mode>.npz'.
+
+Cara menjalankan dari root folder:
+    python scripts/build_neighbor_tables.py --k 50 --block-size 1024
+======================================================
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Tambahkan path root proyek agar bisa impor 'src'
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from src.utils import load_pickle
+from src.recommender import ModelPaths
+from src.neighbors import (
+    DEFAULT_BLOCK_SIZE, DEFAULT_TOP_K,
+    build_neighbor_table_from_blocks, iter_cosine_blocks, iter_matrix_blocks,
+    save_neighbor_table,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] - %(message)s")
+
+MODES = ("tfidf", "hybrid", "bert")
+
+
+def load_dataset(paths: ModelPaths) -> pd.DataFrame:
+    df = pd.read_csv(paths.data)
+    df['fitur_bersih'] = df['fitur_bersih'].fillna('')
+    return df
+
+
+def source_blocks(mode: str, paths: ModelPaths, df: pd.DataFrame, block_size: int):
+    """Mengembalikan iterator blok kemiripan untuk satu mode."""
+    if mode == "tfidf":
+        vectorizer = load_pickle(paths.tfidf_vectorizer)
+        return iter_cosine_blocks(vectorizer.transform(df['fitur_bersih']), block_size)
+    if mode == "bert":
+        return iter_cosine_blocks(load_pickle(paths.bert_embed), block_size)
+    if mode == "hybrid":
+        matrix = load_pickle(paths.hybrid_sim)
+        return iter_matrix_blocks(lambda s, e: matrix[s:e], matrix.shape[0], block_size)
+    raise ValueError(f"Mode '{mode}' tidak dikenal. Pilihan: {MODES}")
+
+
+def build(modes, k: int, block_size: int, paths: ModelPaths = ModelPaths()) -> None:
+    df = load_dataset(paths)
+    n = len(df)
+    for mode in modes:
+        start_time = time.time()
+        logging.info(f"🧮 Membangun tabel top-{k} untuk mode '{mode}' ({n} item, blok {block_size})...")
+        table = build_neighbor_table_from_blocks(source_blocks(mode, paths, df, block_size), n, k)
+        save_neighbor_table(table, paths.neighbors(mode))
+        logging.info(
+            f"✅ Mode '{mode}' selesai dalam {time.time() - start_time:.2f} detik "
+            f"({table.nbytes / 1024:.1f} KB vs {n * n * 8 / 1024:.1f} KB matriks float64)."
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangun tabel top-K tetangga untuk Recommender.")
+    parser.add_argument("--k", type=int, default=DEFAULT_TOP_K, help="Jumlah tetangga per item.")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Jumlah baris per blok.")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES, help="Mode yang dibangun.")
+    args = parser.parse_args()
+
+    build(args.modes, args.k, args.block_size)
+    logging.info("🎉 Semua tabel tetangga siap digunakan!")
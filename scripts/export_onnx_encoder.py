@@ -0,0 +1,162 @@
+"""
+======================================================
+scripts/export_onnx_encoder.py
+======================================================
+EXPORT ENCODER S-BERT KE ONNX + KUANTISASI INT8
+
+Tugas:
+1. Memuat SentenceTransformer (PyTorch) yang sama dengan produksi.
+2. Export modul transformer-nya ke ONNX (dynamic batch & panjang token).
+3. Kuantisasi dinamis bobot ke int8 (onnxruntime.quantization).
+4. Menyimpan tokenizer & konfigurasi pooling ke 'models/onnx/'.
+5. Parity check: encode ulang seluruh 'fitur_bersih' dengan model int8
+   dan bandingkan dengan 'bert_embeddings.pkl' (cosine drift),
+   hasilnya disimpan ke 'models/onnx/parity.json'.
+
+Cara menjalankan dari root folder (butuh torch, onnx, onnxruntime):
+    python scripts/export_onnx_encoder.py
+======================================================
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Tambahkan path root proyek agar bisa impor 'src'
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from src.utils import load_pickle
+from src.recommender import ModelPaths
+from src.onnx_encoder import CONFIG_NAME, FP32_NAME, INT8_NAME, OnnxEncoder
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] - %(message)s")
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+# Batas drift minimum yang masih dianggap kompatibel dengan embeddings katalog
+MIN_COSINE = 0.98
+
+
+def export(out_dir: Path, opset: int = 17) -> None:
+    """Export transformer ke ONNX fp32, lalu kuantisasi ke int8."""
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        logging.error(f"❌ Library untuk export belum terinstal: {e}")
+        logging.error("Silakan jalankan: pip install torch sentence-transformers onnx onnxruntime")
+        sys.exit(1)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    logging.info(f"🤖 Memuat SentenceTransformer '{MODEL_NAME}'...")
+    st_model = SentenceTransformer(MODEL_NAME, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    class _LastHiddenState(torch.nn.Module):
+        """Wrapper agar output ONNX hanya 'last_hidden_state'."""
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(*inputs, return_dict=False)[0]
+
+    dummy = tokenizer(["contoh kalimat wisata di jember"], return_tensors="pt", padding=True)
+    input_names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = out_dir / FP32_NAME
+    logging.info(f"📤 Export ke ONNX (opset {opset}): {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(transformer),
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+    int8_path = out_dir / INT8_NAME
+    logging.info(f"🗜️ Kuantisasi dinamis int8: {int8_path}")
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(str(out_dir))
+    config = {
+        "model_name": MODEL_NAME,
+        "max_seq_length": int(st_model.max_seq_length),
+        "embedding_dim": int(st_model.get_sentence_embedding_dimension()),
+        "pad_token": tokenizer.pad_token,
+        "pad_id": int(tokenizer.pad_token_id),
+        "pooling": "mean",
+        "normalize": any(type(m).__name__ == "Normalize" for m in st_model),
+        "input_names": input_names,
+    }
+    (out_dir / CONFIG_NAME).write_text(json.dumps(config, indent=2), encoding="utf-8")
+    logging.info(
+        f"✅ Export selesai. Ukuran fp32: {fp32_path.stat().st_size / 1e6:.1f} MB, "
+        f"int8: {int8_path.stat().st_size / 1e6:.1f} MB"
+    )
+
+
+def parity_check(out_dir: Path, paths: ModelPaths = ModelPaths()) -> dict:
+    """Membandingkan embeddings ONNX int8 dengan 'bert_embeddings.pkl'."""
+    df = pd.read_csv(paths.data)
+    corpus = df['fitur_bersih'].fillna('').astype(str).tolist()
+    reference = np.asarray(load_pickle(paths.bert_embed), dtype=np.float32)
+
+    encoder = OnnxEncoder(out_dir, quantized=True)
+    start = time.perf_counter()
+    onnx_vecs = encoder.encode(corpus)
+    elapsed = time.perf_counter() - start
+
+    ref_n = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    onnx_n = onnx_vecs / np.linalg.norm(onnx_vecs, axis=1, keepdims=True)
+    cosine = (ref_n * onnx_n).sum(axis=1)
+
+    # Apakah tetangga terdekat tiap item tetap sama?
+    k = min(5, len(corpus) - 1)
+    sim_ref, sim_onnx = ref_n @ ref_n.T, onnx_n @ ref_n.T
+    np.fill_diagonal(sim_ref, -np.inf)
+    np.fill_diagonal(sim_onnx, -np.inf)
+    top_ref = np.argsort(-sim_ref, axis=1)[:, :k]
+    top_onnx = np.argsort(-sim_onnx, axis=1)[:, :k]
+    overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(top_ref, top_onnx)])
+
+    report = {
+        "n_items": len(corpus),
+        "cosine_mean": round(float(cosine.mean()), 5),
+        "cosine_min": round(float(cosine.min()), 5),
+        "cosine_p05": round(float(np.percentile(cosine, 5)), 5),
+        "max_drift": round(float(1 - cosine.min()), 5),
+        f"top{k}_overlap": round(float(overlap), 4),
+        "encode_ms_per_item": round(elapsed * 1000 / len(corpus), 3),
+        "compatible": bool(cosine.min() >= MIN_COSINE),
+    }
+    (out_dir / "parity.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    log = logging.info if report["compatible"] else logging.warning
+    log(f"📏 Parity ONNX int8 vs bert_embeddings.pkl: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export encoder S-BERT ke ONNX int8 + parity check.")
+    parser.add_argument("--out-dir", type=Path, default=ModelPaths().onnx_dir, help="Folder output.")
+    parser.add_argument("--opset", type=int, default=17, help="Versi opset ONNX.")
+    parser.add_argument("--skip-export", action="store_true", help="Hanya jalankan parity check.")
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        export(args.out_dir, args.opset)
+    parity_check(args.out_dir)
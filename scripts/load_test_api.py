@@ -0,0 +1,118 @@
+"""
+======================================================
+scripts/load_test_api.py
+======================================================
+LOAD TEST KONKURENSI API (auth, history, feed, katalog)
+
+Mensimulasikan banyak user bersamaan terhadap server yang sedang
+berjalan. Setiap virtual user register + login sekali, lalu berulang:
+    POST /api/v1/history/click
+    GET  /api/v1/feed/me
+    GET  /api/v1/history/my-ids
+    GET  /api/v1/destinations/all?limit=20
+Sementara itu satu "probe" memanggil GET /api/v1/metrics (tanpa DB) berkala:
+latensinya menunjukkan apakah event loop ikut tertahan oleh akses DB.
+
+Metrik per endpoint: jumlah request, error, p50/p95/p99 (ms), dan
+throughput total (req/detik).
+
+Cara menjalankan (server sudah jalan di port 8000):
+    python scripts/load_test_api.py --users 50 --duration 30
+======================================================
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+PASSWORD = "loadtest-Passw0rd"
+
+
+class Stats:
+    """Latensi (ms) & jumlah error per nama endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def timed(self, name: str, call):
+        start = time.perf_counter()
+        try:
+            response = await call
+            if response.status_code >= 400:
+                self.errors[name] += 1
+            return response
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        finally:
+            self.latencies[name].append((time.perf_counter() - start) * 1000)
+
+    def report(self, elapsed: float) -> None:
+        total = sum(len(v) for v in self.latencies.values())
+        print(f"\n{'endpoint':<22} {'n':>7} {'err':>5} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}")
+        for name, values in sorted(self.latencies.items()):
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            print(f"{name:<22} {len(values):>7} {self.errors[name]:>5} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+        print(f"\nTotal {total} request dalam {elapsed:.1f} dtk -> {total / elapsed:.1f} req/dtk")
+
+
+async def login(client: httpx.AsyncClient, stats: Stats) -> dict | None:
+    username = "lt" + uuid.uuid4().hex[:10]
+    await stats.timed("register", client.post("/auth/register", json={"username": username, "password": PASSWORD}))
+    response = await stats.timed("login", client.post("/auth/login", data={"username": username, "password": PASSWORD}))
+    if response is None or response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def virtual_user(client: httpx.AsyncClient, stats: Stats, deadline: float, item_ids: list) -> None:
+    headers = await login(client, stats)
+    if headers is None:
+        return
+    while time.perf_counter() < deadline:
+        await stats.timed("history/click", client.post(
+            "/api/v1/history/click", json={"item_id": random.choice(item_ids)}, headers=headers))
+        await stats.timed("feed/me", client.get("/api/v1/feed/me", headers=headers))
+        await stats.timed("history/my-ids", client.get("/api/v1/history/my-ids", headers=headers))
+        await stats.timed("destinations/all", client.get("/api/v1/destinations/all", params={"limit": 20}))
+
+
+async def loop_probe(client: httpx.AsyncClient, stats: Stats, deadline: float, interval: float) -> None:
+    """Endpoint tanpa DB: latensinya naik jika event loop terblokir."""
+    while time.perf_counter() < deadline:
+        await stats.timed("probe /metrics", client.get("/api/v1/metrics"))
+        await asyncio.sleep(interval)
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.users + 10, max_keepalive_connections=args.users + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        catalog = await client.get("/api/v1/destinations/all", params={"fields": "id"})
+        catalog.raise_for_status()
+        item_ids = [row["id"] for row in catalog.json()]
+
+        stats = Stats()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            loop_probe(client, stats, deadline, args.probe_interval),
+            *(virtual_user(client, stats, deadline, item_ids) for _ in range(args.users)),
+        )
+        stats.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test konkurensi API JemberTrip.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="URL server.")
+    parser.add_argument("--users", type=int, default=50, help="Jumlah virtual user bersamaan.")
+    parser.add_argument("--duration", type=float, default=30, help="Durasi test (detik).")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout per request (detik).")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="Jeda antar probe /metrics (detik).")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,186 @@
+"""
+======================================================
+ARTIFACT STORE — Penyimpanan Artefak Berversi (mmap)
+======================================================
+
+Menggantikan pickle untuk artefak numerik besar. Struktur di disk:
+
+    models/store/
+        CURRENT                 <- nama versi yang aktif
+        <versi>/
+            manifest.json       <- shape, dtype, nama model, hash dataset
+            embeddings.npy
+            embeddings_normed.npy
+            neighbors_<mode>_ids.npy
+            neighbors_<mode>_scores.npy
+            ...
+
+Semua array dibuka read-only dengan `np.load(mmap_mode='r')`, sehingga
+beberapa worker uvicorn berbagi halaman memori lewat page cache OS dan
+startup tidak perlu deserialisasi.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+FORMAT_VERSION = 1
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash SHA-256 sebuah file (dibaca per chunk)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ======================================================
+# 1️⃣ SNAPSHOT (SATU VERSI, READ-ONLY)
+# ======================================================
+class StoreSnapshot:
+    """Satu versi artefak yang sudah ditulis. Array dibuka lazily via mmap."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        manifest_path = path / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Manifest artefak tidak ditemukan di {manifest_path}")
+        self.manifest: Dict[str, Any] = json.loads(manifest_path.read_text(encoding="utf-8"))
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def arrays(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest.get("arrays", {})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def array(self, name: str) -> np.ndarray:
+        """Membuka array `name` sebagai memmap read-only (di-cache per snapshot)."""
+        if name not in self._arrays:
+            meta = self.arrays.get(name)
+            if meta is None:
+                raise KeyError(f"Array '{name}' tidak ada di artefak versi {self.version}.")
+            arr = np.load(self.path / meta["file"], mmap_mode="r", allow_pickle=False)
+            if list(arr.shape) != meta["shape"] or str(arr.dtype) != meta["dtype"]:
+                raise ValueError(
+                    f"Array '{name}' tidak sesuai manifest: "
+                    f"{arr.shape}/{arr.dtype} vs {tuple(meta['shape'])}/{meta['dtype']}"
+                )
+            self._arrays[name] = arr
+        return self._arrays[name]
+
+
+# ======================================================
+# 2️⃣ STORE (KUMPULAN VERSI)
+# ======================================================
+class ArtifactStore:
+    """Mengelola versi-versi artefak di bawah satu direktori root."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @property
+    def current_file(self) -> Path:
+        return self.root / CURRENT_NAME
+
+    def exists(self) -> bool:
+        return self.current_file.exists()
+
+    def current_version(self) -> str | None:
+        if not self.exists():
+            return None
+        return self.current_file.read_text(encoding="utf-8").strip() or None
+
+    def list_versions(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / MANIFEST_NAME).exists())
+
+    def open(self, version: str | None = None) -> StoreSnapshot:
+        """Membuka versi tertentu (default: versi CURRENT)."""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Artifact store belum dibuat di {self.root}")
+        return StoreSnapshot(self.root / version)
+
+    def write(self, arrays: Dict[str, np.ndarray], metadata: Dict[str, Any],
+              activate: bool = True) -> str:
+        """
+        Menulis satu versi baru secara atomik:
+        ditulis ke folder sementara, di-rename, lalu CURRENT diperbarui.
+
+        Args:
+            arrays: Nama -> array numpy (akan disimpan sebagai .npy).
+            metadata: Info tambahan untuk manifest (model_name, dataset_hash, dll).
+            activate: Jika True, versi baru langsung dijadikan CURRENT.
+
+        Returns:
+            Nama versi yang baru ditulis.
+        """
+        created_at = datetime.now(timezone.utc)
+        content_hash = hashlib.sha1()
+        for name in sorted(arrays):
+            arr = np.ascontiguousarray(arrays[name])
+            content_hash.update(name.encode())
+            content_hash.update(str(arr.dtype).encode())
+            content_hash.update(str(arr.shape).encode())
+            content_hash.update(arr.tobytes())
+        version = f"{created_at:%Y%m%dT%H%M%S}-{content_hash.hexdigest()[:8]}"
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".tmp-{version}"
+        final_dir = self.root / version
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        manifest: Dict[str, Any] = {
+            "format_version": FORMAT_VERSION,
+            "version": version,
+            "created_at": created_at.isoformat(),
+            **metadata,
+            "arrays": {},
+        }
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            file_name = f"{name}.npy"
+            np.save(tmp_dir / file_name, arr, allow_pickle=False)
+            manifest["arrays"][name] = {
+                "file": file_name,
+                "shape": list(arr.shape),
+                "dtype": str(arr.dtype),
+            }
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_dir, final_dir)
+
+        if activate:
+            self.activate(version)
+        logger.info(f"💾 Artefak versi {version} ditulis ke {final_dir} ({len(arrays)} array).")
+        return version
+
+    def activate(self, version: str) -> None:
+        """Menjadikan `version` sebagai CURRENT (atomik via os.replace)."""
+        if not (self.root / version / MANIFEST_NAME).exists():
+            raise FileNotFoundError(f"Versi artefak '{version}' tidak ditemukan di {self.root}")
+        tmp = self.root / f".{CURRENT_NAME}.tmp"
+        tmp.write_text(version, encoding="utf-8")
+        os.replace(tmp, self.current_file)
+        logger.info(f"📌 Versi artefak aktif: {version}")
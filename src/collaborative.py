@@ -0,0 +1,222 @@
+"""
+======================================================
+COLLABORATIVE FILTERING — Item-Item dari Co-occurrence Klik
+======================================================
+
+"User yang mengklik X juga mengklik Y". Dari pasangan unik
+(user, item) di `click_history` dibentuk matriks interaksi biner
+X (user x item, CSR), lalu co-occurrence C = Xᵀ X (item x item, CSR):
+- C[i, j] = jumlah user yang mengklik i DAN j,
+- C[i, i] = jumlah user yang mengklik i.
+
+Skor dinormalisasi cosine dengan shrinkage (meredam pasangan yang
+dukungannya kecil):
+
+    skor(i, j) = C[i, j] / (sqrt(C[i, i] * C[j, j]) + shrink)
+
+Hasilnya disimpan sebagai `NeighborTable` top-K (sama seperti mode
+konten), slot kosong diisi id -1. Update inkremental hanya menghitung
+ulang baris tabel untuk item yang terdampak klik baru.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .neighbors import DEFAULT_TOP_K, NeighborTable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHRINK = 5.0
+
+
+class CooccurrenceModel:
+    """
+    Model item-item collaborative filtering berbasis co-occurrence.
+
+    Args:
+        id_to_row: Lookup id item -> baris katalog (-1 = tidak ada),
+            sama dengan `Recommender.id_to_row`.
+        k: Jumlah tetangga per item di tabel.
+        shrink: Konstanta shrinkage pada penyebut normalisasi.
+    """
+
+    def __init__(self, id_to_row: np.ndarray, k: int = DEFAULT_TOP_K, shrink: float = DEFAULT_SHRINK):
+        self.id_to_row = np.asarray(id_to_row)
+        self.n_items = int((self.id_to_row >= 0).sum())
+        self.k = max(1, min(k, self.n_items - 1))
+        self.shrink = shrink
+        # Item (baris) unik yang pernah diklik per user
+        self.user_items: Dict[int, Set[int]] = {}
+        self.n_pairs = 0
+        self.cooc = sparse.csr_matrix((self.n_items, self.n_items), dtype=np.int32)
+        self.item_counts = np.zeros(self.n_items, dtype=np.int32)
+        self.table = NeighborTable(
+            ids=np.full((self.n_items, self.k), -1, dtype=np.int32),
+            scores=np.zeros((self.n_items, self.k), dtype=np.float16),
+        )
+        # Id klik terakhir yang sudah masuk model (untuk catch-up dari DB)
+        self.watermark = 0
+        self.version = 0
+
+    # --------------------------------------------------
+    # Build & update
+    # --------------------------------------------------
+    def _to_rows(self, item_ids: Iterable[int]) -> np.ndarray:
+        ids = np.fromiter(item_ids, dtype=np.int64)
+        rows = np.full(ids.shape, -1, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self.id_to_row))
+        rows[known] = self.id_to_row[ids[known]]
+        return rows
+
+    def fit(self, user_ids: Iterable[int], item_ids: Iterable[int], watermark: int = 0) -> "CooccurrenceModel":
+        """Membangun model dari nol dari seluruh klik (user_id, item_id)."""
+        users = np.fromiter(user_ids, dtype=np.int64)
+        rows = self._to_rows(item_ids)
+        known = rows >= 0
+        pairs = np.unique(np.stack([users[known], rows[known]], axis=1), axis=0) if known.any() \
+            else np.empty((0, 2), dtype=np.int64)
+
+        self.user_items = {}
+        for user_id, row in pairs.tolist():
+            self.user_items.setdefault(user_id, set()).add(row)
+        self.n_pairs = len(pairs)
+
+        # X: user x item biner (CSR) -> C = Xᵀ X
+        user_index, user_pos = np.unique(pairs[:, 0], return_inverse=True)
+        x = sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.int32), (user_pos, pairs[:, 1])),
+            shape=(len(user_index), self.n_items),
+        )
+        self.cooc = (x.T @ x).tocsr()
+        self.item_counts = self.cooc.diagonal().astype(np.int32)
+        self._publish(np.arange(self.n_items))
+        self.watermark = max(self.watermark, watermark)
+        logger.info(
+            f"🤝 Model co-occurrence dibangun: {len(pairs)} pasangan (user, item) unik, "
+            f"{len(user_index)} user, {self.cooc.nnz} entri non-nol."
+        )
+        return self
+
+    def add_clicks(self, user_ids: Iterable[int], item_ids: Iterable[int], watermark: int = 0) -> np.ndarray:
+        """
+        Update inkremental dengan klik baru. Hanya pasangan (user, item)
+        yang BELUM pernah ada yang mengubah co-occurrence.
+
+        Returns:
+            Baris item yang tabel tetangganya dihitung ulang.
+        """
+        self.watermark = max(self.watermark, watermark)
+        new_items: Dict[int, Set[int]] = {}
+        for user_id, row in zip(user_ids, self._to_rows(item_ids).tolist()):
+            if row >= 0 and row not in self.user_items.get(user_id, ()):
+                new_items.setdefault(user_id, set()).add(row)
+        if not new_items:
+            return np.array([], dtype=np.int64)
+
+        # Xn = item baru, Xo = item lama per user (satu baris per user terdampak)
+        new_r, new_c, old_r, old_c = [], [], [], []
+        for pos, (user_id, rows) in enumerate(new_items.items()):
+            old = self.user_items.setdefault(user_id, set())
+            new_r.extend([pos] * len(rows))
+            new_c.extend(rows)
+            old_r.extend([pos] * len(old))
+            old_c.extend(old)
+            old |= rows
+            self.n_pairs += len(rows)
+        shape = (len(new_items), self.n_items)
+        xn = sparse.csr_matrix((np.ones(len(new_c), dtype=np.int32), (new_r, new_c)), shape=shape)
+        xo = sparse.csr_matrix((np.ones(len(old_c), dtype=np.int32), (old_r, old_c)), shape=shape)
+
+        # (Xo + Xn)ᵀ(Xo + Xn) - XoᵀXo = XnᵀXo + XoᵀXn + XnᵀXn
+        cross = xn.T @ xo
+        delta = (cross + cross.T + xn.T @ xn).tocsr()
+        self.cooc = (self.cooc + delta).tocsr()
+        self.item_counts = self.cooc.diagonal().astype(np.int32)
+
+        # Terdampak: baris yang co-occurrence-nya berubah, plus semua item yang
+        # pernah muncul bersama item baru (penyebut normalisasinya berubah)
+        changed = np.unique(np.asarray(new_c, dtype=np.int64))
+        affected = np.union1d(np.unique(delta.nonzero()[0]), self.cooc[changed].indices)
+        self._publish(affected)
+        return affected
+
+    # --------------------------------------------------
+    # Ranking
+    # --------------------------------------------------
+    def _rank_rows(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k tetangga ternormalisasi untuk baris-baris `rows` (padding -1 / 0)."""
+        ids = np.full((len(rows), self.k), -1, dtype=np.int32)
+        scores = np.zeros((len(rows), self.k), dtype=np.float16)
+        sub = self.cooc[rows]
+        norms = np.sqrt(self.item_counts.astype(np.float64))
+        for i, row in enumerate(rows):
+            start, end = sub.indptr[i], sub.indptr[i + 1]
+            cols = sub.indices[start:end]
+            keep = cols != row
+            cols = cols[keep]
+            if cols.size == 0:
+                continue
+            values = sub.data[start:end][keep] / (norms[row] * norms[cols] + self.shrink)
+            k = min(self.k, cols.size)
+            top = np.argpartition(-values, k - 1)[:k] if k < cols.size else np.arange(cols.size)
+            # Skor seri -> id baris lebih kecil dulu (deterministik)
+            top = top[np.lexsort((cols[top], -values[top]))]
+            ids[i, :k] = cols[top]
+            scores[i, :k] = values[top]
+        return ids, scores
+
+    def _publish(self, rows: np.ndarray) -> None:
+        """Menghitung ulang `rows` di salinan tabel lalu menukar tabel (pembaca tidak melihat state setengah jadi)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        ids, scores = self.table.ids.copy(), self.table.scores.copy()
+        ids[rows], scores[rows] = self._rank_rows(rows)
+        self.table = NeighborTable(ids=ids, scores=scores)
+        self.version += 1
+
+    # --------------------------------------------------
+    # Persistensi (hasil job offline)
+    # --------------------------------------------------
+    def save(self, path: Path) -> None:
+        """Menyimpan pasangan (user_id, item_id) unik + watermark ke .npz (tabel dihitung ulang saat load)."""
+        row_to_id = np.empty(self.n_items, dtype=np.int64)
+        known = np.flatnonzero(self.id_to_row >= 0)
+        row_to_id[self.id_to_row[known]] = known
+        users = [u for u, rows in self.user_items.items() for _ in rows]
+        items = [int(row_to_id[r]) for rows in self.user_items.values() for r in rows]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            user_ids=np.asarray(users, dtype=np.int64),
+            item_ids=np.asarray(items, dtype=np.int64),
+            watermark=np.int64(self.watermark),
+        )
+        logger.info(f"💾 Model co-occurrence ({len(users)} pasangan, watermark {self.watermark}) disimpan ke: {path}")
+
+    @classmethod
+    def load(cls, path: Path, id_to_row: np.ndarray, k: int = DEFAULT_TOP_K,
+             shrink: float = DEFAULT_SHRINK) -> "CooccurrenceModel":
+        """Memuat pasangan dari .npz dan membangun ulang co-occurrence + tabel."""
+        if not path.exists():
+            raise FileNotFoundError(f"Model co-occurrence tidak ditemukan di {path}")
+        with np.load(path, allow_pickle=False) as data:
+            return cls(id_to_row, k=k, shrink=shrink).fit(
+                data["user_ids"], data["item_ids"], watermark=int(data["watermark"])
+            )
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "watermark": self.watermark,
+            "users": len(self.user_items),
+            "pairs": self.n_pairs,
+            "cooccurrence_nnz": int(self.cooc.nnz),
+            "items_with_neighbors": int((self.table.ids[:, 0] >= 0).sum()),
+            "k": self.k,
+            "shrink": self.shrink,
+        }
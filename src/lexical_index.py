@@ -0,0 +1,111 @@
+"""
+======================================================
+LEXICAL INDEX — BM25 Inverted Index
+======================================================
+
+Indeks kata kunci in-memory di atas kolom `fitur_bersih`, dibangun
+saat load. Tokenisasi memakai `utils.text_preprocessing.clean_text`
+(lowercase, huruf saja, stopwords Bahasa Indonesia dibuang), sama
+untuk dokumen maupun query.
+
+Bobot BM25 per (term, dokumen) dihitung sekali saat build dan disimpan
+sebagai matriks sparse CSC (kolom = posting list satu term). Scoring
+query hanya menyentuh posting list term yang ada di query — tidak ada
+scan dense ke seluruh katalog — dan hasilnya tetap sparse
+(baris kandidat + skor).
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.text_preprocessing import clean_text
+
+from .ranking import top_k_indices
+
+
+def tokenize(text: str) -> List[str]:
+    """Token BM25: hasil `clean_text` (stopwords sudah dibuang) dipecah per spasi."""
+    return clean_text(text).split()
+
+
+class BM25Index:
+    """
+    Inverted index BM25 (Okapi) dengan bobot yang sudah dihitung di muka.
+
+    Args:
+        documents: Teks per dokumen (urutan = index baris katalog).
+        k1: Saturasi frekuensi term.
+        b: Normalisasi panjang dokumen.
+    """
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+
+        rows, cols = [], []
+        doc_lengths = []
+        for row, text in enumerate(documents):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for token in tokens:
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+
+        self.n_docs = len(doc_lengths)
+        shape = (self.n_docs, len(self.vocabulary))
+        # COO -> CSC menjumlahkan entri duplikat = term frequency
+        tf = sparse.coo_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape
+        ).tocsc()
+        tf.sum_duplicates()
+
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avg_len = float(lengths.mean()) if self.n_docs and lengths.mean() > 0 else 1.0
+        df = np.diff(tf.indptr).astype(np.float32)
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        # w = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * |d| / avgdl))
+        norm = k1 * (1.0 - b + b * lengths / avg_len)
+        term_ids = np.repeat(np.arange(shape[1]), np.diff(tf.indptr))
+        tf.data = self.idf[term_ids] * tf.data * (k1 + 1.0) / (tf.data + norm[tf.indices])
+        self.weights: sparse.csc_matrix = tf
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def term_ids(self, query: str) -> np.ndarray:
+        """Id term query yang ada di kosakata (unik)."""
+        ids = {self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary}
+        return np.fromiter(sorted(ids), dtype=np.int64, count=len(ids))
+
+    def score(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Skor BM25 dalam bentuk sparse.
+
+        Returns:
+            Tuple (rows, scores): hanya dokumen yang memuat minimal satu
+            term query (urut index baris). Kosong jika tidak ada yang cocok.
+        """
+        terms = self.term_ids(query)
+        if terms.size == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        # Gabungkan posting list term query, jumlahkan bobot per dokumen
+        postings = self.weights[:, terms]
+        rows, inverse = np.unique(postings.indices, return_inverse=True)
+        scores = np.bincount(inverse, weights=postings.data, minlength=rows.size).astype(np.float32)
+        return rows.astype(np.int64), scores
+
+    def search(self, query: str, top_k: int, mask: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k dokumen BM25, terurut dari skor tertinggi.
+        `mask` (boolean, N) opsional: hanya dokumen True yang boleh masuk hasil.
+        """
+        rows, scores = self.score(query)
+        if mask is not None:
+            keep = mask[rows]
+            rows, scores = rows[keep], scores[keep]
+        order = top_k_indices(scores, top_k)
+        return rows[order], scores[order]
@@ -0,0 +1,258 @@
+"""
+======================================================
+NAME INDEX — Autocomplete & Resolusi Nama Toleran Typo
+======================================================
+
+Indeks kecil atas `nama_wisata` (+ alias) yang dibangun sekali per
+load artefak, tanpa encoder:
+
+- Trie prefix: setiap awal kata nama/alias dimasukkan ("Pantai Watu Ulo"
+  -> "pantai watu ulo", "watu ulo", "ulo"). Tiap node menyimpan daftar
+  baris teratas yang sudah diurutkan, jadi autocomplete = jalan sepanjang
+  query + ambil daftar (O(|q| + k)).
+- Indeks trigram karakter + edit distance (Damerau/OSA, dibatasi):
+  kandidat diambil dari posting trigram, lalu diverifikasi dengan jarak
+  edit. Dipakai untuk resolusi nama salah ketik dan autocomplete fuzzy.
+
+Normalisasi: huruf kecil, aksen & tanda baca dibuang, angka tetap ada,
+ejaan lama disamakan ("oe" -> "u", "dj" -> "j", "tj" -> "c"), sehingga
+"kampung" cocok dengan "Kampoeng".
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_LIMIT = 10
+# Kandidat trigram terbanyak yang diverifikasi dengan edit distance
+MAX_FUZZY_CANDIDATES = 24
+
+_OLD_SPELLING = (("oe", "u"), ("dj", "j"), ("tj", "c"))
+
+
+def normalize_name(text: str) -> str:
+    """Normalisasi nama untuk pencocokan (lihat docstring modul)."""
+    if not isinstance(text, str):
+        return ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    for old, new in _OLD_SPELLING:
+        text = text.replace(old, new)
+    return text
+
+
+def max_typos(length: int) -> int:
+    """Jumlah salah ketik yang ditoleransi untuk query sepanjang `length`."""
+    if length <= 3:
+        return 0
+    return 1 if length <= 6 else 2
+
+
+def _trigrams(text: str, pad_end: bool = True) -> List[str]:
+    padded = f"  {text} " if pad_end else f"  {text}"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _banded_osa(a: str, b: str, limit: int, prefix: bool) -> int:
+    """
+    Damerau/OSA dengan pita |i - j| <= limit (sel di luar pita pasti > limit).
+    `prefix=True` -> jarak minimum `a` ke prefix mana pun dari `b`.
+    """
+    big = limit + 1
+    n, m = len(a), len(b)
+    if not prefix and abs(n - m) > limit:
+        return big
+    m = min(m, n + limit)
+    prev2 = None
+    prev = [j if j <= limit else big for j in range(m + 1)]
+    for i in range(1, n + 1):
+        cur = [big] * (m + 1)
+        if i <= limit:
+            cur[0] = i
+        ai = a[i - 1]
+        row_min = cur[0]
+        # (if berantai, bukan min(): loop ini jalur panas autocomplete fuzzy)
+        for j in range(max(1, i - limit), min(m, i + limit) + 1):
+            bj = b[j - 1]
+            value = prev[j - 1] if ai == bj else prev[j - 1] + 1
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ai == b[j - 2] and a[i - 2] == bj and prev2[j - 2] + 1 < value:
+                value = prev2[j - 2] + 1
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return big
+        prev2, prev = prev, cur
+    return min(min(prev) if prefix else prev[m], big)
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Jarak edit Damerau (optimal string alignment) antara `a` dan `b`.
+    Berhenti lebih awal begitu jaraknya pasti > `limit` (mengembalikan limit + 1).
+    """
+    return _banded_osa(a, b, limit, prefix=False)
+
+
+def prefix_distance(query: str, text: str, limit: int) -> int:
+    """Jarak edit minimum antara `query` dan SEMUA prefix `text` (untuk autocomplete fuzzy)."""
+    return _banded_osa(query, text, limit, prefix=True)
+
+
+class NameIndex:
+    """
+    Trie prefix + indeks trigram atas nama destinasi.
+
+    Args:
+        names: Nama per baris katalog (index list = index baris).
+        aliases: Alias tambahan per baris (opsional), mis. nama lokal.
+        limit: Jumlah completion maks. yang disimpan per node trie.
+    """
+
+    def __init__(self, names: Sequence[str], aliases: Optional[Mapping[int, Iterable[str]]] = None,
+                 limit: int = DEFAULT_LIMIT):
+        self.names = list(names)
+        self.limit = limit
+        # Kunci penuh (nama + alias) yang sudah dinormalisasi: (kunci, baris)
+        self.keys: List[Tuple[str, int]] = []
+        for row, name in enumerate(self.names):
+            self.keys.append((normalize_name(name), row))
+        for row, extra in (aliases or {}).items():
+            for alias in extra:
+                self.keys.append((normalize_name(alias), row))
+        self.keys = [(key, row) for key, row in dict.fromkeys(self.keys) if key]
+
+        self.exact: Dict[str, int] = {}
+        for key, row in self.keys:
+            self.exact.setdefault(key, row)
+        self._build_trie()
+        self._build_trigrams()
+
+    # --------------------------------------------------
+    # Build
+    # --------------------------------------------------
+    def _build_trie(self) -> None:
+        # Urutan completion: cocok di awal nama dulu, lalu nama lebih pendek, lalu baris
+        entries = []
+        for key, row in self.keys:
+            starts = [0] + [m.end() for m in re.finditer(r" ", key)]
+            for rank, start in enumerate(starts):
+                entries.append((rank > 0, len(self.names[row]), row, key[start:]))
+        entries.sort()
+
+        # Node = [anak: dict char -> node, baris: list]
+        self.trie: list = [{}, []]
+        for _, _, row, suffix in entries:
+            node = self.trie
+            for ch in suffix:
+                node = node[0].setdefault(ch, [{}, []])
+                if len(node[1]) < self.limit and row not in node[1]:
+                    node[1].append(row)
+        self.trie[1] = list(dict.fromkeys(row for _, _, row, _ in entries))[: self.limit]
+
+    def _build_trigrams(self) -> None:
+        self.trigrams: Dict[str, List[int]] = {}
+        for key_id, (key, _) in enumerate(self.keys):
+            for gram in set(_trigrams(key)):
+                self.trigrams.setdefault(gram, []).append(key_id)
+
+    def _candidates(self, text: str, typos: int, pad_end: bool) -> List[int]:
+        """
+        Key id dengan trigram sama terbanyak dengan `text`. Satu edit merusak
+        maks. 3 trigram, jadi key dengan overlap < |trigram| - 3·typos dibuang.
+        """
+        grams = set(_trigrams(text, pad_end))
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self.trigrams.get(gram, ()))
+        min_overlap = max(1, len(grams) - 3 * typos)
+        return [key_id for key_id, n in overlap.most_common(MAX_FUZZY_CANDIDATES) if n >= min_overlap]
+
+    # --------------------------------------------------
+    # Query
+    # --------------------------------------------------
+    def _prefix_rows(self, text: str, limit: int) -> List[int]:
+        """Baris yang salah satu awal katanya diawali `text` (persis), O(|text| + limit)."""
+        node = self.trie
+        for ch in text:
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        return node[1][:limit]
+
+    def complete(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, bool]]:
+        """
+        Autocomplete: daftar (baris, fuzzy). Prefix persis dulu; hanya jika
+        tidak ada satu pun, dicari prefix dengan salah ketik (fuzzy=True).
+        """
+        limit = min(limit or self.limit, self.limit)
+        text = normalize_name(query)
+        if not text:
+            return []
+        results = [(row, False) for row in self._prefix_rows(text, limit)]
+
+        typos = max_typos(len(text))
+        if not results and typos > 0:
+            seen = set()
+            scored = []
+            for key_id in self._candidates(text, typos, pad_end=False):
+                key, row = self.keys[key_id]
+                # Awal kata yang sisa kuncinya terlalu pendek tidak mungkin cocok
+                starts = [0] + [m.end() for m in re.finditer(r" ", key) if len(key) - m.end() >= len(text) - typos]
+                dist = min(prefix_distance(text, key[s:], typos) for s in starts)
+                if dist <= typos:
+                    scored.append((dist, len(self.names[row]), row))
+            for _, _, row in sorted(scored):
+                if row not in seen and len(results) < limit:
+                    seen.add(row)
+                    results.append((row, True))
+        return results
+
+    def resolve(self, name: str) -> Optional[Tuple[int, str]]:
+        """
+        Nama (mungkin salah ketik / tidak lengkap) -> (baris, cara cocok).
+        Cara cocok: 'normalized' (beda huruf besar / tanda baca / ejaan),
+        'prefix' (awal kata yang hanya cocok ke satu destinasi), atau
+        'fuzzy' (salah ketik, kandidat terbaik tunggal). None jika tidak
+        ada / ambigu.
+        """
+        text = normalize_name(name)
+        if not text:
+            return None
+        if text in self.exact:
+            return self.exact[text], "normalized"
+
+        # Awal kata yang cocok persis (tanpa salah ketik) menang atas kecocokan
+        # fuzzy nama penuh: satu destinasi -> 'prefix' ("tancak t" -> "Tancak
+        # Tulis", bukan "Tancak"), lebih dari satu -> ambigu (belum selesai diketik)
+        prefix_rows = self._prefix_rows(text, 2)
+        if prefix_rows:
+            return (prefix_rows[0], "prefix") if len(prefix_rows) == 1 else None
+
+        typos = max_typos(len(text))
+        if typos > 0:
+            best, best_rows = typos + 1, set()
+            for key_id in self._candidates(text, typos, pad_end=True):
+                key, row = self.keys[key_id]
+                dist = osa_distance(text, key, best)
+                if dist < best:
+                    best, best_rows = dist, {row}
+                elif dist == best and dist <= typos:
+                    best_rows.add(row)
+            if best <= typos and len(best_rows) == 1:
+                return best_rows.pop(), "fuzzy"
+
+        # Hanya satu destinasi yang cocok dengan awal kata (dengan salah ketik)
+        completions = self.complete(text)
+        if len(completions) == 1:
+            return completions[0][0], "fuzzy"
+        return None
+
+    def suggest(self, name: str, limit: int = 3) -> List[str]:
+        """Nama-nama terdekat untuk pesan 'mungkin maksud Anda'."""
+        return [self.names[row] for row, _ in self.complete(name, limit)]
@@ -0,0 +1,124 @@
+"""
+======================================================
+NEIGHBOR TABLES — Tabel Top-K Tetangga per Item
+======================================================
+
+Pengganti matriks kemiripan N x N. Untuk setiap item hanya disimpan
+K tetangga terdekat (item itu sendiri sudah dikecualikan):
+- `ids`    : int32   (N x K) -> row index tetangga, terurut menurun.
+- `scores` : float16 (N x K) -> skor kemiripan masing-masing tetangga.
+
+Memori tumbuh O(N*K), bukan O(N^2). Tabel dibangun per blok baris
+sehingga matriks penuh tidak pernah ada di memori sekaligus.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from .ranking import top_k_indices
+from .scoring import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 50
+DEFAULT_BLOCK_SIZE = 1024
+
+
+# ======================================================
+# 1️⃣ STRUKTUR DATA
+# ======================================================
+@dataclass(frozen=True)
+class NeighborTable:
+    """Tabel top-K tetangga untuk satu mode rekomendasi."""
+    ids: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+
+    def __len__(self) -> int:
+        return self.ids.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.scores.nbytes
+
+
+def save_neighbor_table(table: NeighborTable, path: Path) -> None:
+    """Menyimpan tabel ke file .npz (tanpa pickle)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, ids=table.ids, scores=table.scores)
+    logger.info(f"💾 Tabel tetangga ({len(table)} x {table.k}) disimpan ke: {path}")
+
+
+def load_neighbor_table(path: Path) -> NeighborTable:
+    """Memuat tabel tetangga dari file .npz."""
+    if not path.exists():
+        raise FileNotFoundError(f"Tabel tetangga tidak ditemukan di {path}")
+    with np.load(path, allow_pickle=False) as data:
+        table = NeighborTable(ids=data["ids"], scores=data["scores"])
+    logger.info(f"✅ Tabel tetangga dimuat dari: {path} ({len(table)} x {table.k})")
+    return table
+
+
+# ======================================================
+# 2️⃣ BUILDER (BLOCKWISE)
+# ======================================================
+def _select_block(block_scores: np.ndarray, row_offset: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Top-k per baris untuk satu blok, dengan item itu sendiri dikecualikan via index."""
+    block_scores = np.asarray(block_scores, dtype=np.float32)
+    self_idx = np.arange(block_scores.shape[0]) + row_offset
+    ids = top_k_indices(block_scores, k, exclude=self_idx)
+    scores = np.take_along_axis(block_scores, ids, axis=1)
+    return ids.astype(np.int32), scores.astype(np.float16)
+
+
+def build_neighbor_table_from_blocks(blocks: Iterator[tuple[int, np.ndarray]], n: int,
+                                     k: int = DEFAULT_TOP_K) -> NeighborTable:
+    """
+    Membangun tabel dari iterator `(row_offset, block_scores)`, di mana
+    `block_scores` adalah potongan baris matriks kemiripan (b x N).
+    """
+    k = max(1, min(k, n - 1))
+    ids = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float16)
+    for start, block in blocks:
+        end = start + block.shape[0]
+        ids[start:end], scores[start:end] = _select_block(block, start, k)
+    return NeighborTable(ids=ids, scores=scores)
+
+
+def iter_cosine_blocks(vectors, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Menghasilkan blok baris cosine similarity dari matriks fitur
+    (dense ndarray atau scipy sparse) tanpa membentuk matriks N x N.
+    """
+    if sparse.issparse(vectors):
+        normed = normalize(vectors.tocsr())
+    else:
+        normed = normalize_rows(vectors)
+    transposed = normed.T
+    n = normed.shape[0]
+    for start in range(0, n, block_size):
+        block = normed[start:start + block_size] @ transposed
+        yield start, block.toarray() if sparse.issparse(block) else block
+
+
+def iter_matrix_blocks(get_rows: Callable[[int, int], np.ndarray], n: int,
+                       block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[tuple[int, np.ndarray]]:
+    """Menghasilkan blok baris dari sumber matriks kemiripan yang sudah ada."""
+    for start in range(0, n, block_size):
+        yield start, get_rows(start, min(n, start + block_size))
+
+
+def build_neighbor_table_from_vectors(vectors, k: int = DEFAULT_TOP_K,
+                                      block_size: int = DEFAULT_BLOCK_SIZE) -> NeighborTable:
+    """Shortcut: tabel top-K cosine langsung dari matriks fitur."""
+    return build_neighbor_table_from_blocks(iter_cosine_blocks(vectors, block_size), vectors.shape[0], k)
@@ -0,0 +1,115 @@
+"""
+======================================================
+ONNX ENCODER — Inference S-BERT Ringan untuk CPU
+======================================================
+
+Backend alternatif untuk meng-encode query tanpa PyTorch:
+- Model transformer di-export ke ONNX lalu dikuantisasi dinamis ke int8
+  (lihat `scripts/export_onnx_encoder.py`).
+- Tokenisasi memakai library `tokenizers` (Rust), pooling (mean) dan
+  normalisasi dilakukan di NumPy, meniru pipeline SentenceTransformer.
+
+`OnnxEncoder.encode()` sengaja dibuat kompatibel dengan
+`SentenceTransformer.encode()` sehingga bisa langsung dipakai oleh
+EncoderService di backend.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CONFIG_NAME = "encoder_config.json"
+FP32_NAME = "model.onnx"
+INT8_NAME = "model_int8.onnx"
+TOKENIZER_NAME = "tokenizer.json"
+
+
+class OnnxEncoder:
+    """
+    Encoder S-BERT berbasis onnxruntime.
+
+    Args:
+        model_dir: Folder hasil export (model ONNX, tokenizer.json, encoder_config.json).
+        quantized: Pakai model int8 (default) atau fp32.
+        intra_op_threads: Jumlah thread onnxruntime (None = default onnxruntime).
+    """
+
+    def __init__(self, model_dir: Path, quantized: bool = True, intra_op_threads: int | None = None):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Backend ONNX butuh 'onnxruntime' dan 'tokenizers'. "
+                "Silakan jalankan: pip install onnxruntime tokenizers"
+            ) from e
+
+        config_path = model_dir / CONFIG_NAME
+        if not config_path.exists():
+            raise FileNotFoundError(
+                f"Konfigurasi encoder ONNX tidak ditemukan di {config_path}. "
+                "Jalankan: python scripts/export_onnx_encoder.py"
+            )
+        self.config = json.loads(config_path.read_text(encoding="utf-8"))
+        self.model_name = self.config.get("model_name")
+        self.normalize = bool(self.config.get("normalize", False))
+
+        model_path = model_dir / (INT8_NAME if quantized else FP32_NAME)
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model ONNX tidak ditemukan di {model_path}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_NAME))
+        self.tokenizer.enable_truncation(max_length=int(self.config.get("max_seq_length", 128)))
+        self.tokenizer.enable_padding(
+            pad_id=int(self.config.get("pad_id", 0)),
+            pad_token=self.config.get("pad_token", "[PAD]"),
+        )
+        logger.info(f"✅ Encoder ONNX dimuat dari {model_path.name} ({'int8' if quantized else 'fp32'}).")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.config["embedding_dim"])
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling dengan attention mask (sama dengan modul Pooling S-BERT)
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        return (summed / counts).astype(np.float32)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Meng-encode satu string atau list string. Signature mengikuti SentenceTransformer."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        vectors = np.concatenate([
+            self._encode_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)
+        ])
+        if self.normalize or normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.clip(norms, 1e-12, None)
+        return vectors[0] if single else vectors
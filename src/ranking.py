@@ -0,0 +1,98 @@
+"""
+======================================================
+RANKING KERNEL — Seleksi Top-K Tervektorisasi
+======================================================
+
+Satu kernel top-k yang dipakai bersama oleh indeks vektor, builder
+tabel tetangga, dan Recommender. Memakai `np.argpartition` (O(N))
+lalu hanya mengurutkan k kandidat teratas, alih-alih sort penuh.
+
+Berisi juga helper fusi ranking (RRF / min-max blend) untuk hybrid
+search leksikal + semantik.
+"""
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int, exclude=None) -> np.ndarray:
+    """
+    Mengambil index k skor tertinggi, terurut menurun.
+
+    Args:
+        scores: Array skor 1-D (N,) atau 2-D (B x N, per baris).
+        k: Jumlah hasil. Dipotong otomatis ke jumlah kandidat yang valid.
+        exclude: Index yang tidak boleh muncul di hasil.
+            - 1-D: int atau array index kolom.
+            - 2-D: array (B,) berisi satu index per baris (mis. item
+              referensi itu sendiri), atau array boolean (B x N).
+
+    Returns:
+        Array index (k,) untuk input 1-D atau (B x k) untuk input 2-D.
+    """
+    scores = np.asarray(scores)
+    if exclude is not None:
+        scores = scores.astype(np.float32, copy=True)
+        if scores.ndim == 1:
+            scores[np.atleast_1d(exclude)] = -np.inf
+        else:
+            exclude = np.asarray(exclude)
+            if exclude.dtype == bool:
+                scores[exclude] = -np.inf
+            else:
+                scores[np.arange(scores.shape[0]), exclude] = -np.inf
+
+    n = scores.shape[-1]
+    n_valid = n
+    if exclude is not None:
+        # Jangan pernah mengembalikan item yang dikecualikan
+        n_valid = int(np.isfinite(scores).sum(axis=-1).min()) if scores.size else 0
+    k = min(k, n_valid)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    part_scores = np.take_along_axis(scores, part, axis=-1)
+    order = np.argsort(-part_scores, axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+# ======================================================
+# FUSI RANKING (HYBRID SEARCH)
+# ======================================================
+RRF_K = 60
+
+
+def ranks_desc(scores: np.ndarray) -> np.ndarray:
+    """Peringkat 1-based per elemen (skor tertinggi = 1, seri -> urutan index)."""
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    ranks = np.empty(order.size, dtype=np.int64)
+    ranks[order] = np.arange(1, order.size + 1)
+    return ranks
+
+
+def reciprocal_rank_fusion(*rankings: np.ndarray, k: int = RRF_K) -> np.ndarray:
+    """
+    Reciprocal Rank Fusion: skor = sum_i 1 / (k + rank_i).
+    Tiap `rankings` berisi peringkat 1-based per kandidat; 0 = kandidat
+    tidak muncul di ranking tersebut (tidak menyumbang skor).
+    """
+    fused = np.zeros(len(rankings[0]), dtype=np.float64)
+    for ranks in rankings:
+        ranks = np.asarray(ranks)
+        hit = ranks > 0
+        fused[hit] += 1.0 / (k + ranks[hit])
+    return fused
+
+
+def minmax_scale(scores: np.ndarray) -> np.ndarray:
+    """Skala linear ke [0, 1]; array konstan -> nol semua."""
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.size == 0:
+        return scores
+    lo, hi = scores.min(), scores.max()
+    if hi <= lo:
+        return np.zeros_like(scores)
+    return (scores - lo) / (hi - lo)
@@ -16,15 +16,21 @@ Versi: 5.0 (Professional Refactor)
 # ======================================================
 import pandas as pd
 import numpy as np
+import hashlib
 import logging
 from pathlib import Path
-from typing import Literal, Dict, List
+from typing import Literal, Dict, Iterable, List, Mapping
 from dataclasses import dataclass, field
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import normalize
 
 # Mengimpor fungsi helper dari modul utils
-from .utils import load_pickle, get_base_dir, save_pickle
+from .utils import load_pickle, get_base_dir
+from .vector_index import VectorIndex, IndexBackend, build_vector_index
+from .neighbors import NeighborTable, load_neighbor_table, build_neighbor_table_from_vectors, save_neighbor_table
+from .artifact_store import ArtifactStore, StoreSnapshot, file_sha256
+from .ranking import top_k_indices, ranks_desc, reciprocal_rank_fusion, minmax_scale
+from .scoring import cosine_scores
+from .lexical_index import BM25Index
+from .name_index import NameIndex
 
 # ======================================================
 # 2️⃣ KONFIGURASI & SETUP
@@ -41,18 +47,28 @@ class ModelPaths:
     """
     base_dir: Path = field(default_factory=get_base_dir)
     data: Path = field(init=False)
-    tfidf_sim: Path = field(init=False)
     hybrid_sim: Path = field(init=False)
     bert_embed: Path = field(init=False)
-    bert_sim: Path = field(init=False)
+    bert_index: Path = field(init=False)
+    tfidf_vectorizer: Path = field(init=False)
+    store: Path = field(init=False)
+    onnx_dir: Path = field(init=False)
+    collab: Path = field(init=False)
 
     def __post_init__(self):
         # Menggunakan object mutation karena frozen=True
         object.__setattr__(self, 'data', self.base_dir / "data" / "processed" / "destinasi_processed.csv")
-        object.__setattr__(self, 'tfidf_sim', self.base_dir / "models" / "similarity_matrix.pkl")
         object.__setattr__(self, 'hybrid_sim', self.base_dir / "models" / "hybrid_similarity.pkl")
         object.__setattr__(self, 'bert_embed', self.base_dir / "models" / "bert_embeddings.pkl")
-        object.__setattr__(self, 'bert_sim', self.base_dir / "models" / "bert_similarity.pkl")
+        object.__setattr__(self, 'bert_index', self.base_dir / "models" / "bert_index.pkl")
+        object.__setattr__(self, 'tfidf_vectorizer', self.base_dir / "models" / "tfidf_vectorizer.pkl")
+        object.__setattr__(self, 'store', self.base_dir / "models" / "store")
+        object.__setattr__(self, 'onnx_dir', self.base_dir / "models" / "onnx")
+        object.__setattr__(self, 'collab', self.base_dir / "models" / "collab_cooccurrence.npz")
+
+    def neighbors(self, mode: str) -> Path:
+        """Path tabel top-K tetangga untuk satu mode (hasil scripts/build_neighbor_tables.py)."""
+        return self.base_dir / "models" / f"neighbors_{mode}.npz"
 
 
 class Recommender:
@@ -63,21 +79,53 @@ class Recommender:
     # Konstanta untuk kolom yang sering digunakan
     RECOMMENDATION_COLS = ['id', 'nama_wisata', 'kategori', 'alamat', 'deskripsi', 'gambar']
     SEARCH_COLS = ['id', 'nama_wisata', 'kategori']
+    # Kolom yang bisa dipakai sebagai filter facet (di-push ke kernel ranking)
+    FACET_COLS = ['kategori', 'kota']
+    # Mode dari artefak konten (bagian dari artifact_version). 'collab' dari
+    # traffic klik, dipasang dari luar via `set_neighbor_table`.
+    CONTENT_MODES = ("tfidf", "hybrid", "bert")
+    # Prior popularitas tanpa kolom rating: berapa tetangga teratas yang dihitung
+    PRIOR_NEIGHBORS = 10
 
-    def __init__(self, paths: ModelPaths = ModelPaths()):
+    def __init__(self, paths: ModelPaths = ModelPaths(), index_backend: IndexBackend = "ivf", n_probe: int | None = None):
         self.paths = paths
+        self.index_backend = index_backend
+        self.n_probe = n_probe
         self.df: pd.DataFrame | None = None
         self.embeddings: np.ndarray | None = None
-        self.similarity_matrices: Dict[str, np.ndarray | None] = {
-            "tfidf": None, "hybrid": None, "bert": None
+        # Salinan L2-normalized float32 contiguous, dipakai kernel scoring (cosine = dot)
+        self.embeddings_normed: np.ndarray | None = None
+        self.snapshot: StoreSnapshot | None = None
+        self.vector_index: VectorIndex | None = None
+        # Per mode: tabel top-K tetangga (bukan lagi matriks N x N)
+        self.similarity_matrices: Dict[str, NeighborTable | None] = {
+            "tfidf": None, "hybrid": None, "bert": None, "collab": None
         }
+        # Lookup O(1): id -> baris (array padat, -1 = id tidak ada), baris -> id,
+        # nama -> baris; plus kode kategori per baris
+        self.id_to_row: np.ndarray | None = None
+        self.row_to_id: np.ndarray | None = None
+        self.name_to_row: Dict[str, int] = {}
+        # Trie + trigram atas nama (& alias): autocomplete dan resolusi nama salah ketik
+        self.name_index: NameIndex | None = None
+        self.category_codes: np.ndarray | None = None
+        self.categories: pd.Index | None = None
+        # Posting list facet: kolom -> nilai -> index baris (terurut)
+        self.facets: Dict[str, Dict[str, np.ndarray]] = {}
+        # Inverted index BM25 atas 'fitur_bersih' (pencarian kata kunci / hybrid)
+        self.lexical_index: BM25Index | None = None
+        self.artifact_version: str | None = None
+        # Prior popularitas statis per baris (pemecah seri ranking trending)
+        self.popularity_prior: np.ndarray | None = None
         self.is_loaded = False
         self.load()
 
     def load(self) -> None:
         """
-        Memuat dataset utama dan semua matriks kemiripan ke dalam memori.
-        Jika matriks kemiripan BERT tidak ada, akan dihitung secara on-the-fly.
+        Memuat dataset utama dan semua artefak model.
+        Prioritas: artifact store berversi (memmap read-only, dibagi antar
+        worker). Jika store belum dibangun, fallback ke file lama
+        (pickle + .npz) dan tabel BERT dihitung on-the-fly bila perlu.
         """
         if self.is_loaded:
             logger.info("Recommender sudah dimuat sebelumnya.")
@@ -86,11 +134,19 @@ class Recommender:
         try:
             logger.info("📦 Memulai pemuatan semua artefak model...")
             self._load_dataset()
-            self._load_similarity_matrices()
-            self._load_or_compute_bert_artifacts()
+            self.snapshot = self._open_store()
+            if self.snapshot is not None:
+                self._load_from_store()
+                self.artifact_version = self.snapshot.version
+            else:
+                self._load_similarity_matrices()
+                self._load_or_compute_bert_artifacts()
+                self._build_vector_index()
+                self.artifact_version = self._compute_artifact_version()
+            self._build_popularity_prior()
             
             self.is_loaded = True
-            logger.info("🎉 Semua artefak model berhasil dimuat ke memori.")
+            logger.info(f"🎉 Semua artefak model berhasil dimuat ke memori (versi {self.artifact_version}).")
 
         except FileNotFoundError as e:
             logger.error(f"❌ File tidak ditemukan: {e}", exc_info=True)
@@ -105,41 +161,309 @@ class Recommender:
             raise FileNotFoundError(f"Dataset tidak ditemukan di {self.paths.data}")
         self.df = pd.read_csv(self.paths.data)
         self.df['fitur_bersih'] = self.df['fitur_bersih'].fillna('')
-        logger.info(f"✅ Dataset berhasil dimuat ({len(self.df)} baris).")
+        self._build_lookups()
+        self.lexical_index = BM25Index(self.df['fitur_bersih'])
+        logger.info(f"✅ Dataset berhasil dimuat ({len(self.df)} baris, {len(self.lexical_index.vocabulary)} term BM25).")
 
-    def _load_similarity_matrices(self):
-        """Memuat matriks kemiripan TF-IDF dan Hybrid."""
-        self.similarity_matrices["tfidf"] = load_pickle(self.paths.tfidf_sim)
-        self.similarity_matrices["hybrid"] = load_pickle(self.paths.hybrid_sim)
+    def _build_lookups(self):
+        """Menyiapkan lookup id <-> baris, nama -> baris, dan kode kategori per baris."""
+        ids = self.df['id'].to_numpy()
+        if not np.issubdtype(ids.dtype, np.integer) or (ids < 0).any():
+            raise ValueError("Kolom 'id' pada dataset harus berupa integer non-negatif.")
+        if not self.df['id'].is_unique:
+            raise ValueError("Kolom 'id' pada dataset tidak unik.")
+        self.id_to_row = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int32)
+        self.id_to_row[ids] = np.arange(len(ids), dtype=np.int32)
+        self.row_to_id = ids.astype(np.int64)
+        names = self.df['nama_wisata'].tolist()
+        # Nama kembar: baris pertama yang menang (sama dengan pencarian lama)
+        self.name_to_row = {}
+        for row, name in enumerate(names):
+            self.name_to_row.setdefault(name, row)
+        if len(self.name_to_row) != len(names):
+            logger.warning(f"⚠️ {len(names) - len(self.name_to_row)} nama wisata kembar; lookup nama memakai baris pertama.")
+        # Kolom 'alias' opsional, beberapa alias dipisah ';'
+        aliases = {}
+        if 'alias' in self.df.columns:
+            for row, value in enumerate(self.df['alias'].tolist()):
+                if isinstance(value, str) and value.strip():
+                    aliases[row] = [a.strip() for a in value.split(';') if a.strip()]
+        self.name_index = NameIndex(names, aliases)
+        codes, self.categories = pd.factorize(self.df['kategori'])
+        self.category_codes = codes.astype(np.int32)
+        self.facets = {}
+        for col in self.FACET_COLS:
+            if col in self.df.columns:
+                self.facets[col] = {
+                    value: np.asarray(rows, dtype=np.int64)
+                    for value, rows in self.df.groupby(col, sort=False).indices.items()
+                }
+
+    def _build_popularity_prior(self):
+        """
+        Prior popularitas statis per baris. Memakai kolom opsional 'rating'
+        jika ada di dataset; jika tidak, sentralitas konten: jumlah skor
+        kemiripan dari item lain yang menempatkan baris ini di
+        PRIOR_NEIGHBORS tetangga Hybrid teratasnya.
+        """
+        n = len(self.df)
+        if 'rating' in self.df.columns:
+            self.popularity_prior = pd.to_numeric(self.df['rating'], errors='coerce').fillna(0.0).to_numpy(np.float64)
+            return
+        table = self.similarity_matrices["hybrid"]
+        ids = np.asarray(table.ids[:, :self.PRIOR_NEIGHBORS])
+        scores = np.asarray(table.scores[:, :self.PRIOR_NEIGHBORS], dtype=np.float64)
+        valid = ids >= 0
+        self.popularity_prior = np.bincount(ids[valid], weights=scores[valid], minlength=n)
+
+    def _open_store(self) -> StoreSnapshot | None:
+        """Membuka versi CURRENT dari artifact store (None jika belum ada)."""
+        store = ArtifactStore(self.paths.store)
+        if not store.exists():
+            logger.warning(
+                f"⚠️ Artifact store belum ada di {self.paths.store}. Memakai artefak lama (pickle). "
+                "Jalankan: python scripts/build_artifact_store.py"
+            )
+            return None
+
+        snapshot = store.open()
+        manifest = snapshot.manifest
+        if manifest.get("n_items") != len(self.df):
+            raise ValueError(
+                f"Artefak versi {snapshot.version} berisi {manifest.get('n_items')} item, "
+                f"dataset berisi {len(self.df)} baris. Bangun ulang artifact store."
+            )
+        # artifact_version = versi store, jadi dataset yang diedit tanpa build ulang
+        # tidak mengubah versi (cache & ETag tidak di-invalidasi) -> tolak
+        if manifest.get("dataset_hash") != file_sha256(self.paths.data):
+            raise ValueError(
+                f"Hash dataset {self.paths.data.name} berbeda dengan artefak versi {snapshot.version}. "
+                "Bangun ulang artifact store (python scripts/build_artifact_store.py)."
+            )
+        logger.info(f"✅ Artifact store versi {snapshot.version} dibuka (model: {manifest.get('model_name')}).")
+        return snapshot
+
+    def _load_from_store(self):
+        """Memuat embeddings, tabel tetangga, dan indeks vektor sebagai memmap."""
+        snapshot = self.snapshot
+        if "embeddings" in snapshot:
+            self.embeddings = snapshot.array("embeddings")
+            self.embeddings_normed = snapshot.array("embeddings_normed")
+
+        for mode in self.CONTENT_MODES:
+            if f"neighbors_{mode}_ids" in snapshot:
+                self.similarity_matrices[mode] = NeighborTable(
+                    ids=snapshot.array(f"neighbors_{mode}_ids"),
+                    scores=snapshot.array(f"neighbors_{mode}_scores"),
+                )
         if self.similarity_matrices["tfidf"] is None or self.similarity_matrices["hybrid"] is None:
-            raise FileNotFoundError("Matriks TF-IDF atau Hybrid gagal dimuat.")
-        logger.info("✅ Matriks TF-IDF (V1) & Hybrid (V2) berhasil dimuat.")
+            raise FileNotFoundError(f"Tabel TF-IDF atau Hybrid tidak ada di artefak versi {snapshot.version}.")
+        logger.info(f"✅ Tabel tetangga ({', '.join(m for m, t in self.similarity_matrices.items() if t is not None)}) dibuka via mmap.")
+
+        if self.embeddings_normed is None:
+            logger.warning("⚠️ Embeddings BERT tidak ada di artefak, indeks vektor tidak dibangun.")
+            return
+        state = None
+        index_meta = snapshot.manifest.get("index")
+        if index_meta and "ivf_centroids" in snapshot:
+            state = {
+                **index_meta,
+                "centroids": snapshot.array("ivf_centroids"),
+                "list_order": snapshot.array("ivf_list_order"),
+                "list_offsets": snapshot.array("ivf_list_offsets"),
+            }
+        params = {"n_probe": self.n_probe} if self.index_backend == "ivf" else {}
+        self.vector_index = build_vector_index(
+            self.embeddings_normed, self.index_backend, state=state,
+            normalized=True, fingerprint=snapshot.manifest.get("embeddings_fingerprint"), **params
+        )
+
+    def _load_similarity_matrices(self):
+        """
+        Memuat tabel top-K tetangga TF-IDF dan Hybrid.
+        Tabel dibangun offline dengan `python scripts/build_neighbor_tables.py`.
+        """
+        for mode in ("tfidf", "hybrid"):
+            path = self.paths.neighbors(mode)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"Tabel tetangga '{path.name}' tidak ditemukan. "
+                    "Jalankan: python scripts/build_neighbor_tables.py"
+                )
+            self.similarity_matrices[mode] = load_neighbor_table(path)
+        logger.info("✅ Tabel tetangga TF-IDF (V1) & Hybrid (V2) berhasil dimuat.")
 
     def _load_or_compute_bert_artifacts(self):
-        """Memuat matriks BERT atau menghitungnya jika tidak ada."""
-        if self.paths.bert_sim.exists():
-            self.similarity_matrices["bert"] = load_pickle(self.paths.bert_sim)
-            logger.info("✅ Matriks kemiripan BERT (V3) berhasil dimuat dari cache.")
-            # Load embeddings juga untuk app.py
-            if self.paths.bert_embed.exists():
-                self.embeddings = load_pickle(self.paths.bert_embed)
-            else:
-                 logger.warning("File embedding BERT tidak ada, pencarian semantik mungkin tidak akurat.")
+        """
+        Memuat embeddings & tabel tetangga BERT.
+        Jika tabelnya belum ada, dibangun per blok dari embeddings
+        (tanpa matriks N x N) lalu disimpan.
+        """
+        if not self.paths.bert_embed.exists():
+            logger.warning("⚠️ Embeddings BERT tidak ditemukan. Mode 'bert' & pencarian semantik tidak akan tersedia.")
+            return
 
-        elif self.paths.bert_embed.exists():
-            logger.warning(f"⚠️ Matriks '{self.paths.bert_sim.name}' tidak ditemukan. Menghitung dari embeddings...")
-            self.embeddings = load_pickle(self.paths.bert_embed)
-            if self.embeddings is None:
-                 raise ValueError("Gagal memuat file embeddings BERT.")
-            
-            # Normalisasi penting sebelum cosine similarity untuk efisiensi & akurasi
-            normalized_embeddings = normalize(self.embeddings)
-            self.similarity_matrices["bert"] = cosine_similarity(normalized_embeddings)
-            
-            save_pickle(self.similarity_matrices["bert"], self.paths.bert_sim)
-            logger.info(f"✅ Matriks kemiripan BERT (V3) berhasil dibuat dan disimpan di {self.paths.bert_sim}")
+        self.embeddings = load_pickle(self.paths.bert_embed)
+        if self.embeddings is None:
+            raise ValueError("Gagal memuat file embeddings BERT.")
+
+        path = self.paths.neighbors("bert")
+        if path.exists():
+            self.similarity_matrices["bert"] = load_neighbor_table(path)
+            logger.info("✅ Tabel tetangga BERT (V3) berhasil dimuat dari cache.")
         else:
-            logger.warning("⚠️ Embeddings & similarity matrix BERT tidak ditemukan. Mode 'bert' tidak akan tersedia.")
+            logger.warning(f"⚠️ Tabel '{path.name}' tidak ditemukan. Membangun dari embeddings...")
+            self.similarity_matrices["bert"] = build_neighbor_table_from_vectors(self.embeddings)
+            save_neighbor_table(self.similarity_matrices["bert"], path)
+            logger.info(f"✅ Tabel tetangga BERT (V3) berhasil dibuat dan disimpan di {path}")
+
+    def _compute_artifact_version(self) -> str:
+        """
+        Sidik jari (hash pendek) dari semua file artefak yang dimuat.
+        Berubah jika dataset/embeddings/tabel tetangga berubah, sehingga cache
+        di luar Recommender bisa tahu kapan harus di-invalidasi.
+        """
+        h = hashlib.sha1()
+        for path in (self.paths.data, self.paths.bert_embed,
+                     *(self.paths.neighbors(mode) for mode in self.CONTENT_MODES)):
+            if path.exists():
+                h.update(path.name.encode())
+                h.update(path.read_bytes())
+        return h.hexdigest()[:12]
+
+    def _build_vector_index(self):
+        """Membangun (atau memuat dari disk) indeks vektor untuk semantic search."""
+        if self.embeddings is None:
+            logger.warning("⚠️ Embeddings BERT tidak tersedia, indeks vektor tidak dibangun.")
+            return
+        params = {"n_probe": self.n_probe} if self.index_backend == "ivf" else {}
+        self.vector_index = build_vector_index(
+            self.embeddings, self.index_backend, path=self.paths.bert_index, **params
+        )
+        self.embeddings_normed = self.vector_index.vectors
+
+    def set_neighbor_table(self, mode: str, table: NeighborTable | None) -> None:
+        """
+        Memasang (atau mencopot, `None`) tabel tetangga untuk satu mode
+        dengan satu assignment, mis. tabel 'collab' hasil CooccurrenceModel.
+        """
+        if table is not None and len(table) != len(self.df):
+            raise ValueError(f"Tabel '{mode}' berisi {len(table)} baris, dataset {len(self.df)} baris.")
+        self.similarity_matrices[mode] = table
+
+    def facet_mask(self, filters: Mapping[str, Iterable[str]] | None) -> np.ndarray | None:
+        """
+        Menyusun mask boolean baris yang lolos filter facet dari posting
+        list yang sudah dihitung saat load. Nilai dalam satu facet
+        digabung OR, antar facet digabung AND.
+
+        Args:
+            filters: Mis. {'kategori': ['Pantai', 'Religi'], 'kota': ['Jember']}.
+                Facet dengan daftar kosong diabaikan.
+
+        Returns:
+            Mask (N,) atau None jika tidak ada filter aktif.
+
+        Raises:
+            ValueError: Facet atau nilai facet tidak dikenal.
+        """
+        active = {col: list(values) for col, values in (filters or {}).items() if values}
+        if not active:
+            return None
+        mask = np.ones(len(self.df), dtype=bool)
+        for col, values in active.items():
+            postings = self.facets.get(col)
+            if postings is None:
+                raise ValueError(f"Facet '{col}' tidak dikenal. Pilihan: {list(self.facets)}")
+            unknown = [v for v in values if v not in postings]
+            if unknown:
+                raise ValueError(f"Nilai {col} tidak dikenal: {unknown}. Pilihan: {sorted(postings)}")
+            col_mask = np.zeros(len(self.df), dtype=bool)
+            for value in values:
+                col_mask[postings[value]] = True
+            mask &= col_mask
+        return mask
+
+    def search(self, query_vec: np.ndarray, top_k: int, mask: np.ndarray | None = None, **kwargs):
+        """
+        Mencari baris paling mirip dengan vektor query lewat indeks vektor.
+
+        Args:
+            query_vec: Vektor query hasil encode S-BERT.
+            top_k: Jumlah hasil.
+            mask: Mask facet (lihat `facet_mask`); hanya baris True yang di-scoring.
+            **kwargs: Diteruskan ke backend (mis. `n_probe` untuk IVF).
+
+        Returns:
+            Tuple (indices, scores) terurut dari skor tertinggi.
+        """
+        if self.vector_index is None:
+            raise RuntimeError("Indeks vektor belum tersedia (embeddings BERT tidak dimuat).")
+        return self.vector_index.search(query_vec, top_k, mask=mask, **kwargs)
+
+    def search_window(self, max_results: int, mode: str = "semantic", n_probe: int | None = None) -> int:
+        """
+        Panjang ranking pencarian yang dipaginasi (lihat `VectorIndex.search_window`).
+        Mode 'lexical' tidak memakai indeks vektor, jadi window-nya penuh.
+        """
+        window = min(len(self.df), max_results)
+        if mode == "lexical" or self.vector_index is None:
+            return window
+        return self.vector_index.search_window(window, n_probe=n_probe)
+
+    def lexical_search(self, query: str, top_k: int, mask: np.ndarray | None = None):
+        """
+        Pencarian kata kunci BM25 atas 'fitur_bersih'.
+        Hanya item yang memuat minimal satu term query yang dikembalikan.
+
+        Returns:
+            Tuple (indices, scores) terurut dari skor tertinggi.
+        """
+        if self.lexical_index is None:
+            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
+        return self.lexical_index.search(query, top_k, mask=mask)
+
+    def hybrid_search(self, query: str, query_vec: np.ndarray, top_k: int,
+                      fusion: Literal["rrf", "blend"] = "rrf", alpha: float = 0.5,
+                      mask: np.ndarray | None = None, **kwargs):
+        """
+        Hybrid search: kandidat BM25 (sparse) digabung dengan kandidat
+        indeks vektor, lalu SEMUA kandidat di-rerank secara semantik
+        (dot product hanya ke baris kandidat, bukan seluruh katalog)
+        dan kedua sinyal difusikan.
+
+        Args:
+            query: Teks query (untuk BM25).
+            query_vec: Vektor query hasil encode S-BERT.
+            top_k: Jumlah hasil (juga jumlah kandidat per sumber).
+            fusion: 'rrf' (Reciprocal Rank Fusion) atau 'blend'
+                (alpha * semantik + (1 - alpha) * BM25, keduanya min-max).
+            alpha: Bobot skor semantik untuk fusion='blend'.
+            mask: Mask facet; diterapkan di kedua sumber kandidat.
+            **kwargs: Diteruskan ke indeks vektor (mis. `n_probe`).
+
+        Returns:
+            Tuple (indices, scores) terurut dari skor fusi tertinggi.
+        """
+        lex_idx, lex_scores = self.lexical_search(query, top_k, mask=mask)
+        sem_idx, _ = self.search(query_vec, top_k, mask=mask, **kwargs)
+        candidates = np.union1d(lex_idx, sem_idx)
+
+        sem_scores = cosine_scores(self.embeddings_normed[candidates], query_vec)
+        lex_full = np.zeros(candidates.size, dtype=np.float64)
+        lex_full[np.searchsorted(candidates, lex_idx)] = lex_scores
+
+        if fusion == "rrf":
+            lex_ranks = np.where(lex_full > 0, ranks_desc(lex_full), 0)
+            fused = reciprocal_rank_fusion(ranks_desc(sem_scores), lex_ranks)
+        elif fusion == "blend":
+            lex_norm = lex_full / lex_full.max() if lex_full.size and lex_full.max() > 0 else lex_full
+            fused = alpha * minmax_scale(sem_scores) + (1.0 - alpha) * lex_norm
+        else:
+            raise ValueError(f"Metode fusi '{fusion}' tidak dikenal (pilih 'rrf' atau 'blend').")
+
+        order = top_k_indices(fused, top_k)
+        return candidates[order], fused[order]
     
     @property
     def destinations(self) -> List[str]:
@@ -148,38 +472,235 @@ class Recommender:
             return []
         return self.df['nama_wisata'].tolist()
         
-    def get_recommendations(self, nama_wisata: str, top_n: int = 5, mode: Literal["tfidf", "hybrid", "bert"] = "bert") -> pd.DataFrame:
+    def score(self, query_vecs: np.ndarray) -> np.ndarray:
+        """
+        Skor cosine query terhadap SEMUA item (tanpa indeks / pemotongan top-k).
+        Satu vektor (d,) -> (N,); batch (B x d) -> (B x N).
+        """
+        if self.embeddings_normed is None:
+            raise RuntimeError("Embeddings BERT belum tersedia.")
+        return cosine_scores(self.embeddings_normed, query_vecs)
+
+    def search_batch(self, query_vecs: np.ndarray, top_k: int, mask: np.ndarray | None = None):
+        """
+        Pencarian semantik exact untuk banyak query sekaligus: satu perkalian
+        matriks (B x d) · (d x N) lalu top-k per baris.
+
+        Returns:
+            Tuple (indices, scores), masing-masing (B x k), skor menurun.
+        """
+        scores = self.score(np.atleast_2d(query_vecs))
+        if mask is not None:
+            top_k = min(top_k, int(mask.sum()))
+        idx = top_k_indices(scores, top_k, exclude=None if mask is None else np.broadcast_to(~mask, scores.shape))
+        return idx, np.take_along_axis(scores, idx, axis=1)
+
+    def row_for_id(self, item_id: int) -> int:
+        """Index baris untuk satu id item (O(1)). Id tidak dikenal -> ValueError."""
+        if self.id_to_row is None:
+            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
+        row = self.id_to_row[item_id] if 0 <= item_id < len(self.id_to_row) else -1
+        if row < 0:
+            raise ValueError(f"Wisata dengan id {item_id} tidak ditemukan dalam dataset.")
+        return int(row)
+
+    def row_for_name(self, nama_wisata: str) -> int:
+        """Index baris untuk satu nama wisata (O(1), harus persis sama). Tidak ada -> ValueError."""
+        row = self.name_to_row.get(nama_wisata)
+        if row is None:
+            raise ValueError(f"Wisata '{nama_wisata}' tidak ditemukan dalam dataset.")
+        return row
+
+    def resolve_name(self, nama_wisata: str) -> tuple[int, str]:
+        """
+        Seperti `row_for_name`, tetapi toleran huruf besar, ejaan lama, salah
+        ketik, dan nama tidak lengkap (lihat `NameIndex.resolve`).
+
+        Returns:
+            (baris, cara cocok): 'exact', 'normalized', 'fuzzy', atau 'prefix'.
+            Tidak ada / ambigu -> ValueError berisi saran nama terdekat.
+        """
+        row = self.name_to_row.get(nama_wisata)
+        if row is not None:
+            return row, "exact"
+        resolved = self.name_index.resolve(nama_wisata) if self.name_index else None
+        if resolved is None:
+            suggestions = self.name_index.suggest(nama_wisata) if self.name_index else []
+            hint = f" Mungkin maksud Anda: {', '.join(suggestions)}." if suggestions else ""
+            raise ValueError(f"Wisata '{nama_wisata}' tidak ditemukan dalam dataset.{hint}")
+        return resolved
+
+    def lookup_rows(self, item_ids) -> np.ndarray:
+        """
+        Memetakan id item ke index baris, posisi dipertahankan (tanpa
+        dedup): id yang tidak ada di dataset -> -1.
+        """
+        if self.id_to_row is None:
+            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
+        ids = np.asarray(item_ids, dtype=np.int64).reshape(-1)
+        rows = np.full(ids.shape, -1, dtype=np.int64)
+        valid = (ids >= 0) & (ids < len(self.id_to_row))
+        rows[valid] = self.id_to_row[ids[valid]]
+        return rows
+
+    def rows_for_ids(self, item_ids) -> np.ndarray:
+        """
+        Memetakan daftar id item ke index baris (urutan dipertahankan).
+        Id yang tidak valid / tidak ada di dataset dibuang, duplikat dihapus.
+        """
+        if self.id_to_row is None:
+            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
+        ids = pd.to_numeric(pd.Series(list(item_ids), dtype=object), errors="coerce").dropna()
+        ids = ids.to_numpy(dtype=np.int64)
+        rows = self.lookup_rows(ids)
+        return pd.unique(rows[rows >= 0])
+
+    def rank_for_profile(self, profile_vec: np.ndarray, top_n: int, top_category: str | None = None,
+                         category_boost: float = 0.0, exclude_rows: np.ndarray | None = None,
+                         mask: np.ndarray | None = None):
+        """
+        Ranking feed dari satu vektor profil user: skor = cosine ke semua
+        item (satu matvec ke embeddings ternormalisasi), ditambah
+        `category_boost` untuk item berkategori `top_category`.
+
+        Args:
+            profile_vec: Vektor profil (rata-rata / jumlah embeddings, skala bebas).
+            top_n: Jumlah hasil.
+            top_category: Nama kategori yang diberi boost (opsional).
+            category_boost: Besar boost.
+            exclude_rows: Index baris yang tidak boleh muncul (mis. item riwayat).
+            mask: Mask facet; hanya baris True yang di-scoring.
+
+        Returns:
+            Tuple (indices, scores). Kosong jika vektor profil nol.
+        """
+        if not np.any(profile_vec):
+            return np.array([], dtype=np.intp), np.array([])
+
+        if mask is not None:
+            # Filter di-push sebelum scoring: hanya baris eligible yang disentuh
+            eligible = mask.copy()
+            if exclude_rows is not None and len(exclude_rows):
+                eligible[exclude_rows] = False
+            rows = np.flatnonzero(eligible)
+            scores = cosine_scores(self.embeddings_normed[rows], profile_vec)
+            codes = self.category_codes[rows]
+        else:
+            rows = None
+            scores = self.score(profile_vec)
+            codes = self.category_codes
+        if top_category is not None and category_boost:
+            code = self.categories.get_indexer([top_category])[0]
+            if code >= 0:
+                scores[codes == code] += category_boost
+
+        if rows is not None:
+            local = top_k_indices(scores, top_n)
+            return rows[local], scores[local]
+        exclude = exclude_rows if exclude_rows is not None and len(exclude_rows) else None
+        idx = top_k_indices(scores, top_n, exclude=exclude)
+        return idx, scores[idx]
+
+    def rank_for_history(self, rows: np.ndarray, top_n: int, category_boost: float = 0.0,
+                         mask: np.ndarray | None = None):
+        """
+        Ranking feed personal dari riwayat (index baris) dalam satu pass:
+        profil = rata-rata embeddings riwayat, kategori yang paling sering
+        diklik diberi boost, item riwayat dikecualikan. `mask` (facet)
+        hanya membatasi kandidat, profil tetap dari seluruh riwayat.
+
+        Returns:
+            Tuple (indices, scores, top_category). indices kosong jika
+            profil tidak bisa dibentuk.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        if rows.size == 0:
+            return np.array([], dtype=np.intp), np.array([]), None
+        user_vec = np.asarray(self.embeddings[rows], dtype=np.float64).mean(axis=0)
+
+        # Kategori dominan di riwayat (seri -> yang muncul lebih dulu di riwayat)
+        hist_codes = self.category_codes[rows]
+        hist_codes = hist_codes[hist_codes >= 0]
+        top_category = None
+        if hist_codes.size:
+            counts = np.bincount(hist_codes)
+            top_category = self.categories[hist_codes[np.argmax(counts[hist_codes] == counts.max())]]
+
+        idx, scores = self.rank_for_profile(user_vec, top_n, top_category, category_boost,
+                                            exclude_rows=rows, mask=mask)
+        return idx, scores, top_category
+
+    def _get_table(self, mode: str) -> NeighborTable:
+        """Mengambil tabel tetangga untuk `mode` (dengan validasi)."""
+        if not self.is_loaded or self.df is None:
+            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
+        table = self.similarity_matrices.get(mode)
+        if table is None:
+            raise ValueError(f"Mode '{mode}' tidak valid atau tabel tetangganya gagal dimuat.")
+        return table
+
+    @staticmethod
+    def _neighbors_for_rows(table: NeighborTable, rows: np.ndarray, top_n: int):
+        """
+        Top-N tetangga untuk banyak baris referensi sekaligus (vektorisasi).
+        Item referensi dikecualikan berdasarkan index-nya, bukan dengan
+        asumsi ia selalu berada di urutan pertama (rawan saat skor kembar).
+
+        Returns:
+            Tuple (ids, scores, valid), masing-masing (R x top_n).
+            `valid` False untuk slot kosong (tetangga yang tersedia < top_n,
+            termasuk slot berisi id -1 di tabel 'collab').
+        """
+        width = min(top_n + 1, table.k)
+        ids = table.ids[rows, :width]
+        scores = table.scores[rows, :width].astype(np.float64)
+        keep = (ids != rows[:, None]) & (ids >= 0)
+        # Geser slot yang valid ke depan dengan urutan skor tetap terjaga
+        order = np.argsort(~keep, axis=1, kind="stable")[:, :top_n]
+        return (
+            np.take_along_axis(ids, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+            np.take_along_axis(keep, order, axis=1),
+        )
+
+    def similar_for_rows(self, rows: np.ndarray, top_n: int = 5,
+                         mode: Literal["tfidf", "hybrid", "bert", "collab"] = "bert"):
+        """
+        Tetangga top-N untuk banyak baris referensi (index baris katalog).
+
+        Returns:
+            Tuple (ids, scores, valid) seperti `_neighbors_for_rows`.
+        """
+        return self._neighbors_for_rows(self._get_table(mode.lower()), np.asarray(rows, dtype=np.int64), top_n)
+
+    def get_recommendations(self, nama_wisata: str | None = None, top_n: int = 5,
+                            mode: Literal["tfidf", "hybrid", "bert", "collab"] = "bert",
+                            item_id: int | None = None) -> pd.DataFrame:
         """
         Mengambil N rekomendasi destinasi wisata paling mirip.
 
         Args:
-            nama_wisata: Nama wisata referensi.
+            nama_wisata: Nama wisata referensi (harus persis sama).
             top_n: Jumlah rekomendasi yang diinginkan.
-            mode: Tipe model ('tfidf', 'hybrid', 'bert'). Default ke 'bert'.
+            mode: Tipe model ('tfidf', 'hybrid', 'bert', atau 'collab' =
+                co-occurrence klik user). Default ke 'bert'.
+            item_id: Id wisata referensi; dipakai sebagai ganti `nama_wisata`.
 
         Returns:
             DataFrame pandas berisi rekomendasi.
         """
-        if not self.is_loaded or self.df is None:
-            raise RuntimeError("Recommender belum dimuat. Jalankan .load() terlebih dahulu.")
-        
         mode = mode.lower()
-        if nama_wisata not in self.df['nama_wisata'].values:
-            raise ValueError(f"Wisata '{nama_wisata}' tidak ditemukan dalam dataset.")
-        
-        matrix = self.similarity_matrices.get(mode)
-        if matrix is None:
-            raise ValueError(f"Mode '{mode}' tidak valid atau matriksnya gagal dimuat.")
-            
-        idx_ref = self.df.index[self.df['nama_wisata'] == nama_wisata].item()
-        sim_scores = list(enumerate(matrix[idx_ref]))
-        
-        # Mengurutkan berdasarkan skor kemiripan
-        sorted_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-        
-        # Mengambil top_n+1 untuk mengabaikan item itu sendiri
-        top_indices = [i[0] for i in sorted_scores[1:top_n + 1]]
-        top_scores = [i[1] for i in sorted_scores[1:top_n + 1]]
+        table = self._get_table(mode)
+        if item_id is not None:
+            idx_ref = self.row_for_id(item_id)
+        elif nama_wisata is not None:
+            idx_ref = self.row_for_name(nama_wisata)
+        else:
+            raise ValueError("Isi salah satu: nama_wisata atau item_id.")
+
+        ids, scores, valid = self._neighbors_for_rows(table, np.array([idx_ref]), top_n)
+        top_indices = ids[0][valid[0]]
+        top_scores = scores[0][valid[0]]
         
         rekomendasi_df = self.df.iloc[top_indices][self.RECOMMENDATION_COLS].copy()
         rekomendasi_df['skor_kemiripan'] = np.round(top_scores, 3)
@@ -187,6 +708,36 @@ class Recommender:
         
         return rekomendasi_df
 
+    def get_recommendations_batch(self, nama_wisata_list: List[str], top_n: int = 5, mode: Literal["tfidf", "hybrid", "bert", "collab"] = "bert") -> pd.DataFrame:
+        """
+        Versi batch dari `get_recommendations`: tetangga untuk banyak
+        item referensi dalam satu operasi tervektorisasi.
+
+        Args:
+            nama_wisata_list: Daftar nama wisata referensi.
+            top_n: Jumlah rekomendasi per item referensi.
+            mode: Tipe model ('tfidf', 'hybrid', 'bert', 'collab').
+
+        Returns:
+            Satu DataFrame panjang dengan kolom tambahan 'nama_referensi'
+            (urutan mengikuti input, lalu skor menurun).
+        """
+        mode = mode.lower()
+        table = self._get_table(mode)
+
+        missing = [n for n in nama_wisata_list if n not in self.name_to_row]
+        if missing:
+            raise ValueError(f"Wisata {missing} tidak ditemukan dalam dataset.")
+
+        rows = np.array([self.name_to_row[n] for n in nama_wisata_list], dtype=np.int64)
+        ids, scores, valid = self._neighbors_for_rows(table, rows, top_n)
+
+        rekomendasi_df = self.df.iloc[ids[valid]][self.RECOMMENDATION_COLS].copy()
+        rekomendasi_df.insert(0, 'nama_referensi', np.repeat(nama_wisata_list, valid.sum(axis=1)))
+        rekomendasi_df['skor_kemiripan'] = np.round(scores[valid], 3)
+        rekomendasi_df['mode_rekomendasi'] = mode.upper()
+        return rekomendasi_df
+
 # ======================================================
 # 4️⃣ FUNGSI TEST MANDIRI
 # ======================================================
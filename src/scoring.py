@@ -0,0 +1,44 @@
+"""
+======================================================
+SCORING KERNEL — Cosine via Dot Product
+======================================================
+
+Embeddings katalog dinormalisasi L2 sekali saat load (float32,
+contiguous), sehingga cosine similarity cukup satu dot product:
+- 1 query  : matriks-vektor  (N x d) @ (d,)   -> (N,)
+- B query  : matriks-matriks (B x d) @ (d x N) -> (B x N)
+
+Berbeda dengan `sklearn.metrics.pairwise.cosine_similarity`, kernel
+ini tidak memvalidasi ulang input dan tidak menormalisasi ulang
+seluruh matriks katalog di setiap panggilan — hanya query-nya.
+"""
+
+import numpy as np
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    """Normalisasi L2 per baris (float32, contiguous). Baris nol dibiarkan nol."""
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def cosine_scores(vectors_normed: np.ndarray, queries: np.ndarray, normalized: bool = False) -> np.ndarray:
+    """
+    Skor cosine antara query dan semua baris `vectors_normed`.
+
+    Args:
+        vectors_normed: Matriks katalog (N x d) yang SUDAH dinormalisasi L2.
+        queries: Satu vektor (d,) atau batch (B x d).
+        normalized: True jika query sudah dinormalisasi (lewati normalisasi).
+
+    Returns:
+        Array (N,) untuk satu query atau (B x N) untuk batch.
+    """
+    q = np.asarray(queries, dtype=vectors_normed.dtype)
+    if not normalized:
+        q = normalize_rows(q).astype(vectors_normed.dtype, copy=False)
+    if q.ndim == 1:
+        return vectors_normed @ q
+    return q @ vectors_normed.T
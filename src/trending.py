@@ -0,0 +1,168 @@
+"""
+======================================================
+TRENDING — Counter Popularitas dengan Time-Decay
+======================================================
+
+Setiap klik menambah skor item (dan kategorinya) dengan bobot yang
+meluruh eksponensial terhadap waktu (waktu paruh `half_life_s`):
+
+    skor(i, t) = Σ_klik 2^(-(t - t_klik) / half_life)
+
+Dipakai "forward decay": klik disimpan dengan bobot
+exp(λ · (t_klik - t_ref)) terhadap waktu acuan tetap t_ref, sehingga
+menambah klik O(1) tanpa menyentuh counter lain, dan URUTAN item tidak
+berubah seiring waktu (semua skor meluruh dengan faktor yang sama).
+Ranking hanya perlu dihitung ulang saat ada klik baru.
+
+Skor seri (termasuk item tanpa klik, mis. sebelum ada klik sama sekali)
+diurutkan dengan prior popularitas statis dari katalog, bukan urutan baris.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Batas eksponen sebelum t_ref digeser (menghindari overflow float64)
+_MAX_EXPONENT = 50.0
+
+
+@dataclass(frozen=True)
+class TrendingRanking:
+    """
+    Snapshot ranking untuk satu katalog: `rows` = semua baris katalog
+    urut skor menurun (item tanpa klik di akhir, urut prior popularitas).
+    `weights` masih relatif terhadap `t_ref`; di-decay ke waktu
+    sekarang saat diambil.
+    """
+    rows: np.ndarray
+    weights: np.ndarray
+    id_to_row: np.ndarray
+    version: int
+    t_ref: float
+    rate: float
+
+    def top(self, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k (baris, skor). Tanpa mask O(k); dengan mask snapshot dipindai
+        berurutan dan berhenti begitu k baris lolos.
+        """
+        if mask is None:
+            picked = slice(0, k)
+        else:
+            picked = []
+            for pos, row in enumerate(self.rows.tolist()):
+                if mask[row]:
+                    picked.append(pos)
+                    if len(picked) == k:
+                        break
+        scale = math.exp(-self.rate * (time.time() - self.t_ref))
+        return self.rows[picked], self.weights[picked] * scale
+
+
+class TrendingCounter:
+    """
+    Counter popularitas per item id & per kategori dengan time-decay.
+
+    Args:
+        half_life_s: Waktu paruh bobot klik dalam detik (0 = tanpa decay).
+    """
+
+    def __init__(self, half_life_s: float = 86400.0):
+        self.half_life_s = half_life_s
+        self.rate = math.log(2) / half_life_s if half_life_s > 0 else 0.0
+        self.t_ref = time.time()
+        self.item_scores = np.zeros(0, dtype=np.float64)
+        self.category_scores: Dict[str, float] = {}
+        self.clicks = 0
+        # Naik setiap ada klik; dipakai untuk tahu kapan ranking basi
+        self.version = 0
+
+    # --------------------------------------------------
+    # Update
+    # --------------------------------------------------
+    def _rebase(self, t: float) -> None:
+        """Menggeser t_ref ke `t` (skala semua counter ikut disesuaikan)."""
+        factor = math.exp(-self.rate * (t - self.t_ref))
+        self.item_scores *= factor
+        for cat in self.category_scores:
+            self.category_scores[cat] *= factor
+        self.t_ref = t
+
+    def add(self, item_ids: Iterable[int], categories: Iterable[Optional[str]],
+            timestamps: Iterable[float], counts: Optional[Iterable[float]] = None) -> None:
+        """
+        Menambahkan klik (atau agregat klik bila `counts` diisi) per item.
+        `categories[i]` = kategori item ke-i (None jika tidak dikenal).
+        Skor disimpan dalam array padat per id: pemanggil wajib hanya
+        mengirim id katalog (id sembarang dari klien = alokasi sebesar id).
+        """
+        ids = np.fromiter(item_ids, dtype=np.int64)
+        if ids.size == 0:
+            return
+        ts = np.fromiter(timestamps, dtype=np.float64, count=ids.size)
+        cnt = np.ones(ids.size) if counts is None else np.fromiter(counts, dtype=np.float64, count=ids.size)
+        keep = ids >= 0
+        if self.rate > 0 and self.rate * (ts.max() - self.t_ref) > _MAX_EXPONENT:
+            self._rebase(float(ts.max()))
+        weights = cnt * np.exp(self.rate * (ts - self.t_ref))
+
+        if ids.max() >= len(self.item_scores):
+            grown = np.zeros(int(ids.max()) + 1, dtype=np.float64)
+            grown[: len(self.item_scores)] = self.item_scores
+            self.item_scores = grown
+        np.add.at(self.item_scores, ids[keep], weights[keep])
+        for cat, w, ok in zip(categories, weights.tolist(), keep.tolist()):
+            if ok and cat is not None:
+                self.category_scores[cat] = self.category_scores.get(cat, 0.0) + w
+        self.clicks += int(cnt[keep].sum())
+        self.version += 1
+
+    # --------------------------------------------------
+    # Query
+    # --------------------------------------------------
+    def _scale(self, now: Optional[float]) -> float:
+        """Faktor bobot-acuan -> skor pada waktu `now`."""
+        now = time.time() if now is None else now
+        return math.exp(-self.rate * (now - self.t_ref))
+
+    def ranking(self, id_to_row: np.ndarray, prior: Optional[np.ndarray] = None) -> TrendingRanking:
+        """
+        Ranking semua baris katalog `id_to_row` (O(n log n), dipanggil saat refresh).
+        `prior` (per baris, lebih besar = lebih populer) memecah skor seri.
+        """
+        id_to_row = np.asarray(id_to_row)
+        known = np.flatnonzero(id_to_row >= 0)
+        row_scores = np.zeros(int((id_to_row >= 0).sum()), dtype=np.float64)
+        counted = known[known < len(self.item_scores)]
+        row_scores[id_to_row[counted]] = self.item_scores[counted]
+        # Skor seri (termasuk 0) -> prior menurun, lalu urutan baris katalog (stabil)
+        if prior is None:
+            rows = np.argsort(-row_scores, kind="stable")
+        else:
+            rows = np.lexsort((-np.asarray(prior, dtype=np.float64), -row_scores))
+        return TrendingRanking(
+            rows=rows,
+            weights=row_scores[rows],
+            id_to_row=id_to_row,
+            version=self.version,
+            t_ref=self.t_ref,
+            rate=self.rate,
+        )
+
+    def top_categories(self, k: int, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Kategori dengan skor ter-decay terbesar."""
+        scale = self._scale(now)
+        ranked = sorted(self.category_scores.items(), key=lambda kv: -kv[1])[:k]
+        return [(cat, score * scale) for cat, score in ranked]
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "clicks": self.clicks,
+            "items": int((self.item_scores > 0).sum()),
+            "categories": len(self.category_scores),
+            "half_life_s": self.half_life_s,
+        }
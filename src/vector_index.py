@@ -0,0 +1,291 @@
+"""
+======================================================
+VECTOR INDEX — Pencarian Tetangga Terdekat (Semantic Search)
+======================================================
+
+Menyediakan indeks vektor yang bisa dipertukarkan (pluggable) untuk
+embeddings S-BERT:
+- 'exact' : Brute-force (dot product ke semua baris). Akurat 100%.
+- 'ivf'   : Inverted File Index (IVF). Embeddings dikelompokkan dengan
+            k-means menjadi beberapa 'list'; saat query, hanya `n_probe`
+            list terdekat yang dipindai (sub-linear).
+
+Knob recall/latency ada di `n_probe`: makin besar, makin akurat
+(n_probe == n_lists setara dengan pencarian exact) tapi makin lambat.
+
+IVF hanya berguna untuk katalog besar: di bawah `IVF_MIN_ROWS` baris
+factory memakai 'exact' (scan penuh sama cepatnya, recall tetap 1).
+Catatan: list yang dipindai ditambah sampai kandidat >= top_k, jadi
+ranking yang dipaginasi meminta `search_window()` (kira-kira isi
+`n_probe` list), bukan seluruh jendela MAX_SEARCH_RESULTS.
+"""
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Literal, Tuple
+
+import numpy as np
+
+from .utils import load_pickle, save_pickle
+from .ranking import top_k_indices
+from .scoring import cosine_scores, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+IndexBackend = Literal["exact", "ivf"]
+
+# Di bawah jumlah baris ini backend 'ivf' diganti 'exact'
+IVF_MIN_ROWS = 10_000
+
+
+# ======================================================
+# 1️⃣ HELPER
+# ======================================================
+def embeddings_fingerprint(embeddings: np.ndarray) -> str:
+    """Hash isi embeddings, dipakai untuk mendeteksi indeks yang basi."""
+    arr = np.ascontiguousarray(embeddings)
+    h = hashlib.sha1()
+    h.update(str(arr.shape).encode())
+    h.update(str(arr.dtype).encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+# ======================================================
+# 2️⃣ INTERFACE INDEKS
+# ======================================================
+class VectorIndex(ABC):
+    """
+    Kontrak dasar untuk semua backend indeks vektor.
+    Skor yang dikembalikan adalah cosine similarity.
+    """
+    kind: str = "base"
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False, fingerprint: str | None = None):
+        # `normalized=True`: embeddings sudah L2-normalized float32 (mis. memmap
+        # dari artifact store) sehingga dipakai langsung tanpa salinan.
+        self.vectors = embeddings if normalized else normalize_rows(embeddings)
+        self.fingerprint = fingerprint or embeddings_fingerprint(embeddings)
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @abstractmethod
+    def search(self, query_vec: np.ndarray, top_k: int, mask: np.ndarray | None = None,
+               **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mencari `top_k` baris paling mirip dengan `query_vec`.
+        `mask` (boolean, N) opsional: hanya baris True yang di-scoring
+        dan boleh muncul di hasil (filter facet sebelum top-k).
+
+        Returns:
+            Tuple (indices, scores), keduanya terurut dari skor tertinggi.
+        """
+
+    def search_window(self, max_results: int, n_probe: int | None = None) -> int:
+        """
+        Panjang ranking yang layak diminta untuk paginasi (maks. `max_results`).
+        Backend exact selalu men-scoring semua baris, jadi window penuh tidak
+        menambah biaya berarti.
+        """
+        return min(len(self), max_results)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """State yang cukup untuk merekonstruksi indeks tanpa training ulang."""
+        return {"kind": self.kind, "fingerprint": self.fingerprint}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Memulihkan state hasil training dari `state_dict()`."""
+
+    def _prepare_query(self, query_vec: np.ndarray) -> np.ndarray:
+        return normalize_rows(np.asarray(query_vec).reshape(-1))
+
+
+class BruteForceIndex(VectorIndex):
+    """Backend exact: satu matrix-vector product ke seluruh embeddings."""
+    kind = "exact"
+
+    def search(self, query_vec: np.ndarray, top_k: int, mask: np.ndarray | None = None,
+               **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        q = self._prepare_query(query_vec)
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            scores = cosine_scores(self.vectors[rows], q, normalized=True)
+            local = top_k_indices(scores, top_k)
+            return rows[local], scores[local]
+        scores = cosine_scores(self.vectors, q, normalized=True)
+        idx = top_k_indices(scores, top_k)
+        return idx, scores[idx]
+
+
+class IVFIndex(VectorIndex):
+    """
+    Backend approximate berbasis IVF (k-means coarse quantizer).
+
+    Args:
+        embeddings: Matriks embeddings (N x d).
+        n_lists: Jumlah cluster/list. Default ~sqrt(N).
+        n_probe: Jumlah list yang dipindai per query (knob recall/latency).
+        n_iter: Iterasi k-means saat training.
+        seed: Seed agar hasil training deterministik.
+    """
+    kind = "ivf"
+
+    def __init__(self, embeddings: np.ndarray, n_lists: int | None = None,
+                 n_probe: int | None = None, n_iter: int = 20, seed: int = 42, **kwargs):
+        super().__init__(embeddings, **kwargs)
+        n = len(self)
+        self.n_lists = max(1, min(n, n_lists or int(round(np.sqrt(n)))))
+        self.n_probe = max(1, min(self.n_lists, n_probe or max(1, self.n_lists // 4)))
+        self.n_iter = n_iter
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        self.list_order: np.ndarray | None = None    # row id, diurutkan per list
+        self.list_offsets: np.ndarray | None = None  # batas awal/akhir tiap list
+
+    def train(self) -> "IVFIndex":
+        """Melatih k-means (spherical) dan membangun inverted list."""
+        rng = np.random.default_rng(self.seed)
+        n = len(self)
+        centroids = self.vectors[rng.choice(n, self.n_lists, replace=False)].copy()
+
+        for _ in range(self.n_iter):
+            assign = np.argmax(self.vectors @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = self.vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+                else:
+                    # Cluster kosong -> ambil ulang titik acak
+                    centroids[c] = self.vectors[rng.integers(n)]
+            centroids = normalize_rows(centroids)
+
+        assign = np.argmax(self.vectors @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.list_order = np.argsort(assign, kind="stable").astype(np.int32)
+        counts = np.bincount(assign, minlength=self.n_lists)
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+        return self
+
+    def search(self, query_vec: np.ndarray, top_k: int, n_probe: int | None = None,
+               mask: np.ndarray | None = None, **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        if self.centroids is None:
+            raise RuntimeError("IVFIndex belum dilatih. Jalankan .train() terlebih dahulu.")
+
+        q = self._prepare_query(query_vec)
+        n_probe = max(1, min(self.n_lists, n_probe or self.n_probe))
+        list_rank = np.argsort(-(self.centroids @ q))
+
+        # Pindai list terdekat; tambah list jika kandidat < top_k
+        # agar jumlah hasil selalu penuh. Dengan `mask`, yang dihitung
+        # hanya anggota list yang lolos filter.
+        if mask is None:
+            sizes = np.diff(self.list_offsets)
+            n_eligible = len(self)
+        else:
+            eligible = np.concatenate([[0], np.cumsum(mask[self.list_order])])
+            sizes = eligible[self.list_offsets[1:]] - eligible[self.list_offsets[:-1]]
+            n_eligible = int(eligible[-1])
+        sizes = sizes[list_rank]
+        needed = min(top_k, n_eligible)
+        probes = max(n_probe, int(np.searchsorted(np.cumsum(sizes), needed) + 1))
+        probes = min(probes, self.n_lists)
+
+        candidates = np.concatenate([
+            self.list_order[self.list_offsets[c]:self.list_offsets[c + 1]]
+            for c in list_rank[:probes]
+        ])
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        scores = self.vectors[candidates] @ q
+        local = top_k_indices(scores, top_k)
+        return candidates[local].astype(np.int64), scores[local]
+
+    def search_window(self, max_results: int, n_probe: int | None = None) -> int:
+        # Window = kira-kira isi `n_probe` list. Window yang lebih panjang memaksa
+        # search() menambah list sampai kandidat >= top_k (pada 1000 baris itu
+        # berarti hampir full scan). Window tidak dibuat per halaman: ranking
+        # harus sama untuk semua halaman agar cursor tidak melompati/mengulang item.
+        n_probe = max(1, min(self.n_lists, n_probe or self.n_probe))
+        budget = -(-n_probe * len(self) // self.n_lists)
+        return max(1, min(len(self), max_results, budget))
+
+    def state_dict(self) -> Dict[str, Any]:
+        state = super().state_dict()
+        state.update({
+            "n_lists": self.n_lists,
+            "n_iter": self.n_iter,
+            "seed": self.seed,
+            "centroids": self.centroids,
+            "list_order": self.list_order,
+            "list_offsets": self.list_offsets,
+        })
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.centroids = state["centroids"]
+        self.list_order = state["list_order"]
+        self.list_offsets = state["list_offsets"]
+
+
+# ======================================================
+# 3️⃣ FACTORY (BUILD ATAU LOAD DARI DISK)
+# ======================================================
+INDEX_BACKENDS = {
+    "exact": BruteForceIndex,
+    "ivf": IVFIndex,
+}
+
+
+def build_vector_index(embeddings: np.ndarray, backend: IndexBackend = "ivf",
+                       path: Path | None = None, state: Dict[str, Any] | None = None,
+                       **params) -> VectorIndex:
+    """
+    Membangun indeks vektor sekali saat load.
+
+    Hasil training dipakai ulang jika cocok (backend, fingerprint
+    embeddings, dan parameter sama) dari salah satu sumber:
+    - `state`: state yang sudah dimuat (mis. dari artifact store), atau
+    - `path`: file pickle indeks.
+    Jika tidak ada yang cocok, indeks dilatih (dan disimpan ke `path`).
+    Backend 'ivf' untuk embeddings < `IVF_MIN_ROWS` baris -> 'exact'.
+    """
+    backend = backend.lower()
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(f"Backend indeks '{backend}' tidak dikenal. Pilihan: {list(INDEX_BACKENDS)}")
+    if backend == "ivf" and len(embeddings) < IVF_MIN_ROWS:
+        logger.info(
+            f"ℹ️ {len(embeddings)} baris < {IVF_MIN_ROWS}: memakai indeks 'exact' "
+            "(IVF tidak lebih cepat di ukuran ini dan recall-nya < 1)."
+        )
+        backend = "exact"
+        params.pop("n_probe", None)
+
+    index = INDEX_BACKENDS[backend](embeddings, **params)
+    if not isinstance(index, IVFIndex):
+        logger.info(f"✅ Indeks vektor '{backend}' siap ({len(index)} baris).")
+        return index
+
+    if state is None and path is not None and path.exists():
+        try:
+            state = load_pickle(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal membaca indeks vektor dari {path}: {e}. Melatih ulang...")
+
+    if state is not None:
+        if (state.get("kind") == index.kind
+                and state.get("fingerprint") == index.fingerprint
+                and state.get("n_lists") == index.n_lists
+                and state.get("seed") == index.seed):
+            index.load_state(state)
+            logger.info(f"✅ Indeks vektor '{backend}' dimuat dari cache ({index.n_lists} list).")
+            return index
+        logger.warning("⚠️ Indeks vektor tersimpan sudah basi. Melatih ulang...")
+
+    index.train()
+    logger.info(f"✅ Indeks vektor '{backend}' dilatih ({index.n_lists} list, n_probe={index.n_probe}).")
+    if path is not None:
+        save_pickle(index.state_dict(), path)
+    return index
@@ -0,0 +1,17 @@
+# tests/conftest.py
+# Modul backend diimpor sebagai top-level (`import crud`, sama seperti main.py),
+# 'src' diimpor dari root proyek.
+
+import os
+import sys
+from pathlib import Path
+
+# Nilai khusus test, dipasang sebelum modul backend diimpor (security menolak
+# SECRET_KEY kosong, database membuat engine saat diimpor). Tidak menimpa env.
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
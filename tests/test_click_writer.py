@@ -0,0 +1,103 @@
+# tests/test_click_writer.py
+
+import asyncio
+
+import pytest
+
+import crud
+from click_writer import ClickWriter
+
+
+class FakeSession:
+    """Pengganti AsyncSession: cukup sebagai async context manager."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def inserted(monkeypatch):
+    """Mencatat setiap batch yang di-insert (satu list per panggilan)."""
+    batches = []
+
+    async def fake_insert(db, clicks):
+        start = sum(len(b) for b in batches) + 1
+        batches.append(list(clicks))
+        return list(range(start, start + len(clicks)))
+
+    monkeypatch.setattr(crud, "create_click_histories", fake_insert)
+    return batches
+
+
+def test_sync_menunggu_commit_dan_mengisi_id(inserted):
+    async def scenario():
+        writer = ClickWriter(FakeSession, durability="sync", batch_size=10)
+        await writer.start()
+        events = await asyncio.gather(*(writer.submit(1, item) for item in (5, 12, 30)))
+        await writer.stop()
+        return writer, events
+
+    writer, events = asyncio.run(scenario())
+    assert sorted(e.id for e in events) == [1, 2, 3]
+    assert [c["item_id"] for b in inserted for c in b] == [5, 12, 30]
+    assert writer.flushed == 3 and writer.failed == 0
+
+
+def test_buffered_digabung_per_batch_dan_hook_dipanggil(inserted):
+    flushed = []
+
+    async def on_flush(db, events):
+        flushed.append([e.item_id for e in events])
+
+    async def scenario():
+        writer = ClickWriter(FakeSession, durability="buffered", batch_size=4,
+                             flush_interval_ms=50, on_flush=on_flush)
+        await writer.start()
+        events = [await writer.submit(7, item) for item in range(10)]
+        assert all(e.id is None for e in events)  # 202: belum ditulis
+        await writer.flush()
+        await writer.stop()
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert [len(b) for b in inserted] == [4, 4, 2]
+    assert flushed == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert writer.batches == 3 and writer.max_batch_seen == 4
+
+
+def test_stop_menulis_semua_klik_yang_masih_antre(inserted):
+    async def scenario():
+        # Jendela panjang: tanpa drain, klik baru ditulis 10 detik lagi
+        writer = ClickWriter(FakeSession, durability="buffered", batch_size=1000, flush_interval_ms=10_000)
+        await writer.start()
+        for item in range(25):
+            await writer.submit(3, item)
+        await writer.stop()
+        with pytest.raises(RuntimeError):
+            await writer.submit(3, 99)
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert sum(len(b) for b in inserted) == 25
+    assert writer.flushed == 25 and not writer.is_running
+
+
+def test_batch_gagal_diteruskan_ke_klik_sync(monkeypatch):
+    async def broken_insert(db, clicks):
+        raise RuntimeError("db mati")
+
+    monkeypatch.setattr(crud, "create_click_histories", broken_insert)
+
+    async def scenario():
+        writer = ClickWriter(FakeSession, durability="sync")
+        await writer.start()
+        with pytest.raises(RuntimeError, match="db mati"):
+            await writer.submit(1, 5)
+        await writer.stop()
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.failed == 1 and writer.flushed == 0
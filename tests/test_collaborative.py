@@ -0,0 +1,72 @@
+# tests/test_collaborative.py
+
+import numpy as np
+import pytest
+
+from src.collaborative import CooccurrenceModel
+
+
+def make_id_to_row(ids):
+    id_to_row = np.full(max(ids) + 1, -1, dtype=np.int32)
+    id_to_row[ids] = np.arange(len(ids), dtype=np.int32)
+    return id_to_row
+
+
+@pytest.fixture
+def id_to_row():
+    # Id katalog tidak berurutan & tidak dimulai dari 0
+    return make_id_to_row([3, 5, 7, 12, 30, 40, 41, 42])
+
+
+def random_clicks(seed, n, item_ids, n_users=6):
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, n_users + 1, n).tolist(), rng.choice(item_ids, n).tolist()
+
+
+def assert_same_model(a, b):
+    assert (a.cooc != b.cooc).nnz == 0
+    np.testing.assert_array_equal(a.item_counts, b.item_counts)
+    np.testing.assert_array_equal(a.table.ids, b.table.ids)
+    np.testing.assert_array_equal(a.table.scores, b.table.scores)
+    assert a.n_pairs == b.n_pairs
+    assert a.user_items == b.user_items
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_add_clicks_sama_dengan_fit(id_to_row, seed):
+    items = [3, 5, 7, 12, 30, 40, 41, 42, 999]  # 999 = id asing, diabaikan
+    users, clicked = random_clicks(seed, 60, items)
+
+    full = CooccurrenceModel(id_to_row, k=3).fit(users, clicked, watermark=60)
+    incremental = CooccurrenceModel(id_to_row, k=3).fit(users[:20], clicked[:20], watermark=20)
+    for start in range(20, 60, 7):
+        incremental.add_clicks(users[start:start + 7], clicked[start:start + 7], watermark=min(start + 7, 60))
+
+    assert_same_model(incremental, full)
+    assert incremental.watermark == full.watermark == 60
+
+
+def test_add_clicks_dari_model_kosong(id_to_row):
+    users, clicked = random_clicks(7, 40, [3, 5, 7, 12, 30])
+    incremental = CooccurrenceModel(id_to_row, k=4)
+    for u, i in zip(users, clicked):
+        incremental.add_clicks([u], [i])
+    assert_same_model(incremental, CooccurrenceModel(id_to_row, k=4).fit(users, clicked))
+
+
+def test_klik_ulang_tidak_mengubah_model(id_to_row):
+    model = CooccurrenceModel(id_to_row, k=3).fit([1, 1, 2], [3, 5, 5])
+    version = model.version
+    assert model.add_clicks([1, 2], [3, 5]).size == 0
+    assert model.version == version
+
+
+def test_skor_cosine_dengan_shrink(id_to_row):
+    # User 1 & 2 mengklik id 3 dan 5; user 3 hanya id 5
+    model = CooccurrenceModel(id_to_row, k=2, shrink=1.0).fit([1, 1, 2, 2, 3], [3, 5, 3, 5, 5])
+    row3, row5 = id_to_row[3], id_to_row[5]
+    assert model.table.ids[row3, 0] == row5
+    expected = 2 / (np.sqrt(2 * 3) + 1.0)
+    assert model.table.scores[row3, 0] == pytest.approx(expected, rel=1e-3)
+    # Slot kosong diisi -1
+    assert model.table.ids[row3, 1] == -1
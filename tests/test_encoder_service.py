@@ -0,0 +1,59 @@
+# tests/test_encoder_service.py
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from encoder_service import EncoderService
+
+
+class FakeModel:
+    """Pengganti SentenceTransformer; `release` menahan encode sampai di-set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.release.wait(timeout=5)
+        self.calls.append(list(texts))
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_query_digabung_dalam_satu_batch():
+    model = FakeModel()
+
+    async def scenario():
+        service = EncoderService(model, max_batch_size=8, max_wait_ms=50)
+        await service.start()
+        vectors = await asyncio.gather(*(service.encode(f"q{i}") for i in range(3)))
+        await service.stop()
+        return vectors
+
+    vectors = asyncio.run(scenario())
+    assert model.calls == [["q0", "q1", "q2"]]
+    assert all(v.shape == (4,) for v in vectors)
+
+
+@pytest.mark.parametrize("phase", ["encode", "collect"])
+def test_stop_menggagalkan_batch_berjalan_dan_antrean(phase):
+    model = FakeModel()
+    model.release.clear()
+
+    async def scenario():
+        # 'collect': jendela panjang, worker masih mengumpulkan job saat stop
+        max_wait_ms = 10_000 if phase == "collect" else 0
+        service = EncoderService(model, max_batch_size=8 if phase == "collect" else 2, max_wait_ms=max_wait_ms)
+        await service.start()
+        tasks = [asyncio.create_task(service.encode(f"q{i}")) for i in range(4)]
+        await asyncio.sleep(0.05)
+        await service.stop()
+        model.release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 4
+    assert all(isinstance(r, RuntimeError) and "dihentikan" in str(r) for r in results)
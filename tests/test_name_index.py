@@ -0,0 +1,99 @@
+# tests/test_name_index.py
+
+import pytest
+
+from src.name_index import NameIndex, max_typos, normalize_name, osa_distance, prefix_distance
+
+NAMES = [
+    "Pantai Papuma",
+    "Pantai Watu Ulo",
+    "Pantai Paseban",
+    "Kampoeng Creative JFC",
+    "Museum Boemi Poeger",
+    "Air Terjun Tancak",
+    "Air Terjun Tancak Tulis",
+    "Puncak SJ88",
+    "Tiara Waterpark",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NameIndex(NAMES, aliases={0: ["Tanjung Papuma"]})
+
+
+def names(index, results):
+    return [index.names[row] for row, _ in results]
+
+
+def test_normalize_name_ejaan_lama_dan_tanda_baca():
+    assert normalize_name("Kampoeng  Créative-JFC!") == "kampung creative jfc"
+    assert normalize_name("Djember") == "jember"
+    assert normalize_name("Tjurah") == "curah"
+    assert normalize_name("Puncak SJ88") == "puncak sj88"
+    assert normalize_name(None) == ""
+
+
+def test_osa_distance_dengan_batas():
+    assert osa_distance("papuma", "papuma", 2) == 0
+    assert osa_distance("pauma", "papuma", 2) == 1
+    assert osa_distance("papmua", "papuma", 2) == 1  # transposisi = 1 edit
+    assert osa_distance("abc", "xyzabc", 2) == 3     # > limit -> limit + 1
+    assert prefix_distance("pntai", "pantai watu ulo", 1) == 1
+
+
+def test_max_typos():
+    assert [max_typos(n) for n in (3, 4, 6, 7, 20)] == [0, 1, 1, 2, 2]
+
+
+def test_complete_prefix_awal_kata_mana_pun(index):
+    assert names(index, index.complete("pantai pa")) == ["Pantai Papuma", "Pantai Paseban"]
+    assert names(index, index.complete("ulo")) == ["Pantai Watu Ulo"]
+    # Nama yang cocok di awal nama lebih dulu, lalu nama lebih pendek
+    assert names(index, index.complete("tancak")) == ["Air Terjun Tancak", "Air Terjun Tancak Tulis"]
+    assert all(not fuzzy for _, fuzzy in index.complete("pantai"))
+
+
+def test_complete_fuzzy_hanya_jika_tidak_ada_prefix(index):
+    results = index.complete("papma")
+    assert names(index, results) == ["Pantai Papuma"]
+    assert results[0][1] is True
+    assert index.complete("zzzz") == []
+    assert index.complete("") == []
+
+
+def test_complete_limit(index):
+    assert len(index.complete("pantai", limit=2)) == 2
+
+
+def test_resolve_normalized_dan_ejaan_lama(index):
+    assert index.resolve("PANTAI papuma") == (0, "normalized")
+    assert index.resolve("kampung creative jfc") == (3, "normalized")
+    assert index.resolve("Tanjung Papuma") == (0, "normalized")  # alias
+
+
+def test_resolve_salah_ketik(index):
+    assert index.resolve("pantai papumma") == (0, "fuzzy")
+    assert index.resolve("tiara waterprak") == (8, "fuzzy")
+    assert index.resolve("bumi pugr") == (4, "fuzzy")
+
+
+def test_resolve_prefix_tunggal(index):
+    assert index.resolve("watu ulo") == (1, "prefix")
+    assert index.resolve("boemi") == (4, "prefix")
+    # Prefix persis yang tunggal menang atas nama penuh berjarak 2 edit
+    assert index.resolve("air terjun tancak t") == (6, "prefix")
+
+
+def test_resolve_ambigu_atau_tidak_ada(index):
+    assert index.resolve("pantai") is None       # 3 pantai
+    assert index.resolve("tancak") is None       # Tancak & Tancak Tulis
+    # Prefix persis dari dua nama: tidak ditebak lewat jarak edit ke "Tancak"
+    assert index.resolve("air terjun tanc") is None
+    assert index.resolve("xqzvw") is None
+    assert index.resolve("") is None
+
+
+def test_suggest(index):
+    assert index.suggest("pantai", limit=2) == ["Pantai Papuma", "Pantai Paseban"]
+    assert index.suggest("xqzvw") == []
@@ -0,0 +1,49 @@
+# tests/test_pagination.py
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, parse_fields
+
+
+def test_cursor_roundtrip():
+    for offset in (0, 1, 20, 999):
+        assert decode_cursor(encode_cursor(offset, "v1"), "v1") == offset
+
+
+def test_cursor_kosong_berarti_halaman_pertama():
+    assert decode_cursor(None, "v1") == 0
+    assert decode_cursor("", "v1") == 0
+
+
+def test_cursor_tanpa_padding_base64():
+    cursor = encode_cursor(7, "abc")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "abc") == 7
+
+
+def test_cursor_versi_artefak_lain_ditolak():
+    cursor = encode_cursor(20, "v1")
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "v2")
+    assert exc.value.status_code == 400
+    assert "kedaluwarsa" in exc.value.detail
+
+
+@pytest.mark.parametrize("cursor", ["bukan-cursor!", "e30", encode_cursor(-1, "v1")])
+def test_cursor_tidak_valid(cursor):
+    # "e30" = base64 dari "{}" (tanpa offset)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "v1")
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Cursor tidak valid."
+
+
+def test_parse_fields():
+    allowed = ["id", "nama_wisata", "kategori"]
+    assert parse_fields(None, allowed) == allowed
+    assert parse_fields(" kategori, id ,id", allowed) == ["kategori", "id"]
+    assert parse_fields(",", allowed) == allowed
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("id,harga", allowed)
+    assert exc.value.status_code == 400
@@ -0,0 +1,26 @@
+# tests/test_trending.py
+
+import numpy as np
+
+from src.trending import TrendingCounter
+
+# Id katalog 10, 20, 30, 40 -> baris 0..3
+ID_TO_ROW = np.array([-1] * 10 + [0] + [-1] * 9 + [1] + [-1] * 9 + [2] + [-1] * 9 + [3], dtype=np.int32)
+
+
+def test_tanpa_klik_urut_prior_bukan_urutan_katalog():
+    counter = TrendingCounter(half_life_s=0)
+    prior = np.array([0.1, 0.9, 0.5, 0.9])
+    ranking = counter.ranking(ID_TO_ROW, prior)
+    # Prior seri (baris 1 & 3) -> urutan baris katalog
+    assert ranking.rows.tolist() == [1, 3, 2, 0]
+    assert counter.ranking(ID_TO_ROW).rows.tolist() == [0, 1, 2, 3]
+
+
+def test_klik_menang_atas_prior():
+    counter = TrendingCounter(half_life_s=0)
+    counter.add([10, 10, 30], ["a", "a", "b"], [0.0, 0.0, 0.0])
+    ranking = counter.ranking(ID_TO_ROW, np.array([0.1, 0.9, 0.5, 0.2]))
+    assert ranking.rows.tolist() == [0, 2, 1, 3]
+    rows, scores = ranking.top(2, mask=np.array([False, True, True, True]))
+    assert rows.tolist() == [2, 1] and scores.tolist() == [1.0, 0.0]